@@ -1,3 +1,5 @@
+from functions.conjecture_evaluation import evaluate_conjecture_rows
+
 __all__ =[
     "Hypothesis",
     "Conclusion",
@@ -211,28 +213,16 @@ class MultiLinearConjecture(Conjecture):
         return f"{hypothesis}, then {self.conclusion}"
 
     def get_sharp_graphs(self, df):
-        return df.loc[(df[self.hypothesis.statement] == True) &
-                      (df[self.conclusion.lhs] == sum(self.conclusion.slopes[i] * df[self.conclusion.rhs[i]]
-                                                      for i in range(len(self.conclusion.rhs))) + self.conclusion.intercept)]
+        # Evaluated by the batched evaluator, with exact comparisons on integer columns.
+        _, sharp = evaluate_conjecture_rows([self], df)
+        return df.loc[sharp[0]]
 
     def __eq__(self, other):
         return self.hypothesis == other.hypothesis and self.conclusion == other.conclusion
 
     def false_graphs(self, df):
-        if self.conclusion.inequality == "<=":
-            return df.loc[(df[self.hypothesis.statement] == True) &
-                          (df[self.conclusion.lhs] > sum(self.conclusion.slopes[i] * df[self.conclusion.rhs[i]]
-                                                         for i in range(len(self.conclusion.rhs))) + self.conclusion.intercept)]
-        elif self.conclusion.inequality == ">=":
-            return df.loc[(df[self.hypothesis.statement] == True) &
-                          (df[self.conclusion.lhs] < sum(self.conclusion.slopes[i] * df[self.conclusion.rhs[i]]
-                                                         for i in range(len(self.conclusion.rhs))) + self.conclusion.intercept)]
-        else:
-            return df.loc[(df[self.hypothesis.statement] == True) &
-                          (df[self.conclusion.lhs] != sum(self.conclusion.slopes[i] * df[self.conclusion.rhs[i]]
-                                                         for i in range(len(self.conclusion.rhs))) + self.conclusion.intercept)]
-
-
+        false, _ = evaluate_conjecture_rows([self], df)
+        return df.loc[false[0]]
 
     def plot(self, df):
         import matplotlib.pyplot as plt
@@ -1,8 +1,13 @@
+from functions.registry import *
+from functions.data_loading import *
+from functions.graph_context import *
 from functions.invariant_functions import *
+from functions.invariant_store import *
 from functions.build_data import *
 from functions.ui_functions import *
 from functions.optimizations import *
 from functions.heuristics import *
+from functions.conjecture_evaluation import *
 from functions.filters import *
 from functions.write_on_the_wall import *
 from functions.formating import *
\ No newline at end of file
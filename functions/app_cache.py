@@ -0,0 +1,81 @@
+import json
+import os
+import pandas as pd
+import streamlit as st
+from functions.data_loading import compact_dtypes, read_lines
+
+__all__ = [
+    "load_lines",
+    "load_json",
+    "load_dataset",
+]
+
+# The Streamlit-cached loaders of the app pages. They live apart from functions.data_loading,
+# and are not imported by the functions package, so that the library can be used outside
+# of Streamlit without a Streamlit runtime.
+
+# The number of versions of each file kept in the cache. Older versions are evicted
+# once a file has changed this many times.
+MAX_CACHED_VERSIONS = 4
+
+
+def _file_version(file_path):
+    # A cheap fingerprint of the file contents; it changes whenever the file is rewritten.
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(max_entries=16 * MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_lines(file_path, version):
+    return read_lines(file_path)
+
+
+@st.cache_data(max_entries=4 * MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_json(file_path, version):
+    with open(file_path) as f:
+        return json.load(f)
+
+
+@st.cache_data(max_entries=4 * MAX_CACHED_VERSIONS, show_spinner=False)
+def _cached_dataset(file_path, version):
+    return compact_dtypes(pd.read_csv(file_path))
+
+
+def load_lines(file_path):
+    """
+    Returns the lines of a text file, read from disk only when the file has changed.
+
+    The lines are kept in the Streamlit cache, which is shared by every rerun and session
+    of the app, and keyed by the modification time and size of the file.
+    """
+    return _cached_lines(file_path, _file_version(file_path))
+
+
+def load_json(file_path):
+    """
+    Returns the contents of a json file, read from disk only when the file has changed.
+
+    The contents are cached in the same way as by load_lines.
+    """
+    return _cached_json(file_path, _file_version(file_path))
+
+
+def load_dataset(file_path):
+    """
+    Returns the graph data of a csv file, read from disk only when the file has changed.
+
+    The dataframe is cached in the same way as by load_lines, with the compact column
+    types of compact_dtypes. Each call returns its own copy of the cached dataframe, so
+    callers are free to modify it.
+
+    Parameters
+    ----------
+    file_path : string
+        The path to the csv file, e.g. training-data/data.csv.
+
+    Returns
+    -------
+    pandas dataframe
+        The graph data.
+    """
+    return _cached_dataset(file_path, _file_version(file_path))
@@ -0,0 +1,279 @@
+import networkx as nx
+import numpy as np
+from scipy import sparse
+
+__all__ = [
+    "BitsetGraph",
+    "bitset_graph",
+    "as_bitset_graph",
+    "read_bitset_edgelist",
+    "BITSET_FUNCTIONS",
+    "accepts_bitset_graph",
+    "is_connected",
+    "iter_bits",
+    "popcount",
+]
+
+# The functions of a graph that accept a BitsetGraph in place of a NetworkX graph. A
+# GraphContext that has a BitsetGraph passes it to them, so that they do not build its
+# NetworkX graph; see GraphContext.graph_for.
+BITSET_FUNCTIONS = set()
+
+
+def accepts_bitset_graph(function):
+    """Adds a function of a graph to BITSET_FUNCTIONS and returns it, for use as a decorator."""
+    BITSET_FUNCTIONS.add(function)
+    return function
+
+
+def iter_bits(mask):
+    """Yields the indices of the bits set in the integer mask, from lowest to highest."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def popcount(mask):
+    """Returns the number of bits set in the integer mask."""
+    return bin(mask).count("1")
+
+
+class BitsetGraph:
+    """
+    A compact, immutable graph stored as one integer bitmask of neighbors per vertex and as
+    int32 CSR adjacency arrays.
+
+    Vertex sets are integers whose i-th bit stands for the i-th vertex of nodes, so set
+    operations on them (union, intersection, difference) are single integer operations. The
+    CSR arrays serve the vectorized kernels: the neighbors of the i-th vertex are
+    indices[indptr[i]:indptr[i + 1]], in increasing order.
+
+    A BitsetGraph is accepted wherever a NetworkX graph is, e.g. by compute and by
+    GraphContext, which only build the NetworkX graph for the invariants that need it.
+
+    Parameters
+    ----------
+    G : NetworkX graph
+        An undirected graph.
+    nodes : list
+        The vertices of G, in the order of their bits. Defaults to the order of G.nodes().
+
+    Attributes
+    ----------
+    nodes : tuple
+        The vertices of the graph, in the order of their bits.
+    index : dict
+        Maps every vertex to its position in nodes.
+    neighbors : tuple of ints
+        neighbors[i] is the bitmask of the neighbors of the i-th vertex.
+    full : int
+        The bitmask of all vertices.
+    indptr, indices : numpy arrays of int32
+        The CSR adjacency of the graph.
+    """
+    __slots__ = ("nodes", "index", "neighbors", "full", "indptr", "indices")
+
+    def __init__(self, G, nodes=None):
+        nodes = list(G.nodes()) if nodes is None else list(nodes)
+        index = {v: i for i, v in enumerate(nodes)}
+        neighbors = [0] * len(nodes)
+        for u, v in G.edges():
+            if u != v:
+                neighbors[index[u]] |= 1 << index[v]
+                neighbors[index[v]] |= 1 << index[u]
+        self._set(nodes, neighbors)
+
+    def _set(self, nodes, neighbors):
+        # Fills in every attribute from the vertices and their neighbor bitmasks.
+        set_attribute = object.__setattr__
+        set_attribute(self, "nodes", tuple(nodes))
+        set_attribute(self, "index", {v: i for i, v in enumerate(nodes)})
+        set_attribute(self, "neighbors", tuple(neighbors))
+        set_attribute(self, "full", (1 << len(nodes)) - 1)
+        degrees = [popcount(mask) for mask in neighbors]
+        indptr = np.zeros(len(nodes) + 1, dtype=np.int32)
+        np.cumsum(degrees, out=indptr[1:])
+        indices = np.fromiter((j for mask in neighbors for j in iter_bits(mask)), dtype=np.int32, count=int(indptr[-1]))
+        indptr.flags.writeable = False
+        indices.flags.writeable = False
+        set_attribute(self, "indptr", indptr)
+        set_attribute(self, "indices", indices)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("BitsetGraph is immutable")
+
+    def __getstate__(self):
+        return (self.nodes, self.neighbors)
+
+    def __setstate__(self, state):
+        self._set(*state)
+
+    def __repr__(self):
+        return f"BitsetGraph({len(self.nodes)} vertices)"
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @classmethod
+    def from_neighbors(cls, nodes, neighbors):
+        """Returns the BitsetGraph with the given vertices and neighbor bitmasks."""
+        graph = cls.__new__(cls)
+        graph._set(nodes, neighbors)
+        return graph
+
+    def number_of_nodes(self):
+        return len(self.nodes)
+
+    def number_of_edges(self):
+        return len(self.indices) // 2
+
+    def degrees(self):
+        """Returns the degree of every vertex, in the order of nodes."""
+        return np.diff(self.indptr)
+
+    def edge_array(self):
+        """Returns the edges as an m x 2 array of vertex indices, the smaller index first."""
+        tails = np.repeat(np.arange(len(self.nodes), dtype=np.int32), self.degrees())
+        keep = tails < self.indices
+        return np.stack([tails[keep], self.indices[keep]], axis=1)
+
+    def adjacency_matrix(self, dtype=float):
+        """Returns the adjacency matrix as a scipy CSR array with int32 indices."""
+        data = np.ones(len(self.indices), dtype=dtype)
+        n = len(self.nodes)
+        # The arrays are copied, since the compiled routines of scipy reject read-only buffers.
+        return sparse.csr_array((data, self.indices.copy(), self.indptr.copy()), shape=(n, n))
+
+    def to_networkx(self):
+        """Returns the graph as a NetworkX graph with the same vertices."""
+        G = nx.Graph()
+        G.add_nodes_from(self.nodes)
+        G.add_edges_from((self.nodes[i], self.nodes[j]) for i, j in self.edge_array())
+        return G
+
+    def closed(self, i):
+        """Returns the bitmask of the closed neighborhood of the i-th vertex."""
+        return self.neighbors[i] | (1 << i)
+
+    def neighborhood(self, mask):
+        """Returns the bitmask of the vertices with a neighbor in mask."""
+        union = 0
+        for i in iter_bits(mask):
+            union |= self.neighbors[i]
+        return union
+
+    def mask(self, vertices):
+        """Returns the bitmask of a collection of vertices."""
+        mask = 0
+        for v in vertices:
+            mask |= 1 << self.index[v]
+        return mask
+
+    def vertices(self, mask):
+        """Returns the list of vertices in a bitmask."""
+        return [self.nodes[i] for i in iter_bits(mask)]
+
+    def components(self, mask=None):
+        """Yields the bitmasks of the connected components of the subgraph induced by mask."""
+        remaining = self.full if mask is None else mask
+        while remaining:
+            component = frontier = remaining & -remaining
+            while frontier:
+                frontier = self.neighborhood(frontier) & remaining & ~component
+                component |= frontier
+            remaining &= ~component
+            yield component
+
+    def is_connected(self, mask=None):
+        """Returns True if the subgraph induced by mask is connected and not empty."""
+        mask = self.full if mask is None else mask
+        component = next(self.components(mask), 0)
+        return mask != 0 and component == mask
+
+    def subgraph(self, mask):
+        """Returns the BitsetGraph of the subgraph induced by mask."""
+        indices = list(iter_bits(mask))
+        position = {i: j for j, i in enumerate(indices)}
+        return BitsetGraph.from_neighbors(
+            [self.nodes[i] for i in indices],
+            [sum(1 << position[k] for k in iter_bits(self.neighbors[i] & mask)) for i in indices],
+        )
+
+    def twin_classes(self):
+        """
+        Returns the classes of twin vertices, as a list with the class of every vertex.
+
+        Two vertices are twins if they have the same open neighborhood or the same closed
+        neighborhood, so exchanging them is an automorphism of the graph. Classes are
+        numbered from 0 in the order of their first vertex.
+        """
+        classes = []
+        keys = {}
+        for i, neighbors in enumerate(self.neighbors):
+            open_key, closed_key = ("open", neighbors), ("closed", neighbors | (1 << i))
+            if open_key in keys:
+                classes.append(keys[open_key])
+            elif closed_key in keys:
+                classes.append(keys[closed_key])
+            else:
+                # A vertex cannot have both an open and a closed twin, so one class per vertex suffices.
+                keys[open_key] = keys[closed_key] = len(keys) // 2
+                classes.append(keys[open_key])
+        return classes
+
+
+@accepts_bitset_graph
+def is_connected(G):
+    """
+    Returns True if G is connected, as networkx.is_connected, from the bitmasks of a BitsetGraph.
+
+    Raises NetworkXPointlessConcept for the null graph, as networkx.is_connected does.
+    """
+    if G.number_of_nodes() == 0:
+        raise nx.NetworkXPointlessConcept("Connectivity is undefined for the null graph.")
+    return G.is_connected() if isinstance(G, BitsetGraph) else nx.is_connected(G)
+
+
+def bitset_graph(G):
+    """Returns the BitsetGraph of the graph G."""
+    return BitsetGraph(G)
+
+
+def as_bitset_graph(G):
+    """
+    Returns G as a BitsetGraph.
+
+    A BitsetGraph is returned as it is, and the BitsetGraph of a GraphContext is cached on
+    the context, so every engine working on the context shares it.
+    """
+    # Imported here, since functions.graph_context builds on this module.
+    from functions.graph_context import GraphContext
+
+    if isinstance(G, BitsetGraph):
+        return G
+    if isinstance(G, GraphContext):
+        return G.cached(bitset_graph)
+    return BitsetGraph(G)
+
+
+def read_bitset_edgelist(path):
+    """
+    Reads an edgelist file, one edge "u v" per line, directly into a BitsetGraph.
+
+    The vertices are the string labels of the file, in order of first appearance, as for
+    networkx.read_edgelist, but no NetworkX graph is built. Text after a "#" is ignored.
+    """
+    index = {}
+    neighbors = []
+    with open(path) as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if len(parts) < 2:
+                continue
+            u, v = (index.setdefault(w, len(index)) for w in parts[:2])
+            neighbors.extend([0] * (len(index) - len(neighbors)))
+            if u != v:
+                neighbors[u] |= 1 << v
+                neighbors[v] |= 1 << u
+    return BitsetGraph.from_neighbors(list(index), neighbors)
@@ -1,5 +1,17 @@
-from functions.invariant_functions import compute
+from functions.invariant_functions import compute, spectral_kinds
+from functions.degree_indices import DEGREE_INDICES, DegreeTerms, degree_indices
+from functions.degree_sequences import prime_degree_sequence_invariants
+from functions.graph_context import GraphContext, prime_spectra
+from functions.registry import INVARIANTS
+from functions.invariant_store import InvariantStore
+from functions.data_loading import read_lines
+from functions.canonical import GraphIndex
+from functions.corpus import read_graph
+from functions.domination import SolverTimeLimit, solver_time_limit
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 import os
+import signal
 import grinpy as gp
 import pandas as pd
 import networkx as nx
@@ -10,6 +22,7 @@ __all__ = [
     "make_graph_dataframe",
     "get_graph_names",
     "make_graph_dataframe_from_edgelists",
+    "make_graph_dataframe_from_edgelists_in_parallel",
     "write_graph_data_to_csv",
     "get_edges_from_user_input",
     "create_graph_from_user_input",
@@ -21,73 +34,55 @@ __all__ = [
     "add_new_invariants",
 ]
 
-invariants = [
-    line.rstrip("\n")
-    for line in open("functions/invariants.txt")
-]
+invariants = read_lines("functions/invariants.txt")
 
-booleans = [
-    line.rstrip("\n")
-    for line in open("functions/properties.txt")
-]
+booleans = read_lines("functions/properties.txt")
 
-computable_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/computable_invariants.txt")
-]
+computable_invariants = read_lines("functions/computable_invariants.txt")
 
 
-def add_new_invariant(file_path, invariant):
-    df = pd.read_csv(file_path)
-
-    # Print the names of the graphs for debugging
-    print("Graph names:", df.name.tolist())
-
-    # Initialize the new column data
-    new_column = []
-
-    # Loop through each graph name and compute the strong harmonic index
-    for name in df.name:
-        graph_edgelist = f"graph-edgelists/{name}.txt"
-
-        # Check if the graph file exists and handle potential errors
-        try:
-            G = nx.read_edgelist(graph_edgelist)
-            strong_harmonic_index = compute(G, invariant)
-        except Exception as e:
-            print(f"Error processing {name}: {e}")
-            strong_harmonic_index = None  # Handle missing or error case appropriately
+def add_new_invariant(file_path, invariant, store=None):
+    """
+    Adds the column of a new invariant to a csv file of graph data.
 
-        new_column.append(strong_harmonic_index)
+    Graphs for which the invariant raises an error get a missing value.
 
-    # Add the new data as a column to the dataframe
-    df["strong_harmonic_index"] = new_column
+    Parameters
+    ----------
+    file_path : string
+        The path to the csv file, e.g. training-data/data.csv.
+    invariant : string
+        The name of the invariant.
+    store : InvariantStore
+        The store holding the computed values. Defaults to the store in training-data.
+    """
+    add_new_invariants(file_path, [invariant], store=store, ignore_errors=True)
 
-    # Save the updated dataframe back to the CSV
-    df.to_csv(file_path, index=False)
+def add_new_invariants(file_path, invariants, store=None, ignore_errors=False):
+    """
+    Adds the columns of new invariants to a csv file of graph data.
 
-    print(f"Updated data saved to {file_path}")
+    The values are computed through an InvariantStore, so each edgelist is read once for
+    all of the invariants and values that are already stored are not computed again.
 
-def add_new_invariants(file_path, invariants):
+    Parameters
+    ----------
+    file_path : string
+        The path to the csv file, e.g. training-data/data.csv.
+    invariants : list of strings
+        The names of the invariants.
+    store : InvariantStore
+        The store holding the computed values. Defaults to the store in training-data.
+    ignore_errors : bool
+        If True, graphs for which an invariant raises an error get a missing value.
+    """
     df = pd.read_csv(file_path)
+    store = InvariantStore() if store is None else store
 
-    # Print the names of the graphs for debugging
-    print("Graph names:", df.name.tolist())
-
+    store.add_edgelists(invariants, names=df.name, ignore_errors=ignore_errors)
+    values = store.dataframe(invariants, names=df.name)
     for invariant in invariants:
-        # Initialize the new column data
-        new_column = []
-
-        # Loop through each graph name and compute the strong harmonic index
-        for name in df.name:
-            graph_edgelist = f"graph-edgelists/{name}.txt"
-
-            G = nx.read_edgelist(graph_edgelist)
-            index = compute(G, invariant)
-            new_column.append(index)
-
-        # Add the new data as a column to the dataframe
-        df[f"{invariant}"] = new_column
+        df[invariant] = values[invariant].values
 
     # Save the updated dataframe back to the CSV
     df.to_csv(file_path, index=False)
@@ -98,9 +93,12 @@ def compute_graph_values_from_instance(G, name="G", invariants=invariants, prope
     """
     Returns a dictionary of graph invariants and properties of a given graph G.
 
+    All values are computed through one GraphContext, so each invariant, line graph,
+    spectrum, etc. of G is computed once and shared by the columns that use it.
+
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or GraphContext
         An undirected graph.
     name : string
         The name of the graph G.
@@ -114,12 +112,17 @@ def compute_graph_values_from_instance(G, name="G", invariants=invariants, prope
     dict
         A dictionary of graph invariants and properties of the graph G.
     """
+    context = G if isinstance(G, GraphContext) else GraphContext(G)
+    # The degree-based indices are computed together, in one vectorized pass over the degrees.
+    indices = [invariant for invariant in invariants if invariant in DEGREE_INDICES]
+    if indices:
+        context.values.update(degree_indices(context.cached(DegreeTerms), indices))
     data = {}
     data["name"] = name
     for invariant in invariants:
-        data[invariant] = compute(G, invariant)
+        data[invariant] = compute(context, invariant)
     for property in properties:
-        data[property] = compute(G, property)
+        data[property] = compute(context, property)
     return data
 
 def compute_graph_values_from_edgelist(name, path="graph-edgelists", invariants=invariants, properties=booleans):
@@ -142,13 +145,18 @@ def compute_graph_values_from_edgelist(name, path="graph-edgelists", invariants=
     dict
         A dictionary of graph invariants and properties of the graph G.
     """
-    G = gp.read_edgelist(path + "/" + name + ".txt")
+    G = read_graph(path, name)
     return compute_graph_values_from_instance(G, name, invariants, properties)
 
 def make_graph_dataframe(graphs, names, invariants=invariants, properties=booleans):
     """
     Returns a pandas dataframe of graph invariants and properties of a list of graphs.
 
+    The spectra read by the spectral invariants are computed for all of the graphs at once,
+    with the graphs of equal order solved together; see functions.graph_context.prime_spectra.
+    The invariants of the degree sequences are computed for all of the graphs at once as well;
+    see functions.degree_sequences.prime_degree_sequence_invariants.
+
     Parameters
     ----------
     graphs : list of NetworkX graphs
@@ -163,12 +171,15 @@ def make_graph_dataframe(graphs, names, invariants=invariants, properties=boolea
     pandas dataframe
         A pandas dataframe of graph invariants and properties of the graphs.
     """
+    contexts = [GraphContext(G) for G in graphs]
+    prime_spectra(contexts, spectral_kinds(invariants))
+    prime_degree_sequence_invariants(contexts, invariants)
     data = []
-    for G, name in zip(graphs, names):
-        data.append(compute_graph_values_from_instance(G, name, invariants, properties))
+    for context, name in zip(contexts, names):
+        data.append(compute_graph_values_from_instance(context, name, invariants, properties))
     return pd.DataFrame(data)
 
-def get_graph_names(path="graph-edgelists"):
+def get_graph_names(path="graph-edgelists", deduplicate=False):
     """
     Returns a list of graph names from a given path.
 
@@ -176,18 +187,35 @@ def get_graph_names(path="graph-edgelists"):
     ----------
     path : string
         The path to the directory containing the graphs.
+    deduplicate : bool
+        If True, only the first graph, in order of name, of every isomorphism class is
+        returned, and the skipped duplicates are reported.
 
     Returns
     -------
     list of strings
         A list of graph names.
     """
-    return [name[:-4] for name in os.listdir(path)]
+    names = [name[:-4] for name in os.listdir(path)]
+    if not deduplicate:
+        return names
+    index = GraphIndex()
+    unique = []
+    for name in sorted(names):
+        duplicate = index.add(name, read_graph(path, name))
+        if duplicate is None:
+            unique.append(name)
+        else:
+            print(f"Skipping {name}, which is isomorphic to {duplicate}.")
+    return unique
 
-def make_graph_dataframe_from_edgelists(path="graph-edgelists", invariants=invariants, properties=booleans):
+def make_graph_dataframe_from_edgelists(path="graph-edgelists", invariants=invariants, properties=booleans, deduplicate=False):
     """
     Returns a pandas dataframe of graph invariants and properties of a list of graphs.
 
+    The graphs are read from the packed corpus of the directory when it is up to date; see
+    functions.corpus.read_graph.
+
     Parameters
     ----------
     path : string
@@ -196,25 +224,195 @@ def make_graph_dataframe_from_edgelists(path="graph-edgelists", invariants=invar
         A list of graph invariants to be calculated for the graphs.
     properties : list of strings
         A list of graph properties to be checked for the graphs.
+    deduplicate : bool
+        If True, graphs isomorphic to a graph with an earlier name get no row. The default
+        keeps every edgelist, as in training-data/data.csv.
 
     Returns
     -------
     pandas dataframe
         A pandas dataframe of graph invariants and properties of the graphs.
     """
-    graph_names = get_graph_names(path)
+    graph_names = get_graph_names(path, deduplicate)
     graphs = []
     for graph_name in graph_names:
-        graphs.append(gp.read_edgelist(path + "/" + graph_name + ".txt"))
+        graphs.append(read_graph(path, graph_name))
     df = make_graph_dataframe(graphs, graph_names, invariants, properties)
     df.set_index("name", inplace=True)
     return df
 
-def write_graph_data_to_csv():
+def _dependency_levels(columns):
+    """
+    Groups the columns into levels so that every registered dependency of a column
+    is computed in an earlier level than the column itself.
+    """
+    levels = {}
+
+    def level(column):
+        if column not in levels:
+            invariant = INVARIANTS.get(column)
+            depends = invariant.depends if invariant is not None else ()
+            levels[column] = 1 + max((level(d) for d in depends), default=-1)
+        return levels[column]
+
+    for column in columns:
+        level(column)
+    grouped = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+    for column, depth in levels.items():
+        grouped[depth].append(column)
+    return grouped
+
+class _TaskTimeout(Exception):
+    pass
+
+def _raise_task_timeout(signum, frame):
+    raise _TaskTimeout()
+
+# The number of graph contexts a worker process keeps. The tasks of a level are submitted
+# graph by graph, so the few most recently used contexts serve nearly every task, and the
+# spectra and distance matrices of the other graphs are released.
+_MAX_WORKER_CONTEXTS = 8
+
+# Graph contexts of the graphs a worker process has most recently used, keyed by
+# (path, name), the least recently used first.
+_worker_contexts = OrderedDict()
+
+def _compute_column(path, name, column, known, timeout):
+    """
+    Computes one column for one graph in a worker process.
+
+    The timeout is enforced by SIGALRM between Python bytecodes and, for the domination
+    programs, passed to HiGHS as the time limit of every solve; see
+    functions.domination.solver_time_limit.
+
+    Returns a tuple (name, column, value, error), where error is None on success.
+    """
+    if (path, name) in _worker_contexts:
+        _worker_contexts.move_to_end((path, name))
+    else:
+        _worker_contexts[path, name] = GraphContext(read_graph(path, name))
+        while len(_worker_contexts) > _MAX_WORKER_CONTEXTS:
+            _worker_contexts.popitem(last=False)
+    context = _worker_contexts[path, name]
+    context.values.update(known)
+
+    use_alarm = timeout is not None and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_task_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        with solver_time_limit(timeout):
+            return name, column, compute(context, column), None
+    except (_TaskTimeout, SolverTimeLimit):
+        return name, column, None, f"timed out after {timeout} seconds"
+    except Exception as e:
+        return name, column, None, repr(e)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+def make_graph_dataframe_from_edgelists_in_parallel(
+        path="graph-edgelists",
+        invariants=invariants,
+        properties=booleans,
+        workers=None,
+        timeout=None,
+        deduplicate=False,
+    ):
+    """
+    Returns the same dataframe as make_graph_dataframe_from_edgelists, computing the
+    (graph, invariant) pairs on a pool of worker processes.
+
+    Columns are dispatched in dependency order, and each task receives the already computed
+    values of its graph, so derived columns such as "(order - domination_number)" only look
+    up their dependencies. A task that raises an error or runs longer than the timeout is
+    recorded as a missing value instead of aborting the build. When the directory has an up
+    to date packed corpus (see functions.corpus), every worker maps it once and reads its
+    graphs from it instead of parsing their edgelists.
+
+    Parameters
+    ----------
+    path : string
+        The path to the directory containing the graphs.
+    invariants : list of strings
+        A list of graph invariants to be calculated for the graphs.
+    properties : list of strings
+        A list of graph properties to be checked for the graphs.
+    workers : int
+        The number of worker processes. Defaults to the number of processors.
+    timeout : float
+        The number of seconds after which a single task is abandoned. The domination
+        programs are solved with the time left as the time limit of HiGHS; the rest of a
+        task is interrupted by SIGALRM, on the platforms that have it.
+    deduplicate : bool
+        If True, graphs isomorphic to a graph with an earlier name get no row. The default
+        keeps every edgelist, as in training-data/data.csv.
+
+    Returns
+    -------
+    pandas dataframe
+        A pandas dataframe of graph invariants and properties of the graphs.
+    """
+    graph_names = get_graph_names(path, deduplicate)
+    columns = list(invariants) + list(properties)
+    results = {name: {} for name in graph_names}
+    # The (graph, column) pairs that ran out of time.
+    timed_out = set()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for level in _dependency_levels(columns):
+            futures = []
+            for name in graph_names:
+                for column in level:
+                    invariant = INVARIANTS.get(column)
+                    depends = invariant.depends if invariant is not None else ()
+                    if any((name, d) in timed_out for d in depends):
+                        # A dependency ran out of time, so this column is missing as well.
+                        results[name][column] = None
+                        timed_out.add((name, column))
+                        continue
+                    # A dependency that raised an error is left out, since the column may
+                    # not need it; e.g. a hypothesis on a disconnected graph never reads the
+                    # diameter. If it does, the error is raised again in its own task.
+                    known = {d: results[name][d] for d in depends if results[name][d] is not None}
+                    futures.append(executor.submit(_compute_column, path, name, column, known, timeout))
+            for future in futures:
+                name, column, value, error = future.result()
+                if error is not None:
+                    print(f"Error processing {column} for {name}: {error}")
+                    if error.startswith("timed out"):
+                        timed_out.add((name, column))
+                results[name][column] = value
+
+    data = []
+    for name in graph_names:
+        row = {"name": name}
+        for column in columns:
+            row[column] = results[name][column]
+        data.append(row)
+    df = pd.DataFrame(data)
+    df.set_index("name", inplace=True)
+    return df
+
+def write_graph_data_to_csv(parallel=False, workers=None, timeout=None):
     """
     Writes graph data to a csv file.
+
+    Parameters
+    ----------
+    parallel : bool
+        If True, the invariants are computed on a pool of worker processes.
+    workers : int
+        The number of worker processes used when parallel is True.
+    timeout : float
+        The number of seconds after which a single task is abandoned when parallel is True;
+        see make_graph_dataframe_from_edgelists_in_parallel for its limits.
     """
-    df = make_graph_dataframe_from_edgelists()
+    if parallel:
+        df = make_graph_dataframe_from_edgelists_in_parallel(workers=workers, timeout=timeout)
+    else:
+        df = make_graph_dataframe_from_edgelists()
     df.to_csv(f"training-data/data.csv")
     return None
 
@@ -290,16 +488,31 @@ def update_data_from_user():
         else:
             edge = edge.split()
             edges.append((edge[0], edge[1]))
+    G = gp.Graph(edges)
+
+    # Check if the graph is isomorphic to a graph of the corpus. The store keeps the digest of
+    # every graph it has seen, so only edgelists added since the last check are read, and the
+    # check itself is one certificate lookup and an isomorphism test per graph sharing it.
+    store = InvariantStore()
+    graph_names = get_graph_names()
+    store.index_edgelists(graph_names)
+    corpus = set(graph_names)
+    duplicates = [graph_name for graph_name in store.find_graph(G) if graph_name in corpus]
+    if duplicates:
+        print(f"This graph is isomorphic to {duplicates[0]}, which is in the database of graphs.")
+        return None
+
+    # Compute the registered columns of the existing csv file through the store. Columns
+    # that are not registered, such as stale ones, are left empty.
+    columns = list(pd.read_csv("training-data/data.csv", nrows=0).columns)
+    values = store.add_graph(name, G, [column for column in columns[1:] if column in INVARIANTS])
+
+    # Only write the edgelist once its values are known, then append only the new row
+    # instead of rewriting the whole file.
     with open(f"graph-edgelists/{name}.txt", "w") as f:
             for edge in edges:
                 f.write(edge[0] + " " + edge[1] + "\n")
-    G = gp.Graph(edges)
-    values = compute_graph_values_from_instance(G, name)
-    df = pd.read_csv("training-data/data.csv")
-    # Append the new values to the dataframe, note that dataframes
-    # do not have an append method, so we concatenate the two dataframes
-    # and then drop the duplicates.
-    df = pd.concat([df, pd.DataFrame(values, index=[0])], ignore_index=True)
-    df.set_index("name", inplace=True)
-    df.to_csv("training-data/data.csv")
+    row = pd.DataFrame([values], columns=columns[1:])
+    row.insert(0, "name", name)
+    row.to_csv("training-data/data.csv", mode="a", header=False, index=False)
     return None
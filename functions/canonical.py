@@ -0,0 +1,90 @@
+import hashlib
+import networkx as nx
+
+__all__ = [
+    "graph_certificate",
+    "GraphIndex",
+]
+
+# Isomorphic graphs always get equal certificates. Non-isomorphic graphs almost always get
+# different ones, but Weisfeiler-Lehman refinement cannot separate every pair (e.g. some
+# regular graphs), so graphs with equal certificates are compared by an exact isomorphism
+# test before they are treated as the same graph.
+
+
+def graph_certificate(G, iterations=4):
+    """
+    Returns an isomorphism-invariant certificate of the graph G.
+
+    The certificate combines the order and size of G with a Weisfeiler-Lehman hash whose
+    initial vertex labels are the degree and the number of triangles at every vertex, which
+    separates many of the regular graphs that plain degree labels do not.
+
+    Parameters
+    ----------
+    G : NetworkX graph
+        An undirected graph.
+    iterations : int
+        The number of Weisfeiler-Lehman refinement rounds.
+
+    Returns
+    -------
+    string
+        The hexadecimal certificate. Isomorphic graphs have equal certificates.
+    """
+    H = nx.Graph()
+    H.add_nodes_from(G.nodes())
+    H.add_edges_from((u, v) for u, v in G.edges() if u != v)
+    triangles = nx.triangles(H)
+    nx.set_node_attributes(H, {v: f"{d}:{triangles[v]}" for v, d in H.degree()}, "label")
+    wl_hash = nx.weisfeiler_lehman_graph_hash(H, node_attr="label", iterations=iterations)
+    payload = f"{H.number_of_nodes()}:{H.number_of_edges()}:{wl_hash}"
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GraphIndex:
+    """
+    An index of graphs up to isomorphism.
+
+    Graphs are bucketed by graph_certificate, so looking up a graph costs one certificate and
+    an exact isomorphism test against the few graphs sharing its certificate.
+
+    Examples
+    --------
+    >>> index = GraphIndex()
+    >>> index.add("C5", nx.cycle_graph(5))
+    >>> index.add("pentagon", nx.relabel_nodes(nx.cycle_graph(5), {0: 2, 2: 0}))
+    'C5'
+    """
+    def __init__(self):
+        self._buckets = {}
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def __repr__(self):
+        return f"GraphIndex({len(self)} graphs)"
+
+    def find(self, G, certificate=None):
+        """Returns the name of an indexed graph isomorphic to G, or None if there is none."""
+        certificate = graph_certificate(G) if certificate is None else certificate
+        for name, H in self._buckets.get(certificate, ()):
+            if nx.is_isomorphic(G, H):
+                return name
+        return None
+
+    def add(self, name, G):
+        """
+        Adds the graph G under the given name, unless an isomorphic graph is already indexed.
+
+        Returns
+        -------
+        string or None
+            The name of the indexed graph isomorphic to G, in which case G is not added, or
+            None if G was added.
+        """
+        certificate = graph_certificate(G)
+        duplicate = self.find(G, certificate)
+        if duplicate is None:
+            self._buckets.setdefault(certificate, []).append((name, G))
+        return duplicate
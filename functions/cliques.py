@@ -0,0 +1,213 @@
+from functions.bitsets import accepts_bitset_graph, as_bitset_graph, iter_bits, popcount
+
+__all__ = [
+    "maximum_clique",
+    "clique_number",
+    "maximum_independent_set",
+    "independence_number",
+    "minimum_coloring",
+    "chromatic_number",
+]
+
+# Exact branch and bound solvers on the adjacency bitmasks of a BitsetGraph.
+#
+# Maximum cliques are found as in the MCQ/BBMC family of algorithms: the candidates of every
+# node of the search are greedily partitioned into independent sets (color classes), and a
+# candidate of color c cannot extend the current clique by more than c vertices, so the
+# branches whose bound does not beat the best clique found are cut. The vertices are taken
+# in order of non-increasing degree, which keeps the greedy colorings small.
+#
+# Independent sets are cliques of the complement, searched one connected component at a time.
+#
+# Colorings are found by DSATUR branch and bound: a largest clique is colored first, which
+# also breaks the symmetry between colors, the greedy DSATUR coloring gives the first upper
+# bound, and every node of the search colors an uncolored vertex with the most distinct colors
+# among its neighbors, trying the colors in use and then one new color.
+
+
+def _by_degree(neighbors):
+    # Relabels the vertices in order of non-increasing degree. Returns the new neighbor
+    # bitmasks and the original index of every new index.
+    order = sorted(range(len(neighbors)), key=lambda i: -popcount(neighbors[i]))
+    position = {i: j for j, i in enumerate(order)}
+    relabeled = [sum(1 << position[k] for k in iter_bits(neighbors[i])) for i in order]
+    return relabeled, order
+
+
+def _color_classes(neighbors, candidates):
+    # Greedily partitions the candidates into independent sets. Returns the vertices in the
+    # order they were colored, with the color of every vertex, colors counted from 1.
+    order = []
+    colors = []
+    color = 0
+    uncolored = candidates
+    while uncolored:
+        color += 1
+        available = uncolored
+        while available:
+            low = available & -available
+            v = low.bit_length() - 1
+            order.append(v)
+            colors.append(color)
+            uncolored ^= low
+            available &= ~low & ~neighbors[v]
+    return order, colors
+
+
+def _max_clique(neighbors, lower_bound=0):
+    # Returns the indices of a largest clique of the graph with the given neighbor bitmasks,
+    # or None if it has no clique larger than lower_bound.
+    neighbors, order = _by_degree(neighbors)
+    best = [None]
+    size = [lower_bound]
+
+    def expand(clique, candidates):
+        vertices, colors = _color_classes(neighbors, candidates)
+        for v, color in zip(reversed(vertices), reversed(colors)):
+            if len(clique) + color <= size[0]:
+                return
+            extended = clique + [v]
+            rest = candidates & neighbors[v]
+            if rest:
+                expand(extended, rest)
+            elif len(extended) > size[0]:
+                best[0] = extended
+                size[0] = len(extended)
+            candidates &= ~(1 << v)
+
+    expand([], (1 << len(neighbors)) - 1)
+    return None if best[0] is None else [order[v] for v in best[0]]
+
+
+def _complement(graph):
+    return [graph.full & ~(neighbors | 1 << i) for i, neighbors in enumerate(graph.neighbors)]
+
+
+@accepts_bitset_graph
+def maximum_clique(G):
+    """
+    Returns a largest clique of G.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    list
+        A list of nodes in a largest clique of G.
+    """
+    graph = as_bitset_graph(G)
+    return [graph.nodes[i] for i in _max_clique(list(graph.neighbors)) or []]
+
+
+def clique_number(G):
+    """Returns the clique number of G, the size of a largest clique."""
+    return len(maximum_clique(G))
+
+
+def maximum_independent_set(G):
+    """
+    Returns a largest independent set of G.
+
+    A largest independent set is the union of largest cliques of the complements of the
+    connected components of G.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    list
+        A list of nodes in a largest independent set of G.
+    """
+    graph = as_bitset_graph(G)
+    found = []
+    for component in graph.components():
+        sub = graph.subgraph(component)
+        found += [sub.nodes[i] for i in _max_clique(_complement(sub))]
+    return found
+
+
+def independence_number(G):
+    """Returns the independence number of G, the size of a largest independent set."""
+    return len(maximum_independent_set(G))
+
+
+def _dsatur(neighbors, precolored):
+    # Returns a coloring with the fewest colors, as a list of colors indexed by vertex. The
+    # vertices of precolored, a clique, get the colors 0, 1, ..., in order. The first complete
+    # coloring found is the greedy DSATUR coloring, and every later one uses fewer colors.
+    n = len(neighbors)
+    colors = [-1] * n
+    # saturation[v] is the bitmask of the colors of the neighbors of v.
+    saturation = [0] * n
+    uncolored = (1 << n) - 1
+    for c, v in enumerate(precolored):
+        colors[v] = c
+        uncolored &= ~(1 << v)
+        for u in iter_bits(neighbors[v]):
+            saturation[u] |= 1 << c
+    limit = [n + 1]
+    best = [None]
+
+    def search(uncolored, used):
+        if not uncolored:
+            best[0] = list(colors)
+            limit[0] = used
+            return
+        v = max(
+            iter_bits(uncolored),
+            key=lambda u: (popcount(saturation[u]), popcount(neighbors[u] & uncolored)),
+        )
+        rest = uncolored & ~(1 << v)
+        for c in range(used + 1):
+            if max(used, c + 1) >= limit[0]:
+                break
+            if saturation[v] >> c & 1:
+                continue
+            colors[v] = c
+            changed = [u for u in iter_bits(neighbors[v] & rest) if not saturation[u] >> c & 1]
+            for u in changed:
+                saturation[u] |= 1 << c
+            search(rest, max(used, c + 1))
+            for u in changed:
+                saturation[u] &= ~(1 << c)
+            colors[v] = -1
+            if limit[0] <= len(precolored):
+                # A coloring with as many colors as the precolored clique is optimal.
+                return
+
+    search(uncolored, len(precolored))
+    return best[0]
+
+
+def minimum_coloring(G, clique=None):
+    """
+    Returns a proper coloring of G with the fewest colors.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+    clique : list
+        A largest clique of G, if already known; it is colored first.
+
+    Returns
+    -------
+    dict
+        Maps every node of G to its color, an integer from 0 to the chromatic number minus 1.
+    """
+    graph = as_bitset_graph(G)
+    clique = maximum_clique(graph) if clique is None else clique
+    precolored = [graph.index[v] for v in clique]
+    colors = _dsatur(list(graph.neighbors), precolored)
+    return {v: colors[i] for i, v in enumerate(graph.nodes)}
+
+
+def chromatic_number(G, clique=None):
+    """Returns the chromatic number of G, the fewest colors of a proper coloring."""
+    return len(set(minimum_coloring(G, clique).values()))
@@ -0,0 +1,134 @@
+import math
+from fractions import Fraction
+import numpy as np
+
+__all__ = [
+    "evaluate_conjecture_rows",
+    "evaluate_conjectures",
+]
+
+# Largest common denominator for which the slopes and intercept of a conclusion are scaled
+# to integers. Conclusions with other coefficients are evaluated in floating point.
+MAX_DENOMINATOR = 2**20
+
+
+def _common_denominator(coefficients):
+    denominator = 1
+    for c in coefficients:
+        if isinstance(c, (int, np.integer)):
+            continue
+        if not isinstance(c, Fraction):
+            return None
+        denominator = denominator * c.denominator // math.gcd(denominator, c.denominator)
+        if denominator > MAX_DENOMINATOR:
+            return None
+    return denominator
+
+
+def evaluate_conjecture_rows(conjectures, df):
+    """
+    Evaluates a list of multilinear conjectures on every graph of a dataframe at once.
+
+    The invariant columns used by the conjectures are stacked into one dense matrix and the
+    hypotheses into boolean masks, so the right-hand sides of all conclusions are computed
+    by a single matrix product (slopes x columns + intercept) and compared with the targets.
+
+    Slopes and intercepts are Fractions with small denominators, as produced by the linear
+    programs in functions.optimizations. Each conclusion is multiplied through by the common
+    denominator of its coefficients, so the comparisons are exact on integer-valued columns.
+
+    Parameters
+    ----------
+    conjectures : list of MultiLinearConjecture
+        The conjectures to evaluate.
+    df : pandas.DataFrame
+        The dataframe containing the data.
+
+    Returns
+    -------
+    false : numpy array of bools
+        A matrix with one row per conjecture and one column per row of df. false[i, j] is True
+        if the j-th graph satisfies the hypothesis of the i-th conjecture and violates its
+        conclusion, so df.loc[false[i]] are the rows of conjectures[i].false_graphs(df).
+    sharp : numpy array of bools
+        A matrix of the same shape. sharp[i, j] is True if the j-th graph satisfies the
+        hypothesis of the i-th conjecture and attains equality in its conclusion, so
+        df.loc[sharp[i]] are the rows of conjectures[i].get_sharp_graphs(df).
+    """
+    rows = len(df)
+    if not conjectures:
+        return np.zeros((0, rows), dtype=bool), np.zeros((0, rows), dtype=bool)
+
+    columns = list(dict.fromkeys(
+        name for conj in conjectures for name in [conj.conclusion.lhs, *conj.conclusion.rhs]
+    ))
+    hypotheses = list(dict.fromkeys(conj.hypothesis.statement for conj in conjectures))
+    column_index = {name: i for i, name in enumerate(columns)}
+    hypothesis_index = {name: i for i, name in enumerate(hypotheses)}
+
+    X = df[columns].to_numpy(dtype=float).T
+    H = np.vstack([(df[hyp] == True).to_numpy(dtype=bool) for hyp in hypotheses])
+
+    # One row of integer (or, failing that, float) coefficients per conjecture.
+    S = np.zeros((len(conjectures), len(columns)))
+    used = np.zeros((len(conjectures), len(columns)), dtype=bool)
+    B = np.zeros(len(conjectures))
+    D = np.ones(len(conjectures))
+    targets = np.zeros(len(conjectures), dtype=int)
+    masks = np.zeros(len(conjectures), dtype=int)
+    for i, conj in enumerate(conjectures):
+        conclusion = conj.conclusion
+        denominator = _common_denominator([*conclusion.slopes, conclusion.intercept])
+        scale = 1 if denominator is None else denominator
+        for slope, rhs in zip(conclusion.slopes, conclusion.rhs):
+            S[i, column_index[rhs]] += float(slope * scale)
+            used[i, column_index[rhs]] = True
+        B[i] = float(conclusion.intercept * scale)
+        D[i] = scale
+        targets[i] = column_index[conclusion.lhs]
+        masks[i] = hypothesis_index[conj.hypothesis.statement]
+
+    with np.errstate(invalid="ignore"):
+        # Missing and infinite values would spread through the product to every conjecture,
+        # so they are left out of it and the affected entries are evaluated one by one.
+        finite = np.isfinite(X)
+        rhs = S @ np.where(finite, X, 0.0) + B[:, None]
+        for i, j in np.argwhere(used.astype(float) @ (~finite).astype(float) > 0):
+            rhs[i, j] = sum(S[i, c] * X[c, j] for c in np.flatnonzero(used[i])) + B[i]
+        lhs = D[:, None] * X[targets]
+        hypothesis = H[masks]
+
+        inequalities = np.array([conj.conclusion.inequality for conj in conjectures])
+        violated = np.where(
+            (inequalities == "<=")[:, None], lhs > rhs,
+            np.where((inequalities == ">=")[:, None], lhs < rhs, lhs != rhs),
+        )
+        sharp = hypothesis & (lhs == rhs)
+
+    return hypothesis & violated, sharp
+
+
+def evaluate_conjectures(conjectures, df):
+    """
+    Evaluates a list of multilinear conjectures on every graph of a dataframe at once; see
+    evaluate_conjecture_rows.
+
+    Parameters
+    ----------
+    conjectures : list of MultiLinearConjecture
+        The conjectures to evaluate.
+    df : pandas.DataFrame
+        The dataframe containing the data.
+
+    Returns
+    -------
+    false : numpy array of bools
+        false[i] is True if the i-th conjecture fails on a graph of df, i.e. if
+        conjectures[i].false_graphs(df) is not empty.
+    sharp : numpy array of bools
+        The matrix of the graphs attaining equality, as returned by evaluate_conjecture_rows.
+    touch : numpy array of ints
+        The number of sharp graphs of each conjecture.
+    """
+    false, sharp = evaluate_conjecture_rows(conjectures, df)
+    return false.any(axis=1), sharp, sharp.sum(axis=1)
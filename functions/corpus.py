@@ -0,0 +1,289 @@
+import os
+import sys
+import networkx as nx
+import numpy as np
+from functions.bitsets import BitsetGraph
+
+__all__ = [
+    "CORPUS_SUFFIX",
+    "corpus_file",
+    "PackedCorpus",
+    "write_packed_corpus",
+    "open_corpus",
+    "read_graph",
+]
+
+# A packed corpus holds every graph of an edgelist directory in one binary file, so a
+# worker maps the file once and reads any graph as a view into it, without opening and
+# parsing one text file per graph. The layout, in native byte order, is
+#
+#     magic            8 bytes, b"TXGCORP1"
+#     counts           int64[4]: graphs N, vertices V, edges E, bytes of the names
+#     vertex_offsets   int64[N + 1]: the vertices of graph i are labels[vertex_offsets[i]:vertex_offsets[i + 1]]
+#     edge_offsets     int64[N + 1]: the edges of graph i are edges[edge_offsets[i]:edge_offsets[i + 1]]
+#     labels           int32[V]: the integer labels of the vertices, in order of first appearance
+#     padding          to a multiple of 8 bytes
+#     edges            int32[E, 2]: the edges, as positions into the labels of their graph
+#     names            the graph names, utf-8, separated by newlines
+#
+# The edges are kept as they appear in the edgelist, so a graph read from the corpus has
+# the same vertices, in the same order, and the same edges as one read by read_edgelist.
+
+CORPUS_SUFFIX = ".corpus"
+
+_MAGIC = b"TXGCORP1"
+_HEADER = len(_MAGIC) + 4 * 8
+
+
+def corpus_file(path):
+    """Returns the path of the packed corpus of an edgelist directory, next to the directory."""
+    return os.path.normpath(path) + CORPUS_SUFFIX
+
+
+def _read_pairs(file_path):
+    # The labels of an edgelist file in order of first appearance, and its edges as pairs
+    # of positions into them. Text after a "#" is ignored.
+    index = {}
+    pairs = []
+    with open(file_path) as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if len(parts) < 2:
+                continue
+            for token in parts[:2]:
+                if token not in index:
+                    if token.lstrip("-").isdigit() and str(int(token)) == token:
+                        index[token] = len(index)
+                    else:
+                        raise ValueError(f"{file_path}: the vertex label {token!r} is not an integer.")
+            pairs.append((index[parts[0]], index[parts[1]]))
+    return [int(token) for token in index], pairs
+
+
+class PackedCorpus:
+    """
+    A packed corpus of graphs, memory-mapped from a file written by write_packed_corpus.
+
+    Opening the corpus only reads its offset tables and names; the labels and edges of a
+    graph are views into the mapped file, read from disk when first used and shared between
+    the processes that map the same file.
+
+    Parameters
+    ----------
+    file_path : string
+        The path to the packed corpus.
+
+    Attributes
+    ----------
+    names : list of strings
+        The names of the graphs, in the order they are stored.
+    index : dict
+        Maps every name to its position in names.
+    vertex_offsets, edge_offsets : numpy arrays of int64
+        The offset tables of the labels and the edges of the graphs.
+    labels : numpy array of int32
+        The labels of the vertices of all of the graphs.
+    edge_array : numpy array of int32
+        The edges of all of the graphs, one row per edge.
+
+    Examples
+    --------
+    >>> corpus = PackedCorpus(write_packed_corpus("graph-edgelists"))
+    >>> corpus.graph("petersen_graph").number_of_edges()
+    15
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._buffer = np.memmap(file_path, dtype=np.uint8, mode="r")
+        if bytes(self._buffer[:len(_MAGIC)]) != _MAGIC:
+            raise ValueError(f"{file_path} is not a packed graph corpus.")
+        count, vertices, edges, name_bytes = (
+            int(value) for value in np.frombuffer(self._buffer, dtype=np.int64, count=4, offset=len(_MAGIC))
+        )
+        offset = _HEADER
+        self.vertex_offsets = np.frombuffer(self._buffer, dtype=np.int64, count=count + 1, offset=offset)
+        offset += 8 * (count + 1)
+        self.edge_offsets = np.frombuffer(self._buffer, dtype=np.int64, count=count + 1, offset=offset)
+        offset += 8 * (count + 1)
+        self.labels = np.frombuffer(self._buffer, dtype=np.int32, count=vertices, offset=offset)
+        offset += -(-4 * vertices // 8) * 8
+        self.edge_array = np.frombuffer(self._buffer, dtype=np.int32, count=2 * edges, offset=offset).reshape(edges, 2)
+        offset += 8 * edges
+        text = bytes(self._buffer[offset:offset + name_bytes]).decode()
+        self.names = text.split("\n") if count else []
+        self.index = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __repr__(self):
+        return f"PackedCorpus({self.file_path!r}, {len(self)} graphs)"
+
+    def _position(self, key):
+        return self.index[key] if isinstance(key, str) else key
+
+    def order(self, key):
+        """Returns the number of vertices of a graph, given by name or position."""
+        i = self._position(key)
+        return int(self.vertex_offsets[i + 1] - self.vertex_offsets[i])
+
+    def vertex_labels(self, key):
+        """Returns the integer labels of the vertices of a graph, as a view into the file."""
+        i = self._position(key)
+        return self.labels[self.vertex_offsets[i]:self.vertex_offsets[i + 1]]
+
+    def edges(self, key):
+        """Returns the edges of a graph as an m x 2 array of positions into its labels, as a view into the file."""
+        i = self._position(key)
+        return self.edge_array[self.edge_offsets[i]:self.edge_offsets[i + 1]]
+
+    def graph(self, key, nodetype=str):
+        """
+        Returns a graph of the corpus as a NetworkX graph.
+
+        Parameters
+        ----------
+        key : string or int
+            The name or the position of the graph.
+        nodetype : callable
+            Converts the integer labels to the vertices; str, the default, gives the vertices
+            of networkx.read_edgelist without a nodetype.
+        """
+        nodes = [nodetype(label) for label in self.vertex_labels(key).tolist()]
+        G = nx.Graph()
+        G.add_nodes_from(nodes)
+        G.add_edges_from((nodes[u], nodes[v]) for u, v in self.edges(key).tolist())
+        return G
+
+    def bitset_graph(self, key, nodetype=str):
+        """Returns a graph of the corpus as a BitsetGraph, without building a NetworkX graph."""
+        nodes = [nodetype(label) for label in self.vertex_labels(key).tolist()]
+        neighbors = [0] * len(nodes)
+        for u, v in self.edges(key).tolist():
+            if u != v:
+                neighbors[u] |= 1 << v
+                neighbors[v] |= 1 << u
+        return BitsetGraph.from_neighbors(nodes, neighbors)
+
+
+def write_packed_corpus(path="graph-edgelists", file_path=None, names=None):
+    """
+    Packs the edgelists of a directory into one file, to be opened as a PackedCorpus.
+
+    Parameters
+    ----------
+    path : string
+        The path to the directory containing the graphs, one "<name>.txt" edgelist each,
+        with integer vertex labels.
+    file_path : string
+        The path of the packed corpus. Defaults to corpus_file(path).
+    names : list of strings
+        The names of the graphs to pack. Defaults to every edgelist in the directory, in
+        order of name.
+
+    Returns
+    -------
+    string
+        The path of the packed corpus.
+    """
+    file_path = corpus_file(path) if file_path is None else file_path
+    if names is None:
+        names = sorted(name[:-4] for name in os.listdir(path) if name.endswith(".txt"))
+    labels, edges = [], []
+    vertex_offsets, edge_offsets = [0], [0]
+    for name in names:
+        graph_labels, pairs = _read_pairs(os.path.join(path, name + ".txt"))
+        labels += graph_labels
+        edges += pairs
+        vertex_offsets.append(len(labels))
+        edge_offsets.append(len(edges))
+    text = "\n".join(names).encode()
+    label_array = np.array(labels, dtype=np.int32)
+    if not np.array_equal(label_array, labels):
+        raise ValueError(f"The vertex labels of {path} do not fit in 32 bits.")
+    counts = np.array([len(names), len(labels), len(edges), len(text)], dtype=np.int64)
+    # The corpus is written next to its final path and renamed, so readers never map a
+    # partially written file.
+    partial = file_path + ".partial"
+    with open(partial, "wb") as f:
+        f.write(_MAGIC)
+        f.write(counts.tobytes())
+        f.write(np.array(vertex_offsets, dtype=np.int64).tobytes())
+        f.write(np.array(edge_offsets, dtype=np.int64).tobytes())
+        f.write(label_array.tobytes())
+        f.write(bytes(-4 * len(labels) % 8))
+        f.write(np.array(edges, dtype=np.int32).reshape(-1, 2).tobytes())
+        f.write(text)
+    os.replace(partial, file_path)
+    return file_path
+
+
+# The corpora checked by this process, keyed by file path, as the corpus, or None if it is
+# older than its edgelists, with the modification times of the file and of the directory
+# when it was checked.
+_open_corpora = {}
+
+
+def _is_fresh(path, file_path):
+    # A corpus is fresh when it is newer than its directory and every edgelist in it, so an
+    # edgelist added or edited after packing makes the readers fall back to the text files.
+    packed = os.path.getmtime(file_path)
+    if os.path.getmtime(path) > packed:
+        return False
+    with os.scandir(path) as entries:
+        return all(entry.stat().st_mtime <= packed for entry in entries)
+
+
+def open_corpus(path="graph-edgelists"):
+    """
+    Returns the packed corpus of an edgelist directory, or None if it is missing or older than the edgelists.
+
+    The corpus is opened, and compared with every edgelist, once per process, and again
+    only when its file or the directory changes; reading a graph otherwise costs two stat
+    calls. An edgelist edited in place after that check is not noticed until the corpus is
+    repacked or a graph is added to the directory.
+    """
+    file_path = corpus_file(path)
+    if not os.path.exists(file_path):
+        _open_corpora.pop(file_path, None)
+        return None
+    mtimes = (os.path.getmtime(file_path), os.path.getmtime(path))
+    if file_path not in _open_corpora or _open_corpora[file_path][1:] != mtimes:
+        corpus = PackedCorpus(file_path) if _is_fresh(path, file_path) else None
+        _open_corpora[file_path] = (corpus,) + mtimes
+    return _open_corpora[file_path][0]
+
+
+def read_graph(path, name, nodetype=None):
+    """
+    Returns the graph "<name>.txt" of an edgelist directory as a NetworkX graph.
+
+    The graph is read from the packed corpus of the directory when it is fresh (see
+    open_corpus), and parsed from its edgelist otherwise; the vertices and edges are the same
+    either way.
+
+    Parameters
+    ----------
+    path : string
+        The path to the directory containing the graphs.
+    name : string
+        The name of the graph, without the ".txt" suffix.
+    nodetype : callable
+        Converts the vertex labels, as in networkx.read_edgelist.
+    """
+    corpus = open_corpus(path)
+    if corpus is not None and name in corpus:
+        return corpus.graph(name, str if nodetype is None else nodetype)
+    return nx.read_edgelist(os.path.join(path, name + ".txt"), nodetype=nodetype)
+
+
+if __name__ == "__main__":
+    # python -m functions.corpus graph-edgelists graph-small-edgelists
+    for directory in sys.argv[1:] or ["graph-edgelists"]:
+        print(f"Packed {directory} into {write_packed_corpus(directory)}")
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+__all__ = [
+    "read_lines",
+    "compact_dtypes",
+]
+
+
+def read_lines(file_path):
+    """
+    Returns the lines of a text file, such as functions/invariants.txt, without line endings.
+
+    Parameters
+    ----------
+    file_path : string
+        The path to the text file.
+
+    Returns
+    -------
+    list of strings
+        The lines of the file.
+    """
+    with open(file_path) as f:
+        return [line.rstrip("\n") for line in f]
+
+
+def compact_dtypes(df):
+    """
+    Returns the dataframe with each column stored in the smallest type that holds its values exactly.
+
+    Integer columns are downcast to the smallest integer type that fits them (int8 for
+    most invariants). Float columns are stored as float32 when every value survives the
+    conversion unchanged, and kept as float64 otherwise, so irrational invariants such as
+    eigenvalues keep their full precision. Boolean and text columns are left as they are.
+
+    Parameters
+    ----------
+    df : pandas dataframe
+        The graph data.
+
+    Returns
+    -------
+    pandas dataframe
+        A dataframe with the same values in compact column types.
+    """
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if pd.api.types.is_bool_dtype(values):
+            pass
+        elif pd.api.types.is_integer_dtype(values):
+            values = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_float_dtype(values):
+            single = values.astype(np.float32)
+            with np.errstate(invalid="ignore"):
+                exact = (single.astype(np.float64) == values) | values.isna()
+            if exact.all():
+                values = single
+        columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
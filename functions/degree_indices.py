@@ -0,0 +1,174 @@
+from functools import cached_property
+import networkx as nx
+import numpy as np
+from functions.bitsets import BitsetGraph, accepts_bitset_graph
+
+__all__ = [
+    "DegreeTerms",
+    "DEGREE_INDICES",
+    "two_degrees",
+    "degree_indices",
+]
+
+
+def two_degrees(G):
+    """
+    Returns the 2-degree of every vertex of G, the number of other vertices within distance 2.
+
+    The vertices within distance 2 of v are the nonzero entries of row v of A + A^2, so the
+    whole vector comes from one boolean sparse matrix product instead of a breadth first
+    search from every vertex.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    numpy array
+        The 2-degrees, as integers, in the order of G.nodes().
+    """
+    if G.number_of_nodes() == 0:
+        return np.zeros(0, dtype=int)
+    if isinstance(G, BitsetGraph):
+        A = G.adjacency_matrix(dtype=bool)
+    else:
+        A = nx.to_scipy_sparse_array(G, weight=None, format="csr", dtype=bool)
+    reach = A + A @ A
+    # Every vertex with an edge reaches itself in two steps; it is not counted.
+    return np.diff(reach.indptr) - reach.diagonal().astype(int)
+
+
+@accepts_bitset_graph
+class DegreeTerms:
+    """
+    The degree vectors of a graph from which the degree-based indices are computed.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+
+    Attributes
+    ----------
+    order : int
+        The number of vertices of G.
+    size : int
+        The number of edges of G.
+    d : numpy array
+        The degree of every vertex, in the order of G.nodes().
+    du, dv : numpy arrays
+        The degrees of the two endpoints of every edge, in the order of G.edges(), or of
+        BitsetGraph.edge_array.
+    e : numpy array
+        The edge degree of every edge uv, the number of edges sharing an endpoint with uv
+        counting uv itself once, d(u) + d(v) - 1.
+    edges : numpy array
+        The indices of the two endpoints of every edge, one row per edge.
+    d2 : numpy array
+        The 2-degree of every vertex; see two_degrees. Computed when first used.
+    d2u, d2v : numpy arrays
+        The 2-degrees of the two endpoints of every edge. Computed when first used.
+    """
+    def __init__(self, G):
+        self.order = G.number_of_nodes()
+        self.size = G.number_of_edges()
+        if isinstance(G, BitsetGraph):
+            self.d = G.degrees().astype(float)
+            self.edges = G.edge_array().astype(np.intp)
+        else:
+            index = {v: i for i, v in enumerate(G.nodes())}
+            self.d = np.fromiter((d for _, d in G.degree()), dtype=float, count=self.order)
+            self.edges = np.fromiter(
+                (index[w] for edge in G.edges() for w in edge), dtype=np.intp, count=2 * self.size
+            ).reshape(-1, 2)
+        self.du = self.d[self.edges[:, 0]]
+        self.dv = self.d[self.edges[:, 1]]
+        self.e = self.du + self.dv - 1
+        self._graph = G
+
+    @cached_property
+    def d2(self):
+        return two_degrees(self._graph)
+
+    @cached_property
+    def d2u(self):
+        return self.d2[self.edges[:, 0]]
+
+    @cached_property
+    def d2v(self):
+        return self.d2[self.edges[:, 1]]
+
+    def __repr__(self):
+        return f"DegreeTerms({self.order} vertices, {self.size} edges)"
+
+
+def _positive(x):
+    return x[x > 0]
+
+
+def _augmented_average_edge_degree(t):
+    # 2m / (average edge degree + 2), undefined for graphs without edges.
+    return 2 * t.size / (t.e.sum() / t.size + 2) if t.size else np.nan
+
+
+# Every degree-based index is one NumPy expression in the DegreeTerms t of the graph. The
+# degrees and 2-degrees of the endpoints of an edge are at least 1, so the edge sums need no
+# zero guards.
+DEGREE_INDICES = {
+    "randic_index": lambda t: (1 / np.sqrt(t.du * t.dv)).sum(),
+    "harmonic_index": lambda t: (2 / (t.du + t.dv)).sum(),
+    "sum_connectivity_index": lambda t: (1 / np.sqrt(t.du + t.dv)).sum(),
+    "strong_harmonic_index": lambda t: np.minimum(1 / t.du, 1 / t.dv).sum(),
+    "reciprocal_first_zagreb_index": lambda t: (1 / _positive(t.d) ** 2).sum(),
+    "reciprocal_second_zagreb_index": lambda t: (1 / (t.du * t.dv)).sum(),
+    "reciprocal_second_zagreb_variation": lambda t: (1 / (t.du + t.dv)).sum(),
+    "reciprocal_randic_index": lambda t: (1 / np.sqrt(t.du * t.dv)).sum(),
+    "reciprocal_augmented_zagreb_index": lambda t: (((t.du + t.dv - 2) / (t.du * t.dv)) ** 3).sum(),
+    "reciprocal_sum_connectivity_index": lambda t: (1 / np.sqrt(t.du + t.dv)).sum(),
+    "reciprocal_hyper_zagreb_index": lambda t: (1 / (t.d[t.d > 1] * (t.d[t.d > 1] - 1))).sum(),
+    "reciprocal_geometric_arithmetic_index": lambda t: (2 * np.sqrt(t.du * t.dv) / (t.du + t.dv)).sum(),
+    "augmented_average_edge_degree": _augmented_average_edge_degree,
+    "inverse_degree_plus_one_sum": lambda t: (1 / (t.d + 1)).sum(),
+    "inverse_degree_plus_two_sum": lambda t: (1 / (t.d + 2)).sum(),
+    "inverse_edge_degree_plus_one_sum": lambda t: (1 / (t.e + 1)).sum(),
+    "inverse_edge_degree_plus_two_sum": lambda t: (1 / (t.e + 2)).sum(),
+    "first_zagreb_index_2_degree": lambda t: (t.d2 ** 2).sum(),
+    "second_zagreb_index_2_degree": lambda t: (t.d2u * t.d2v).sum(),
+    "average_degree_2_degree": lambda t: t.d2.sum() / t.order,
+    "hyper_zagreb_index_2_degree": lambda t: (t.d2 * (t.d2 - 1)).sum(),
+    "reciprocal_first_zagreb_index_2_degree": lambda t: (1 / _positive(t.d2) ** 2).sum(),
+    "reciprocal_second_zagreb_index_2_degree": lambda t: (1 / (t.d2u * t.d2v)).sum(),
+    "reciprocal_randic_index_2_degree": lambda t: (1 / np.sqrt(t.d2u * t.d2v)).sum(),
+    "reciprocal_sum_connectivity_index_2_degree": lambda t: (1 / np.sqrt(t.d2u + t.d2v)).sum(),
+    "reciprocal_geometric_arithmetic_index_2_degree": lambda t: (2 * np.sqrt(t.d2u * t.d2v) / (t.d2u + t.d2v)).sum(),
+}
+
+
+def degree_indices(G, names=None):
+    """
+    Computes degree-based topological indices of a graph in one pass.
+
+    The degree vector and the endpoint degrees of the edges are extracted once, and every
+    index is then a NumPy reduction over them.
+
+    Parameters
+    ----------
+    G : NetworkX graph or DegreeTerms
+        An undirected graph.
+    names : list of strings
+        The indices to compute, among the keys of DEGREE_INDICES. Defaults to all of them.
+
+    Returns
+    -------
+    dict
+        The value of every index, as a Python int or float, keyed by name.
+    """
+    terms = G if isinstance(G, DegreeTerms) else DegreeTerms(G)
+    names = DEGREE_INDICES if names is None else names
+    values = {}
+    for name in names:
+        value = DEGREE_INDICES[name](terms)
+        values[name] = value.item() if isinstance(value, np.generic) else value
+    return values
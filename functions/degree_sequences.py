@@ -0,0 +1,303 @@
+from functools import cached_property
+import numpy as np
+from functions.bitsets import accepts_bitset_graph
+
+__all__ = [
+    "DEGREE_SEQUENCE_INVARIANTS",
+    "DegreeSequences",
+    "degree_sequence",
+    "degree_sequence_invariants",
+    "prime_degree_sequence_invariants",
+]
+
+# The invariants computed from the degree sequence alone, by DegreeSequences.invariant.
+DEGREE_SEQUENCE_INVARIANTS = [
+    "min_degree",
+    "max_degree",
+    "residue",
+    "annihilation_number",
+    "sub_total_domination_number",
+    "slater",
+]
+
+# The padding of the rows of DegreeSequences.elimination, below every real entry.
+_PAD = -1
+
+
+@accepts_bitset_graph
+def degree_sequence(G):
+    """Returns the degrees of the vertices of a NetworkX graph or a BitsetGraph, in non-increasing order."""
+    degrees = G.degrees() if hasattr(G, "degrees") else np.fromiter((d for _, d in G.degree()), dtype=np.int64)
+    return np.sort(np.asarray(degrees, dtype=np.int64))[::-1]
+
+
+class DegreeSequences:
+    """
+    The degree sequences of many graphs, as one padded array.
+
+    Every invariant that only depends on the degree sequence is computed for all of the
+    graphs at once, by NumPy operations on the whole array, instead of by a Python loop
+    per graph.
+
+    Parameters
+    ----------
+    graphs : list of NetworkX graphs or BitsetGraphs
+        Undirected graphs.
+
+    Attributes
+    ----------
+    orders : numpy array
+        The order n of every graph.
+    sizes : numpy array
+        The size m of every graph.
+    degrees : numpy array
+        Row i holds the degree sequence of the i-th graph, in non-increasing order, padded
+        with zeros to the largest order.
+    prefix_sums : numpy array
+        Entry (i, t) is the sum of the t largest degrees of the i-th graph, for t = 0, ..., the
+        largest order.
+    elimination : numpy array
+        Row i holds the elimination sequence of the Havel-Hakimi process on the i-th degree
+        sequence, the eliminated degrees followed by the final zeros, padded with -1.
+        Computed when first used.
+
+    Examples
+    --------
+    >>> sequences = DegreeSequences([gp.petersen_graph(), gp.star_graph(4)])
+    >>> sequences.invariant("residue")
+    [3, 4]
+    """
+    def __init__(self, graphs):
+        sequences = [degree_sequence(G) for G in graphs]
+        self.orders = np.array([len(s) for s in sequences], dtype=np.int64)
+        width = int(self.orders.max(initial=0))
+        self.degrees = np.zeros((len(sequences), width), dtype=np.int64)
+        for row, s in zip(self.degrees, sequences):
+            row[:len(s)] = s
+        self.prefix_sums = np.zeros((len(sequences), width + 1), dtype=np.int64)
+        np.cumsum(self.degrees, axis=1, out=self.prefix_sums[:, 1:])
+        self.sizes = self.prefix_sums[:, -1] // 2
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __repr__(self):
+        return f"DegreeSequences({len(self)} graphs)"
+
+    @property
+    def elimination(self):
+        return self._havel_hakimi[0]
+
+    def residues(self):
+        """Returns the residue of every sequence, the number of zeros left by the Havel-Hakimi process, or -1 if it is not graphic."""
+        return self._havel_hakimi[1]
+
+    @cached_property
+    def _havel_hakimi(self):
+        # The Havel-Hakimi process runs on all of the sequences in lockstep: every step
+        # removes the largest entry d of the rows still in the process, subtracts 1 from the
+        # next d entries and sorts the rows again.
+        count, width = self.degrees.shape
+        rows = np.full((count, width), _PAD, dtype=np.int64)
+        columns = np.arange(width)
+        real = columns[None, :] < self.orders[:, None]
+        rows[real] = self.degrees[real]
+        lengths = self.orders.copy()
+        eliminated = np.full((count, width), _PAD, dtype=np.int64)
+        steps = np.zeros(count, dtype=np.int64)
+        while True:
+            first = rows[:, 0] if width else np.zeros(count, dtype=np.int64)
+            active = np.flatnonzero((lengths > 0) & (first > 0) & (first < lengths))
+            if len(active) == 0:
+                break
+            d = first[active]
+            shifted = np.concatenate([rows[active, 1:], np.full((len(active), 1), _PAD)], axis=1)
+            shifted -= columns[None, :] < d[:, None]
+            rows[active] = -np.sort(-shifted, axis=1)
+            eliminated[active, steps[active]] = d
+            steps[active] += 1
+            lengths[active] -= 1
+        # The zeros left at the end are part of the elimination sequence of a graphic sequence.
+        graphic = ~((columns[None, :] < lengths[:, None]) & (rows != 0)).any(axis=1)
+        zeros = graphic[:, None] & (columns[None, :] >= steps[:, None]) & (columns[None, :] < (steps + lengths)[:, None])
+        eliminated[zeros] = 0
+        return eliminated, np.where(graphic, lengths, -1)
+
+    def sub_k_domination_numbers(self, ks):
+        """
+        Returns the sub-k-domination numbers of the graphs for several values of k at once.
+
+        The sub-k-domination number is the smallest t with t + (d_1 + ... + d_t) / k >= n,
+        for the degrees d_1 >= ... >= d_n. Since the left side grows with t, it is the number
+        of t < n with k (n - t) > d_1 + ... + d_t.
+
+        Parameters
+        ----------
+        ks : list of positive ints
+            The values of k.
+
+        Returns
+        -------
+        numpy array
+            Entry (i, j) is the sub-ks[j]-domination number of the i-th graph.
+        """
+        ks = np.asarray(ks, dtype=np.int64)
+        if (ks < 1).any():
+            raise ValueError("Expected k to be a positive integer.")
+        t = np.arange(self.degrees.shape[1])
+        gaps = self.orders[:, None] - t[None, :]
+        below = ks[None, :, None] * gaps[:, None, :] > self.prefix_sums[:, None, :-1]
+        return below.sum(axis=2)
+
+    def k_residues(self, ks):
+        """
+        Returns the k-residues of the graphs for several values of k at once.
+
+        The k-residue is (1 / k) sum_{i < k} (k - i) f(i), where f(i) is the frequency of i in
+        the elimination sequence.
+
+        Parameters
+        ----------
+        ks : list of positive ints
+            The values of k.
+
+        Returns
+        -------
+        numpy array
+            Entry (i, j) is the ks[j]-residue of the i-th graph.
+        """
+        ks = np.asarray(ks, dtype=np.int64)
+        counts, weights = self._elimination_sums()
+        last = np.minimum(ks - 1, counts.shape[1] - 1)
+        return (ks[None, :] * counts[:, last] - weights[:, last]) / ks[None, :]
+
+    def _elimination_sums(self):
+        # Entry (i, j) of the first array is the number of entries at most j in the i-th
+        # elimination sequence, and of the second one their sum.
+        E = self.elimination
+        count, width = E.shape
+        frequencies = np.zeros((count, width + 1), dtype=np.int64)
+        rows, positions = np.nonzero(E != _PAD)
+        np.add.at(frequencies, (rows, E[rows, positions]), 1)
+        values = np.arange(width + 1)
+        return np.cumsum(frequencies, axis=1), np.cumsum(frequencies * values, axis=1)
+
+    def k_slater_indices(self, domination_numbers):
+        """
+        Returns the smallest k >= 1 with a sub-k-domination number at least the domination number, for every graph.
+
+        The sub-k-domination number is at least g exactly when k (n - t) > d_1 + ... + d_t
+        for t = g - 1, so the index is (d_1 + ... + d_{g - 1}) // (n - g + 1) + 1.
+        """
+        g = np.asarray(domination_numbers, dtype=np.int64)
+        positive = g > 0
+        t = np.where(positive, g - 1, 0)
+        sums = self.prefix_sums[np.arange(len(self)), t]
+        return np.where(positive, sums // np.maximum(self.orders - t, 1) + 1, 1)
+
+    def k_residual_indices(self, independence_numbers):
+        """
+        Returns the smallest k >= 1 with a k-residue at least the independence number, for every graph.
+
+        The k-residues are compared exactly, as k f(0) + (k - 1) f(1) + ... >= k alpha, for
+        every k up to the largest order plus one. Beyond it the k-residue is n - E / k, where E
+        is the sum of the elimination sequence, so the index is at least E / (n - alpha).
+        """
+        alpha = np.asarray(independence_numbers, dtype=np.int64)
+        counts, weights = self._elimination_sums()
+        ks = np.arange(1, counts.shape[1] + 1)
+        holds = ks[None, :] * counts - weights >= ks[None, :] * alpha[:, None]
+        found = holds.any(axis=1)
+        total = weights[:, -1]
+        beyond = -(-total // np.maximum(self.orders - alpha, 1))
+        return np.where(found, holds.argmax(axis=1) + 1, np.maximum(beyond, len(ks) + 1))
+
+    def invariant(self, name):
+        """
+        Returns one of DEGREE_SEQUENCE_INVARIANTS for every graph.
+
+        Returns
+        -------
+        list
+            The values, as Python ints, in the order of the graphs. Graphs for which the
+            invariant is undefined, such as the sub-total domination number of a graph with
+            isolated vertices only, get None.
+        """
+        n = self.orders
+        defined = np.ones(len(self), dtype=bool)
+        if name in ("max_degree", "min_degree"):
+            # The degrees of the empty graph are padded with a zero column to index into.
+            degrees = np.pad(self.degrees, ((0, 0), (0, 1)))
+            values = degrees[:, 0] if name == "max_degree" else degrees[np.arange(len(self)), np.maximum(n - 1, 0)]
+            defined = n > 0
+        elif name == "residue":
+            values = self.residues()
+            defined = values >= 0
+        elif name == "annihilation_number":
+            # The t smallest degrees sum to at most m exactly when the n - t largest sum to at least m.
+            values = n - (self.prefix_sums < self.sizes[:, None]).sum(axis=1)
+        elif name == "sub_total_domination_number":
+            values = (self.prefix_sums < n[:, None]).sum(axis=1)
+            defined = values <= n
+        elif name == "slater":
+            values = self.sub_k_domination_numbers([1])[:, 0]
+        else:
+            raise ValueError(f"Unknown invariant {name!r}; expected one of {DEGREE_SEQUENCE_INVARIANTS}.")
+        return [int(value) if ok else None for value, ok in zip(values, defined)]
+
+
+def degree_sequence_invariants(graphs, names=DEGREE_SEQUENCE_INVARIANTS):
+    """
+    Computes invariants of the degree sequences of many graphs at once.
+
+    Parameters
+    ----------
+    graphs : list of NetworkX graphs or BitsetGraphs, or DegreeSequences
+        Undirected graphs.
+    names : list of strings
+        The invariants to compute, among DEGREE_SEQUENCE_INVARIANTS.
+
+    Returns
+    -------
+    dict
+        The list of the values of every invariant, in the order of the graphs, keyed by name.
+    """
+    sequences = graphs if isinstance(graphs, DegreeSequences) else DegreeSequences(graphs)
+    return {name: sequences.invariant(name) for name in names}
+
+
+def prime_degree_sequence_invariants(contexts, invariants):
+    """
+    Computes the degree sequence invariants of many graph contexts at once and stores them as their values.
+
+    Besides DEGREE_SEQUENCE_INVARIANTS, the "k_slater_index" and "k_residual_index" of the
+    contexts that already know their domination number, respectively independence number,
+    are filled in.
+
+    Parameters
+    ----------
+    contexts : list of GraphContexts
+        The contexts of the graphs.
+    invariants : list of strings
+        The invariants to be computed for the graphs; the others are left alone.
+    """
+    wanted = [name for name in DEGREE_SEQUENCE_INVARIANTS if name in invariants]
+    indices = [
+        ("k_slater_index", "domination_number", DegreeSequences.k_slater_indices),
+        ("k_residual_index", "independence_number", DegreeSequences.k_residual_indices),
+    ]
+    if not contexts or not (wanted or any(name in invariants for name, _, _ in indices)):
+        return None
+    sequences = DegreeSequences([context.graph_for(degree_sequence) for context in contexts])
+    for name, values in degree_sequence_invariants(sequences, wanted).items():
+        for context, value in zip(contexts, values):
+            context.values.setdefault(name, value)
+    for name, depends, method in indices:
+        if name not in invariants:
+            continue
+        known = [context.values.get(depends) for context in contexts]
+        values = method(sequences, [0 if value is None else value for value in known])
+        for context, value, depend in zip(contexts, values, known):
+            if depend is not None:
+                context.values.setdefault(name, int(value))
+    return None
@@ -0,0 +1,143 @@
+import networkx as nx
+import numpy as np
+from scipy.sparse.csgraph import shortest_path
+from functions.bitsets import BitsetGraph, accepts_bitset_graph
+
+__all__ = [
+    "UNREACHABLE",
+    "distance_matrix",
+    "eccentricities",
+    "wiener_index",
+    "triameter",
+]
+
+# The entry of a distance matrix for two vertices in different components.
+UNREACHABLE = -1
+
+
+def _distance_dtype(n):
+    # The smallest signed integer type holding the distances 0, ..., n - 1 and UNREACHABLE.
+    for dtype in (np.int8, np.int16, np.int32):
+        if n <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+@accepts_bitset_graph
+def distance_matrix(G):
+    """
+    Returns the matrix of the distances between all pairs of vertices of G.
+
+    The distances are computed by one breadth first search per vertex in compiled code, and
+    stored in the smallest integer type that holds them, so the matrix of a graph of order at
+    most 127 takes one byte per entry.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    numpy array
+        The n x n matrix of distances, with rows and columns in the order of G.nodes(), and
+        UNREACHABLE for pairs of vertices in different components.
+    """
+    n = G.number_of_nodes()
+    if n == 0:
+        return np.zeros((0, 0), dtype=np.int8)
+    if isinstance(G, BitsetGraph):
+        A = G.adjacency_matrix()
+    else:
+        A = nx.to_scipy_sparse_array(G, weight=None, format="csr")
+        # The compiled graph routines of scipy only accept 32-bit index arrays.
+        A.indices = A.indices.astype(np.int32)
+        A.indptr = A.indptr.astype(np.int32)
+    distances = shortest_path(A, method="D", directed=False, unweighted=True)
+    distances[np.isinf(distances)] = UNREACHABLE
+    return distances.astype(_distance_dtype(n))
+
+
+def _require_connected(distances):
+    if (distances == UNREACHABLE).any():
+        raise nx.NetworkXError("Found infinite path length because the graph is not connected")
+
+
+def eccentricities(distances):
+    """
+    Returns the eccentricity of every vertex, the largest distance from it to another vertex.
+
+    Parameters
+    ----------
+    distances : numpy array
+        The distance matrix of a connected graph, as returned by distance_matrix.
+
+    Returns
+    -------
+    numpy array
+        The eccentricities, in the order of the rows of distances.
+
+    Raises
+    ------
+    NetworkXError
+        If the graph is not connected.
+    """
+    _require_connected(distances)
+    return distances.max(axis=1)
+
+
+def wiener_index(distances):
+    """
+    Returns the Wiener index of a graph, the sum of the distances between all pairs of vertices.
+
+    As in networkx.wiener_index, the value is a float, and it is infinite for graphs that are
+    not connected.
+    """
+    if (distances == UNREACHABLE).any():
+        return float("inf")
+    return int(distances.sum(dtype=np.int64)) / 2
+
+
+def triameter(distances):
+    """
+    Returns the triameter of a graph, max{d(u, v) + d(v, w) + d(u, w) : u, v, w distinct vertices}.
+
+    For every vertex u, the largest sum over the triples containing u is one vectorized
+    maximum over the n x n matrix d(u, v) + d(u, w) + d(v, w). The vertices are taken in
+    order of decreasing eccentricity, and the search stops once 2 ecc(u) + diameter cannot
+    exceed the best sum found. Triples with a repeated vertex sum to at most 2 diameter,
+    which the triameter of a connected graph of order at least 3 always reaches, so they
+    need not be excluded.
+
+    Parameters
+    ----------
+    distances : numpy array
+        The distance matrix of a connected graph of order at least 3.
+
+    Returns
+    -------
+    int
+        The triameter of the graph.
+
+    Raises
+    ------
+    NetworkXNoPath
+        If the graph is not connected, as for the shortest paths of NetworkX.
+    ValueError
+        If the graph has fewer than 3 vertices.
+    """
+    if len(distances) < 3:
+        raise ValueError("The triameter is only defined for graphs with at least 3 vertices.")
+    if (distances == UNREACHABLE).any():
+        raise nx.NetworkXNoPath("The graph is not connected, so some pairs of vertices are joined by no path.")
+    ecc = eccentricities(distances)
+    diameter = int(ecc.max())
+    # Sums of three distances overflow the compact distance types.
+    distances = distances.astype(np.int32)
+    best = 2 * diameter
+    for u in np.argsort(-ecc, kind="stable"):
+        if 2 * int(ecc[u]) + diameter <= best:
+            break
+        row = distances[u]
+        best = max(best, int((row[:, None] + row[None, :] + distances).max()))
+    return best
@@ -0,0 +1,455 @@
+import time
+from contextlib import contextmanager
+import networkx as nx
+import numpy as np
+from scipy import sparse
+from scipy.optimize import LinearConstraint, milp
+from functions.bitsets import BitsetGraph, accepts_bitset_graph
+from functions.graph_context import GraphContext
+
+__all__ = [
+    "DOMINATION_VARIANTS",
+    "domination_variant",
+    "neighborhood_matrices",
+    "DominationProgram",
+    "DominationSolution",
+    "SolverTimeLimit",
+    "solver_time_limit",
+    "solve_domination",
+]
+
+# The time.monotonic() value by which the programs being solved must be finished, or None;
+# see solver_time_limit.
+_deadline = None
+
+
+class SolverTimeLimit(TimeoutError):
+    """Raised when a program is not solved to optimality before the deadline of solver_time_limit."""
+
+
+@contextmanager
+def solver_time_limit(seconds):
+    """
+    Bounds the time spent solving the programs of the domination variants inside the block.
+
+    Every HiGHS solve receives the time left until the deadline as its own time limit, so
+    the bound holds inside the compiled solver, which a signal cannot interrupt. A solve that
+    reaches the limit raises SolverTimeLimit. Nested blocks keep the earlier deadline, and
+    seconds=None sets no limit.
+
+    Examples
+    --------
+    >>> with solver_time_limit(30):
+    ...     solve_domination(nx.petersen_graph(), "roman").value
+    6
+    """
+    global _deadline
+    previous = _deadline
+    if seconds is not None:
+        deadline = time.monotonic() + seconds
+        _deadline = deadline if previous is None else min(previous, deadline)
+    try:
+        yield
+    finally:
+        _deadline = previous
+
+
+# Maps the name of every domination variant to the function adding its variables and constraints.
+DOMINATION_VARIANTS = {}
+
+
+def domination_variant(name):
+    """
+    Registers a function adding the variables and constraints of a domination variant.
+
+    The function is called as build(program, **parameters) on a fresh DominationProgram.
+
+    Examples
+    --------
+    >>> @domination_variant("perfect")
+    ... def _perfect(program):
+    ...     x = program.add_block("x", cost=1)
+    ...     program.add_constraints([(x, program.closed)], lower=1, upper=1)
+    """
+    def decorator(build):
+        DOMINATION_VARIANTS[name] = build
+        return build
+    return decorator
+
+
+class NeighborhoodMatrices:
+    """
+    The sparse neighborhood incidence matrices of a graph, shared by all domination variants.
+
+    Attributes
+    ----------
+    nodes : list
+        The vertices of the graph, in the order of the rows and columns of the matrices.
+    adjacency : scipy sparse matrix
+        The open neighborhood matrix; row v has a 1 in the column of every neighbor of v.
+    closed : scipy sparse matrix
+        The closed neighborhood matrix, adjacency + identity.
+    edges : numpy array
+        The edges of the graph as pairs of row indices.
+    incidence : scipy sparse matrix
+        The edge-vertex incidence matrix, with one row per edge.
+    """
+    def __init__(self, G):
+        if isinstance(G, BitsetGraph):
+            self.nodes = list(G.nodes)
+            self.adjacency = G.adjacency_matrix(dtype=np.int64)
+            self.edges = G.edge_array().astype(int)
+        else:
+            self.nodes = list(G.nodes())
+            index = {v: i for i, v in enumerate(self.nodes)}
+            if self.nodes:
+                self.adjacency = nx.to_scipy_sparse_array(G, nodelist=self.nodes, weight=None, format="csr")
+                self.adjacency.data[:] = 1
+            else:
+                self.adjacency = sparse.csr_array((0, 0))
+            self.edges = np.array([(index[u], index[v]) for u, v in G.edges() if u != v], dtype=int).reshape(-1, 2)
+        self.identity = sparse.identity(len(self.nodes), format="csr")
+        self.closed = (self.adjacency + self.identity).tocsr()
+        rows = np.repeat(np.arange(len(self.edges)), 2)
+        self.incidence = sparse.csr_array(
+            (np.ones(2 * len(self.edges)), (rows, self.edges.reshape(-1))), shape=(len(self.edges), len(self.nodes))
+        )
+
+    @property
+    def degrees(self):
+        return np.asarray(self.adjacency.sum(axis=1)).reshape(-1)
+
+
+@accepts_bitset_graph
+def neighborhood_matrices(G):
+    """Returns the NeighborhoodMatrices of the graph G."""
+    return NeighborhoodMatrices(G)
+
+
+class DominationProgram:
+    """
+    A binary program over blocks of per-vertex variables, built on the neighborhood matrices of a graph.
+
+    A variant adds its blocks of variables with add_block and its constraints with
+    add_constraints, where each constraint family is a list of (block, matrix) terms: the
+    rows of the family are the sums of matrix @ block over the terms. The program is solved
+    in-process by the HiGHS solver of scipy.
+
+    Parameters
+    ----------
+    matrices : NeighborhoodMatrices
+        The matrices of the graph.
+    """
+    def __init__(self, matrices):
+        self.matrices = matrices
+        self.nodes = matrices.nodes
+        self.n = len(matrices.nodes)
+        self.adjacency = matrices.adjacency
+        self.closed = matrices.closed
+        self.identity = matrices.identity
+        self.incidence = matrices.incidence
+        self.blocks = {}
+        self._costs = []
+        self._integrality = []
+        self._upper = []
+        self._families = []
+
+    def add_block(self, name, cost=0, size=None, upper=1, integer=True):
+        """Adds a block of variables (one per vertex unless size is given) and returns its name."""
+        size = self.n if size is None else size
+        start = sum(len(cost) for cost in self._costs)
+        self.blocks[name] = slice(start, start + size)
+        self._costs.append(np.full(size, cost, dtype=float))
+        self._integrality.append(np.full(size, 1 if integer else 0))
+        self._upper.append(np.full(size, upper, dtype=float))
+        return name
+
+    def add_constraints(self, terms, lower=-np.inf, upper=np.inf):
+        """Adds the constraint family lower <= sum(matrix @ block for block, matrix in terms) <= upper."""
+        self._families.append((terms, lower, upper))
+
+    def objective_row(self):
+        return np.concatenate(self._costs)
+
+    def solve(self, lower_bound=None, upper_bound=None):
+        """
+        Solves the program, optionally within known bounds on its optimal value.
+
+        Bounds taken from invariants that are already known, such as the domination number,
+        prune the branch and bound search.
+
+        Returns
+        -------
+        DominationSolution or None
+            The optimal solution, or None if the program is infeasible.
+
+        Raises
+        ------
+        SolverTimeLimit
+            If the deadline of an enclosing solver_time_limit is reached first.
+        """
+        c = self.objective_row()
+        if len(c) == 0:
+            return DominationSolution(self, c)
+        matrices, lowers, uppers = [], [], []
+        for terms, lower, upper in self._families:
+            rows = terms[0][1].shape[0]
+            if rows == 0:
+                continue
+            parts = []
+            for name, block in self.blocks.items():
+                matrix = sparse.csr_array((rows, block.stop - block.start))
+                for term, term_matrix in terms:
+                    if term == name:
+                        matrix = matrix + term_matrix
+                parts.append(matrix)
+            matrices.append(sparse.hstack(parts, format="csr"))
+            lowers.append(np.broadcast_to(lower, rows))
+            uppers.append(np.broadcast_to(upper, rows))
+        if lower_bound is not None or upper_bound is not None:
+            matrices.append(sparse.csr_array(c[None, :]))
+            lowers.append([-np.inf if lower_bound is None else lower_bound])
+            uppers.append([np.inf if upper_bound is None else upper_bound])
+        if not matrices:
+            # Without constraints, the zero vector is optimal, since every cost is nonnegative.
+            return DominationSolution(self, np.zeros(len(c)))
+        A = sparse.vstack(matrices, format="csc")
+        # The HiGHS wrapper of scipy only accepts 32-bit indices.
+        A.indices = A.indices.astype(np.int32)
+        A.indptr = A.indptr.astype(np.int32)
+        options = {}
+        if _deadline is not None:
+            remaining = _deadline - time.monotonic()
+            if remaining <= 0:
+                raise SolverTimeLimit("The time limit was reached before the program was solved.")
+            options["time_limit"] = remaining
+        result = milp(
+            c,
+            constraints=LinearConstraint(A, np.concatenate(lowers), np.concatenate(uppers)),
+            integrality=np.concatenate(self._integrality),
+            bounds=(0, np.concatenate(self._upper)),
+            options=options,
+        )
+        if result.status == 1:
+            # Status 1 is an iteration or time limit; only the time limit is ever set.
+            raise SolverTimeLimit("The time limit was reached before the program was solved.")
+        if result.x is None:
+            return None
+        return DominationSolution(self, result.x)
+
+
+class DominationSolution:
+    """
+    An optimal solution of a DominationProgram.
+
+    Attributes
+    ----------
+    value : int or float
+        The optimal value of the program.
+    """
+    def __init__(self, program, x):
+        self.program = program
+        self.x = x
+        value = float(program.objective_row() @ x)
+        self.value = int(round(value)) if abs(value - round(value)) < 1e-6 else value
+
+    def __repr__(self):
+        return f"DominationSolution(value={self.value})"
+
+    def block(self, name):
+        """Returns the values of a block of variables, rounded to integers."""
+        return np.rint(self.x[self.program.blocks[name]]).astype(int)
+
+    def vertices(self, name):
+        """Returns the vertices whose variable in the given block is 1."""
+        return [v for v, value in zip(self.program.nodes, self.block(name)) if value == 1]
+
+    def edges(self, name):
+        """Returns the edges whose variable in the given block of per-edge variables is 1."""
+        nodes = self.program.nodes
+        return [
+            (nodes[u], nodes[v]) for (u, v), value in zip(self.program.matrices.edges, self.block(name)) if value == 1
+        ]
+
+
+def solve_domination(G, variant, lower_bound=None, upper_bound=None, **parameters):
+    """
+    Solves the program of a domination variant on a graph.
+
+    Parameters
+    ----------
+    G : NetworkX graph or GraphContext
+        An undirected graph. For a GraphContext, the neighborhood matrices are cached on
+        the context and shared by every variant solved on it.
+    variant : string
+        The name of the variant, one of the keys of DOMINATION_VARIANTS.
+    lower_bound, upper_bound : int
+        Known bounds on the optimal value, e.g. from the domination number.
+    **parameters
+        The parameters of the variant, e.g. k for "rainbow".
+
+    Returns
+    -------
+    DominationSolution
+        The optimal solution.
+
+    Raises
+    ------
+    ValueError
+        If the variant has no feasible solution on the graph.
+    SolverTimeLimit
+        If the deadline of an enclosing solver_time_limit is reached first.
+    """
+    if isinstance(G, GraphContext):
+        matrices = G.cached(neighborhood_matrices)
+    else:
+        matrices = neighborhood_matrices(G)
+    program = DominationProgram(matrices)
+    DOMINATION_VARIANTS[variant](program, **parameters)
+    solution = program.solve(lower_bound, upper_bound)
+    if solution is None:
+        raise ValueError(f"The graph has no {variant} dominating set.")
+    return solution
+
+
+@domination_variant("domination")
+def _domination(program):
+    # x_v = 1 if v is in the set; every closed neighborhood meets the set.
+    x = program.add_block("x", cost=1)
+    program.add_constraints([(x, program.closed)], lower=1)
+
+
+@domination_variant("total")
+def _total_domination(program):
+    # Every open neighborhood meets the set.
+    x = program.add_block("x", cost=1)
+    program.add_constraints([(x, program.adjacency)], lower=1)
+
+
+@domination_variant("independent")
+def _independent_domination(program):
+    _domination(program)
+    program.add_constraints([("x", program.incidence)], upper=1)
+
+
+def _arc_matrices(program):
+    # The vertex-arc incidence matrices of the two arcs (u, v) and (v, u) of every edge.
+    edges = program.matrices.edges
+    arcs = 2 * len(edges)
+    tails = np.concatenate([edges[:, 0], edges[:, 1]])
+    heads = np.concatenate([edges[:, 1], edges[:, 0]])
+    into = sparse.csr_array((np.ones(arcs), (heads, np.arange(arcs))), shape=(program.n, arcs))
+    out_of = sparse.csr_array((np.ones(arcs), (tails, np.arange(arcs))), shape=(program.n, arcs))
+    return arcs, into, out_of
+
+
+@domination_variant("connected")
+def _connected_domination(program):
+    # A single-commodity flow from a chosen root vertex sends one unit to every vertex of
+    # the set along edges inside the set, so the set induces a connected subgraph.
+    _domination(program)
+    n = program.n
+    arcs, into, out_of = _arc_matrices(program)
+    r = program.add_block("root")
+    g = program.add_block("source_flow", upper=n, integer=False)
+    f = program.add_block("flow", size=arcs, upper=max(n - 1, 0), integer=False)
+    program.add_constraints([(r, sparse.csr_array(np.ones((1, n))))], lower=1, upper=1)
+    program.add_constraints([(g, program.identity), (r, -n * program.identity)], upper=0)
+    program.add_constraints([(r, program.identity), ("x", -program.identity)], upper=0)
+    program.add_constraints([(g, program.identity), (f, into - out_of), ("x", -program.identity)], lower=0, upper=0)
+    program.add_constraints([(f, sparse.identity(arcs, format="csr")), ("x", -(n - 1) * out_of.T)], upper=0)
+    program.add_constraints([(f, sparse.identity(arcs, format="csr")), ("x", -(n - 1) * into.T)], upper=0)
+
+
+@domination_variant("outer_connected")
+def _outer_connected_domination(program):
+    # The vertices outside the set induce a connected subgraph, or there are none. As for
+    # connected domination, a flow from a root sends one unit to every vertex outside the
+    # set along edges outside the set; the root is only required when x_v = 0 for some v.
+    _domination(program)
+    n = program.n
+    arcs, into, out_of = _arc_matrices(program)
+    r = program.add_block("root")
+    g = program.add_block("source_flow", upper=n, integer=False)
+    f = program.add_block("flow", size=arcs, upper=max(n - 1, 0), integer=False)
+    program.add_constraints([(r, sparse.csr_array(np.ones((1, n))))], upper=1)
+    program.add_constraints([(r, sparse.csr_array(np.ones((n, n)))), ("x", program.identity)], lower=1)
+    program.add_constraints([(g, program.identity), (r, -n * program.identity)], upper=0)
+    program.add_constraints([(r, program.identity), ("x", program.identity)], upper=1)
+    program.add_constraints([(g, program.identity), (f, into - out_of), ("x", program.identity)], lower=1, upper=1)
+    program.add_constraints([(f, sparse.identity(arcs, format="csr")), ("x", (n - 1) * out_of.T)], upper=n - 1)
+    program.add_constraints([(f, sparse.identity(arcs, format="csr")), ("x", (n - 1) * into.T)], upper=n - 1)
+
+
+@domination_variant("semitotal")
+def _semitotal_domination(program):
+    # Every vertex of the set has another vertex of the set within distance 2.
+    _domination(program)
+    within_two = (program.closed @ program.closed).tocsr()
+    within_two.data[:] = 1
+    within_two = (within_two - program.identity).tocsr()
+    within_two.eliminate_zeros()
+    program.add_constraints([("x", program.identity - within_two)], upper=0)
+
+
+@domination_variant("restrained")
+def _restrained_domination(program):
+    # Every vertex outside the set has a neighbor outside the set:
+    # sum over N(v) of (1 - x_u) >= 1 - x_v.
+    _domination(program)
+    program.add_constraints([("x", program.identity - program.adjacency)], lower=1 - program.matrices.degrees)
+
+
+@domination_variant("roman")
+def _roman_domination(program):
+    # x_v = 1 if f(v) = 1 and y_v = 1 if f(v) = 2; a vertex with f(v) = 0 has a neighbor with f = 2.
+    x = program.add_block("x", cost=1)
+    y = program.add_block("y", cost=2)
+    program.add_constraints([(x, program.identity), (y, program.closed)], lower=1)
+    program.add_constraints([(x, program.identity), (y, program.identity)], upper=1)
+
+
+@domination_variant("double_roman")
+def _double_roman_domination(program):
+    # x, y and z mark the vertices with f(v) = 1, 2 and 3.
+    x = program.add_block("x", cost=1)
+    y = program.add_block("y", cost=2)
+    z = program.add_block("z", cost=3)
+    program.add_constraints(
+        [(x, program.identity), (y, program.identity + 0.5 * program.adjacency), (z, program.closed)],
+        lower=1,
+    )
+    program.add_constraints([(y, program.adjacency), (z, program.adjacency), (x, -program.identity)], lower=0)
+    program.add_constraints([(x, program.identity), (y, program.identity), (z, program.identity)], upper=1)
+
+
+@domination_variant("edge")
+def _edge_domination(program):
+    # y_e = 1 if the edge e is in the set, and w_v = sum of y_e over the edges e at v, the
+    # number of edges of the set at v. Every edge e = uv shares an endpoint with an edge of
+    # the set: w_u + w_v - y_e >= 1. This is the closed neighborhood constraint of e in the
+    # line graph, written with the edge-vertex incidence matrix B, so the line graph is
+    # never built.
+    m = len(program.matrices.edges)
+    y = program.add_block("y", cost=1, size=m)
+    w = program.add_block("w", upper=program.n, integer=False)
+    program.add_constraints([(w, program.identity), (y, -program.incidence.T)], lower=0, upper=0)
+    program.add_constraints([(w, program.incidence), (y, -sparse.identity(m, format="csr"))], lower=1)
+
+
+@domination_variant("independent_edge")
+def _independent_edge_domination(program):
+    # An independent edge dominating set is a maximal matching: at most one edge of the set
+    # at every vertex.
+    _edge_domination(program)
+    program.add_constraints([("w", program.identity)], upper=1)
+
+
+@domination_variant("rainbow")
+def _rainbow_domination(program, k=2):
+    # f_i marks the vertices colored i and u the uncolored vertices, which see every color.
+    colors = [program.add_block(f"color_{i}", cost=1) for i in range(1, k + 1)]
+    u = program.add_block("uncolored")
+    program.add_constraints([(color, program.identity) for color in colors] + [(u, program.identity)], lower=1, upper=1)
+    for color in colors:
+        program.add_constraints([(color, program.adjacency), (u, -program.identity)], lower=0)
@@ -0,0 +1,249 @@
+from functions.bitsets import as_bitset_graph, iter_bits, popcount
+
+__all__ = [
+    "misra_gries_edge_coloring",
+    "minimum_edge_coloring",
+    "chromatic_index",
+]
+
+# By Vizing's theorem the chromatic index of a simple graph with maximum degree D is D or
+# D + 1. The Misra-Gries algorithm constructs a coloring with D + 1 colors in polynomial time,
+# so only the question whether D colors suffice needs a search. It is answered directly on the
+# edges of the graph: the colors available to an edge uv are the colors missing at both u and
+# v, kept as one bitmask per vertex, so the line graph is never built.
+
+
+def _edges(graph):
+    # The edges as pairs of vertex indices, the smaller index first.
+    return [(u, v) for u in range(len(graph)) for v in iter_bits(graph.neighbors[u] >> u + 1 << u + 1)]
+
+
+def misra_gries_edge_coloring(G):
+    """
+    Returns a proper edge coloring of G with at most D + 1 colors, where D is the maximum degree of G.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    dict
+        Maps every edge (u, v) of G to its color, an integer from 0 to D.
+
+    References
+    ----------
+    J. Misra and D. Gries, A constructive proof of Vizing's theorem, *Information Processing
+    Letters*, 41(3): 131-133 (1992)
+    """
+    graph = as_bitset_graph(G)
+    n = len(graph)
+    colors = _max_degree(graph) + 1
+    # at[v] maps every color used at v to the other endpoint of the edge with that color.
+    at = [{} for _ in range(n)]
+
+    def color_of(u, v):
+        for c, w in at[u].items():
+            if w == v:
+                return c
+        return None
+
+    def free(v):
+        return next(c for c in range(colors) if c not in at[v])
+
+    def paint(u, v, c):
+        at[u][c] = v
+        at[v][c] = u
+
+    def erase(u, v, c):
+        del at[u][c]
+        del at[v][c]
+
+    for u, v in _edges(graph):
+        # A maximal fan of u starting at v: distinct neighbors of u, where the color of the
+        # edge from u to every vertex of the fan is free at the vertex before it.
+        fan = [v]
+        candidates = {w: color_of(u, w) for w in iter_bits(graph.neighbors[u]) if w != v}
+        extended = True
+        while extended:
+            extended = False
+            for w, c in list(candidates.items()):
+                if c is not None and c not in at[fan[-1]]:
+                    fan.append(w)
+                    del candidates[w]
+                    extended = True
+                    break
+        c = free(u)
+        d = free(fan[-1])
+        # Invert the path from u whose edges alternate between the colors d and c.
+        path = [u]
+        current, color = u, d
+        while color in at[current]:
+            current = at[current][color]
+            path.append(current)
+            color = c if color == d else d
+        swapped = [(path[i], path[i + 1], d if i % 2 == 0 else c) for i in range(len(path) - 1)]
+        for x, y, old in swapped:
+            erase(x, y, old)
+        for x, y, old in swapped:
+            paint(x, y, c if old == d else d)
+        # The first vertex w of the fan at which d is free such that the fan up to w is still a fan.
+        end = 0
+        for i, w in enumerate(fan):
+            if i > 0 and color_of(u, w) in at[fan[i - 1]]:
+                break
+            if d not in at[w]:
+                end = i
+                break
+        # Rotate the fan up to w, and color the edge uw with d.
+        shifted = [color_of(u, fan[i + 1]) for i in range(end)]
+        for i in range(end):
+            erase(u, fan[i + 1], shifted[i])
+        for i in range(end):
+            paint(u, fan[i], shifted[i])
+        paint(u, fan[end], d)
+
+    return {
+        (graph.nodes[u], graph.nodes[v]): c for u in range(n) for c, v in at[u].items() if u < v
+    }
+
+
+def _edge_coloring(graph, edges, k):
+    # Returns a proper coloring of the edges with k colors, as a list of colors indexed like
+    # edges, or None if there is none.
+    full = (1 << k) - 1
+    used = [0] * len(graph)
+    # left[v] is the number of uncolored edges at v.
+    left = [popcount(neighbors) for neighbors in graph.neighbors]
+    colors = [-1] * len(edges)
+
+    def paint(i, c):
+        u, v = edges[i]
+        colors[i] = c
+        used[u] |= 1 << c
+        used[v] |= 1 << c
+        left[u] -= 1
+        left[v] -= 1
+
+    def erase(i, c):
+        u, v = edges[i]
+        colors[i] = -1
+        used[u] &= ~(1 << c)
+        used[v] &= ~(1 << c)
+        left[u] += 1
+        left[v] += 1
+
+    # The edges at a vertex of maximum degree get distinct colors in every coloring; fixing
+    # them breaks the symmetry between the colors.
+    center = max(range(len(graph)), key=lambda v: popcount(graph.neighbors[v]))
+    star = [i for i, edge in enumerate(edges) if center in edge]
+    if len(star) > k:
+        return None
+    for c, i in enumerate(star):
+        paint(i, c)
+
+    def search(remaining):
+        if not remaining:
+            return True
+        # The uncolored edges at a vertex need distinct colors, so they must be able to
+        # use at least as many colors as there are of them.
+        reachable = [0] * len(graph)
+        best, best_key = None, None
+        for i in remaining:
+            u, v = edges[i]
+            available = full & ~(used[u] | used[v])
+            if not available:
+                return False
+            reachable[u] |= available
+            reachable[v] |= available
+            # The edge with the fewest available colors, then with the most uncolored
+            # edges around it, is colored first.
+            key = (popcount(available), -(left[u] + left[v]))
+            if best is None or key < best_key:
+                best, best_key = i, key
+        if any(left[v] > popcount(reachable[v]) for v in range(len(graph)) if left[v]):
+            return False
+        u, v = edges[best]
+        available = full & ~(used[u] | used[v])
+        rest = [i for i in remaining if i != best]
+        for c in iter_bits(available):
+            paint(best, c)
+            if search(rest):
+                return True
+            erase(best, c)
+        return False
+
+    return colors if search([i for i in range(len(edges)) if colors[i] < 0]) else None
+
+
+def _is_overfull(graph, max_degree):
+    # A graph with more edges than max_degree * floor(n / 2) has no max_degree-edge coloring,
+    # since every color class is a matching.
+    return graph.number_of_edges() > max_degree * (len(graph) // 2)
+
+
+def _is_bipartite(graph):
+    # Splits every component into the vertices at even and at odd distance from one of its
+    # vertices; the graph is bipartite when no edge joins two vertices of the same side.
+    for component in graph.components():
+        sides = [component & -component, 0]
+        seen = frontier = sides[0]
+        parity = 0
+        while frontier:
+            frontier = graph.neighborhood(frontier) & ~seen
+            seen |= frontier
+            parity ^= 1
+            sides[parity] |= frontier
+        if any(graph.neighborhood(side) & side for side in sides):
+            return False
+    return True
+
+
+def _max_degree(graph):
+    return max((popcount(neighbors) for neighbors in graph.neighbors), default=0)
+
+
+def minimum_edge_coloring(G):
+    """
+    Returns a proper edge coloring of G with the fewest colors.
+
+    Unless G is overfull, the edges are first colored with D colors by a DSATUR-like search,
+    which colors the edge with the fewest available colors first. If there is no such
+    coloring, the Misra-Gries coloring with D + 1 colors is returned.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    dict
+        Maps every edge (u, v) of G to its color, an integer from 0 to the chromatic index minus 1.
+    """
+    graph = as_bitset_graph(G)
+    max_degree = _max_degree(graph)
+    if max_degree > 0 and not _is_overfull(graph, max_degree):
+        edges = _edges(graph)
+        colors = _edge_coloring(graph, edges, max_degree)
+        if colors is not None:
+            return {(graph.nodes[u], graph.nodes[v]): c for (u, v), c in zip(edges, colors)}
+    return misra_gries_edge_coloring(graph)
+
+
+def chromatic_index(G):
+    """
+    Returns the chromatic index of G, the fewest colors of a proper edge coloring.
+
+    By Vizing's theorem it is D or D + 1. Bipartite graphs need D colors by Konig's theorem
+    and overfull graphs D + 1; for the other graphs the search for a D-edge coloring decides.
+    """
+    graph = as_bitset_graph(G)
+    max_degree = _max_degree(graph)
+    if max_degree == 0 or _is_bipartite(graph):
+        return max_degree
+    if _is_overfull(graph, max_degree):
+        return max_degree + 1
+    colors = _edge_coloring(graph, _edges(graph), max_degree)
+    return max_degree if colors is not None else max_degree + 1
@@ -1,4 +1,5 @@
 from classes.conjecture import MultiLinearConclusion, Conjecture, MultiLinearConjecture, Hypothesis
+from functions.conjecture_evaluation import evaluate_conjectures
 
 __all__ = [
     "filter_by_inequalities",
@@ -10,19 +11,16 @@ __all__ = [
 ]
 
 def filter_false_conjectures(conjectures, df):
-    new_conjectures = []
-    for conj in conjectures:
-        if conj.false_graphs(df).empty:
-            new_conjectures.append(conj)
-    return new_conjectures
+    false, _, _ = evaluate_conjectures(conjectures, df)
+    return [conj for conj, is_false in zip(conjectures, false) if not is_false]
 
 def make_more_general_conjectures(conjectures, df):
+    hyp = Hypothesis("a connected graph")
+    general_conjectures = [MultiLinearConjecture(hyp, conj.conclusion) for conj in conjectures]
+    false, _, _ = evaluate_conjectures(general_conjectures, df)
     new_conjectures = []
-    for conj in conjectures:
-        hyp = Hypothesis("a connected graph")
-        conclusion = conj.conclusion
-        new_conj = MultiLinearConjecture(hyp, conclusion)
-        if new_conj.false_graphs(df).empty:
+    for conj, new_conj, is_false in zip(conjectures, general_conjectures, false):
+        if not is_false:
             new_conjectures.append(new_conj)
         else:
             new_conjectures.append(conj)
@@ -0,0 +1,178 @@
+from functions.bitsets import accepts_bitset_graph, as_bitset_graph, iter_bits
+
+__all__ = [
+    "FORBIDDEN_SUBGRAPHS",
+    "forbidden_subgraph_witnesses",
+    "find_triangle",
+    "find_claw",
+    "find_diamond",
+    "find_bull",
+    "find_asteroidal_triple",
+]
+
+# The forbidden structures recognized by forbidden_subgraph_witnesses, in the order they are searched.
+FORBIDDEN_SUBGRAPHS = ["triangle", "claw", "diamond", "bull", "asteroidal triple"]
+
+# Every search runs on the neighbor bitmasks of a BitsetGraph and stops at its first witness.
+# Triangles, diamonds and bulls all contain a triangle, so they are found together from the
+# common neighborhoods N(u) & N(v) of the edges uv. Claws are found from the neighborhood of
+# their center, and asteroidal triples from the components of G - N[x] for every vertex x.
+
+
+def _lowest(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+def _after(i):
+    # The bitmask of the vertices with a larger index than i.
+    return ~((2 << i) - 1)
+
+
+def _find_in_triangles(graph, names):
+    # Searches the structures among "triangle", "diamond" and "bull" in names with one pass over
+    # the edges; returns a dict of the witnesses found, as tuples of vertex indices.
+    neighbors = graph.neighbors
+    found = {}
+    wanted = set(names)
+    for u in range(len(graph)):
+        for v in iter_bits(neighbors[u] & _after(u)):
+            common = neighbors[u] & neighbors[v]
+            if not common:
+                continue
+            if "triangle" in wanted:
+                found["triangle"] = (u, v, _lowest(common))
+                wanted.discard("triangle")
+            if "diamond" in wanted:
+                # u, v and two nonadjacent common neighbors a and b.
+                for a in iter_bits(common):
+                    others = common & ~neighbors[a] & _after(a)
+                    if others:
+                        found["diamond"] = (u, v, a, _lowest(others))
+                        wanted.discard("diamond")
+                        break
+            # A horn of u is a neighbor of u outside N[v], so a bull on u, v and a common
+            # neighbor needs a neighbor of u outside N[v] or one of v outside N[u].
+            private = (neighbors[u] ^ neighbors[v]) & ~(1 << u | 1 << v)
+            if "bull" in wanted and private:
+                # A triangle a, b, c whose vertices a and b have the nonadjacent pendant
+                # neighbors d and e; each triangle is met once, from its two smallest vertices.
+                for c in iter_bits(common & _after(v)):
+                    for a, b, apex in ((u, v, c), (u, c, v), (v, c, u)):
+                        horns = neighbors[a] & ~neighbors[b] & ~neighbors[apex]
+                        others = neighbors[b] & ~neighbors[a] & ~neighbors[apex]
+                        d = next((d for d in iter_bits(horns) if others & ~neighbors[d]), None)
+                        if d is not None:
+                            found["bull"] = (a, b, apex, d, _lowest(others & ~neighbors[d]))
+                            wanted.discard("bull")
+                            break
+                    if "bull" not in wanted:
+                        break
+            if not wanted:
+                return found
+    return found
+
+
+def _find_claw(graph):
+    # A center v with three pairwise nonadjacent neighbors a < b < c.
+    neighbors = graph.neighbors
+    for v in range(len(graph)):
+        for a in iter_bits(neighbors[v]):
+            rest = neighbors[v] & ~neighbors[a] & _after(a)
+            for b in iter_bits(rest):
+                third = rest & ~neighbors[b] & _after(b)
+                if third:
+                    return (v, a, b, _lowest(third))
+    return None
+
+
+def _find_asteroidal_triple(graph):
+    # x, y and z form an asteroidal triple if each two of them are joined by a path avoiding
+    # the closed neighborhood of the third, i.e. they lie in one component of G - N[third].
+    n = len(graph)
+    # around[x][v] is the bitmask of the component of G - N[x] containing v, or 0 if v is in N[x].
+    around = []
+    for x in range(n):
+        components = [0] * n
+        for component in graph.components(graph.full & ~graph.closed(x)):
+            for v in iter_bits(component):
+                components[v] = component
+        around.append(components)
+    for z in range(n):
+        for x in range(z):
+            # y after x and before z, joined to x avoiding N[z] and to z avoiding N[x].
+            for y in iter_bits(around[z][x] & around[x][z] & _after(x) & ((1 << z) - 1)):
+                if around[y][z] >> x & 1:
+                    return (x, y, z)
+    return None
+
+
+def _vertices(graph, witness):
+    return None if witness is None else [graph.nodes[i] for i in witness]
+
+
+@accepts_bitset_graph
+def forbidden_subgraph_witnesses(G, names=None):
+    """
+    Searches a graph for small forbidden induced subgraphs, returning a witness of each one found.
+
+    All of the structures are searched in one pass over the adjacency bitmasks of the graph,
+    and each search stops at its first witness. A graph is, e.g., claw-free exactly when the
+    witness of "claw" is None.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+    names : list of strings
+        The structures to search, among FORBIDDEN_SUBGRAPHS. Defaults to all of them.
+
+    Returns
+    -------
+    dict
+        Maps the name of every structure searched to a list of the vertices of an induced
+        copy of it, or to None if G has none. The vertices are listed as follows:
+
+        - triangle: its three vertices;
+        - claw: the center, then the three leaves;
+        - diamond: the two vertices of degree 3, then the two of degree 2;
+        - bull: the triangle, with the vertices of the horns first, then the two horns;
+        - asteroidal triple: the three vertices of the triple.
+
+    Examples
+    --------
+    >>> forbidden_subgraph_witnesses(nx.star_graph(3))["claw"]
+    [0, 1, 2, 3]
+    """
+    graph = as_bitset_graph(G)
+    names = FORBIDDEN_SUBGRAPHS if names is None else names
+    witnesses = _find_in_triangles(graph, [name for name in names if name in ("triangle", "diamond", "bull")])
+    if "claw" in names:
+        witnesses["claw"] = _find_claw(graph)
+    if "asteroidal triple" in names:
+        witnesses["asteroidal triple"] = _find_asteroidal_triple(graph)
+    return {name: _vertices(graph, witnesses.get(name)) for name in names}
+
+
+def find_triangle(G):
+    """Returns the vertices of a triangle of G, or None if G is triangle-free."""
+    return forbidden_subgraph_witnesses(G, ["triangle"])["triangle"]
+
+
+def find_claw(G):
+    """Returns the center and leaves of an induced claw (K_1,3) of G, or None if G is claw-free."""
+    return forbidden_subgraph_witnesses(G, ["claw"])["claw"]
+
+
+def find_diamond(G):
+    """Returns the vertices of an induced diamond (K_4 minus an edge) of G, or None if G is diamond-free."""
+    return forbidden_subgraph_witnesses(G, ["diamond"])["diamond"]
+
+
+def find_bull(G):
+    """Returns the vertices of an induced bull of G, or None if G is bull-free."""
+    return forbidden_subgraph_witnesses(G, ["bull"])["bull"]
+
+
+def find_asteroidal_triple(G):
+    """Returns the vertices of an asteroidal triple of G, or None if G is AT-free."""
+    return forbidden_subgraph_witnesses(G, ["asteroidal triple"])["asteroidal triple"]
@@ -0,0 +1,345 @@
+from functions.bitsets import as_bitset_graph, iter_bits, popcount
+
+__all__ = [
+    "zero_forcing_closure",
+    "psd_closure",
+    "min_zero_forcing_set",
+    "zero_forcing_number",
+    "min_psd_zero_forcing_set",
+    "psd_zero_forcing_number",
+    "min_power_dominating_set",
+    "power_domination_number",
+    "min_total_zero_forcing_set",
+    "total_zero_forcing_number",
+    "min_connected_zero_forcing_set",
+    "connected_zero_forcing_number",
+]
+
+# The smallest forcing sets are found in two ways.
+#
+# For zero forcing, PSD zero forcing and power domination, a set only matters through its
+# closure (the black vertices once no more forces are possible), and the closure of S + v is
+# the closure of closure(S) + v. So the search runs breadth first over distinct closures:
+# level s holds the closures of the s-sets that were not already reached with fewer vertices.
+# Sets with equal closures are searched once, and a vertex whose addition does not grow the
+# closure is never added. Exchanging twin vertices is an automorphism, so only one vertex of
+# each twin class is tried on every closure.
+#
+# Total and connected zero forcing sets also depend on the set itself. They are searched by
+# size, starting from a lower bound such as the zero forcing number, with the closure of
+# every partial set carried along so that each extension only propagates the new forces.
+
+
+def zero_forcing_closure(graph, black, changed=None):
+    """
+    Returns the set of black vertices once the zero forcing rule can no longer be applied.
+
+    A black vertex with exactly one white neighbor forces that neighbor to become black.
+
+    Parameters
+    ----------
+    graph : BitsetGraph
+        The graph.
+    black : int
+        The bitmask of the black vertices.
+    changed : int
+        The bitmask of the black vertices that may be able to force. Defaults to every black
+        vertex; pass the vertices added to an already closed set, and their black neighbors,
+        to propagate only the new forces.
+
+    Returns
+    -------
+    int
+        The bitmask of the derived set of black vertices.
+    """
+    neighbors = graph.neighbors
+    queue = list(iter_bits(black if changed is None else changed))
+    while queue:
+        v = queue.pop()
+        white = neighbors[v] & ~black
+        if white and not white & (white - 1):
+            black |= white
+            w = white.bit_length() - 1
+            # w and the black neighbors of w have one white neighbor less.
+            queue.append(w)
+            queue.extend(iter_bits(neighbors[w] & black))
+    return black
+
+
+def psd_closure(graph, black):
+    """
+    Returns the set of black vertices once the PSD color change rule can no longer be applied.
+
+    A black vertex with exactly one white neighbor in a component of the white subgraph
+    forces that neighbor to become black.
+
+    Parameters
+    ----------
+    graph : BitsetGraph
+        The graph.
+    black : int
+        The bitmask of the black vertices.
+
+    Returns
+    -------
+    int
+        The bitmask of the derived set of black vertices.
+    """
+    while True:
+        forced = 0
+        for component in graph.components(graph.full & ~black):
+            for v in iter_bits(graph.neighborhood(component) & black):
+                targets = graph.neighbors[v] & component
+                if not targets & (targets - 1):
+                    forced |= targets
+        if not forced:
+            return black
+        black |= forced
+
+
+def _grow_zero_forcing(graph):
+    def grow(closure, i):
+        bit = 1 << i
+        return zero_forcing_closure(graph, closure | bit, bit | (graph.neighbors[i] & closure))
+    return grow
+
+
+def _grow_psd(graph):
+    return lambda closure, i: psd_closure(graph, closure | (1 << i))
+
+
+def _grow_power_domination(graph):
+    # A vertex of a power dominating set observes its closed neighborhood, and the observed
+    # vertices then propagate by the zero forcing rule.
+    def grow(closure, i):
+        black = closure | graph.closed(i)
+        return zero_forcing_closure(graph, black, graph.neighborhood(black & ~closure) & black | black & ~closure)
+    return grow
+
+
+def _closure_search(graph, grow, candidates):
+    # Breadth first search over the closures of the sets of each size; returns a smallest
+    # list of vertex indices whose closure is the whole graph.
+    if graph.full == 0:
+        return []
+    classes = graph.twin_classes()
+    parents = {0: None}
+    level = [0]
+    while level:
+        next_level = []
+        for closure in level:
+            tried = set()
+            for i in candidates(closure):
+                key = (classes[i], closure >> i & 1)
+                if key in tried:
+                    continue
+                tried.add(key)
+                grown = grow(closure, i)
+                if grown in parents:
+                    continue
+                parents[grown] = (closure, i)
+                if grown == graph.full:
+                    picks = []
+                    while parents[grown] is not None:
+                        grown, i = parents[grown]
+                        picks.append(i)
+                    return picks[::-1]
+                next_level.append(grown)
+        level = next_level
+
+
+def _white_vertices(graph):
+    return lambda closure: iter_bits(graph.full & ~closure)
+
+
+def _unobserved_neighborhoods(graph):
+    return lambda closure: (i for i in range(len(graph)) if graph.closed(i) & ~closure)
+
+
+def _by_components(G, search):
+    # The forcing numbers are additive over connected components.
+    graph = as_bitset_graph(G)
+    found = []
+    for component in graph.components():
+        sub = graph.subgraph(component)
+        found += [sub.nodes[i] for i in search(sub)]
+    return found
+
+
+def min_zero_forcing_set(G):
+    """
+    Returns a smallest zero forcing set of G.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+
+    Returns
+    -------
+    list
+        A list of nodes in a smallest zero forcing set of G.
+    """
+    return _by_components(G, lambda sub: _closure_search(sub, _grow_zero_forcing(sub), _white_vertices(sub)))
+
+
+def zero_forcing_number(G):
+    """Returns the zero forcing number of G, the size of a smallest zero forcing set."""
+    return len(min_zero_forcing_set(G))
+
+
+def min_psd_zero_forcing_set(G):
+    """Returns a smallest positive semidefinite (PSD) zero forcing set of G."""
+    return _by_components(G, lambda sub: _closure_search(sub, _grow_psd(sub), _white_vertices(sub)))
+
+
+def psd_zero_forcing_number(G):
+    """Returns the PSD zero forcing number of G, the size of a smallest PSD zero forcing set."""
+    return len(min_psd_zero_forcing_set(G))
+
+
+def min_power_dominating_set(G):
+    """Returns a smallest power dominating set of G."""
+    return _by_components(
+        G, lambda sub: _closure_search(sub, _grow_power_domination(sub), _unobserved_neighborhoods(sub))
+    )
+
+
+def power_domination_number(G):
+    """Returns the power domination number of G, the size of a smallest power dominating set."""
+    return len(min_power_dominating_set(G))
+
+
+def _min_degree(graph):
+    return min(popcount(neighbors) for neighbors in graph.neighbors)
+
+
+def _twin_combinations(graph, k, grow):
+    # Yields the k-sets of vertex indices, with their closures, taking the members of every
+    # twin class in order so that sets equal up to exchanging twins are only tried once.
+    classes = graph.twin_classes()
+    previous = []
+    last = {}
+    for i, c in enumerate(classes):
+        previous.append(last.get(c))
+        last[c] = i
+    n = len(graph)
+
+    def extend(first, size, mask, closure):
+        if size == k:
+            yield mask, closure
+            return
+        for i in range(first, n - (k - size) + 1):
+            if previous[i] is not None and not mask >> previous[i] & 1:
+                continue
+            yield from extend(i + 1, size + 1, mask | (1 << i), grow(closure, i))
+
+    yield from extend(0, 0, 0, 0)
+
+
+def _connected_sets(graph, k, grow):
+    # Yields every connected k-set of vertex indices exactly once, with its closure, by
+    # extending each set only with vertices after its smallest vertex (Wernicke's ESU).
+    def extend(mask, extension, closed, higher, size, closure):
+        if size == k:
+            yield mask, closure
+            return
+        while extension:
+            bit = extension & -extension
+            extension ^= bit
+            w = bit.bit_length() - 1
+            yield from extend(
+                mask | bit,
+                extension | (graph.neighbors[w] & higher & ~closed),
+                closed | graph.neighbors[w],
+                higher,
+                size + 1,
+                grow(closure, w),
+            )
+
+    for v in range(len(graph)):
+        higher = graph.full & ~((1 << (v + 1)) - 1)
+        yield from extend(1 << v, graph.neighbors[v] & higher, graph.closed(v), higher, 1, grow(0, v))
+
+
+def min_total_zero_forcing_set(G, lower_bound=None):
+    """
+    Returns a smallest total zero forcing set of G.
+
+    A total zero forcing set is a zero forcing set that does not induce any isolated vertices.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+    lower_bound : int
+        A known lower bound, such as the zero forcing number of G, at which the search starts.
+
+    Returns
+    -------
+    list or None
+        A list of nodes in a smallest total zero forcing set of G, or None if G has isolated vertices.
+    """
+    graph = as_bitset_graph(G)
+    if any(neighbors == 0 for neighbors in graph.neighbors):
+        return None
+    found = []
+    components = list(graph.components())
+    for component in components:
+        sub = graph.subgraph(component)
+        grow = _grow_zero_forcing(sub)
+        # Z(G) >= min_degree(G); the bound for G only bounds a component when G is connected.
+        start = max(2, _min_degree(sub), (lower_bound or 0) if len(components) == 1 else 0)
+        for k in range(start, len(sub) + 1):
+            picked = next(
+                (
+                    mask
+                    for mask, closure in _twin_combinations(sub, k, grow)
+                    if closure == sub.full and all(sub.neighbors[i] & mask for i in iter_bits(mask))
+                ),
+                None,
+            )
+            if picked is not None:
+                found += sub.vertices(picked)
+                break
+    return found
+
+
+def total_zero_forcing_number(G, lower_bound=None):
+    """Returns the total zero forcing number of G, or None if G has isolated vertices."""
+    found = min_total_zero_forcing_set(G, lower_bound)
+    return None if found is None else len(found)
+
+
+def min_connected_zero_forcing_set(G, lower_bound=None):
+    """
+    Returns a smallest connected zero forcing set of G.
+
+    A connected zero forcing set is a zero forcing set that induces a connected subgraph.
+
+    Parameters
+    ----------
+    G : NetworkX graph, GraphContext or BitsetGraph
+        An undirected graph.
+    lower_bound : int
+        A known lower bound, such as the zero forcing number of G, at which the search starts.
+
+    Returns
+    -------
+    list or None
+        A list of nodes in a smallest connected zero forcing set of G, or None if G is not connected.
+    """
+    graph = as_bitset_graph(G)
+    if not graph.is_connected():
+        return None
+    grow = _grow_zero_forcing(graph)
+    for k in range(max(1, _min_degree(graph), lower_bound or 0), len(graph) + 1):
+        for mask, closure in _connected_sets(graph, k, grow):
+            if closure == graph.full:
+                return graph.vertices(mask)
+
+
+def connected_zero_forcing_number(G, lower_bound=None):
+    """Returns the connected zero forcing number of G, or None if G is not connected."""
+    found = min_connected_zero_forcing_set(G, lower_bound)
+    return None if found is None else len(found)
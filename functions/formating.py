@@ -76,6 +76,11 @@ TEX_MAP = {
     "second_largest_eigenvalue" : r"[\lambda_2(G)]",
     "square_positive_energy" : r"[s^{+}(G)]",
     "square_negative_energy" : r"[s^{-}(G)]",
+    "spectral_radius" : r"\lambda_1(G)",
+    "algebraic_connectivity" : r"a(G)",
+    "laplacian_spectral_radius" : r"\mu_1(G)",
+    "laplacian_energy" : r"LE(G)",
+    "signless_laplacian_spectral_radius" : r"q_1(G)",
     "harmonic_index": r"\sum_{\{u,v\} \in E(G)} \frac{2}{d(u) + d(v)}",
     "strong_harmonic_index": r"\sum_{\{u,v\} \in E(G)} \min \Big\{\frac{1}{d(u)}, \frac{1}{d(v)} \Big \}",
     "sum_connectivity_index": r"\sum_{\{u,v\} \in E(G)} \frac{1}{\sqrt{d(u) + d(v)}}",
@@ -412,6 +417,21 @@ DEF_MAP = {
     "second_largest_eigenvalue" : r"""The second largest eigenvalue of a graph $G$, denoted by $[\lambda_2(G)]$, is
     the second largest eigenvalue of the adjacency matrix of $G$ *rounded to the nearest integer*.""",
 
+    "spectral_radius" : r"""The spectral radius of a graph $G$, denoted by $\lambda_1(G)$, is the largest
+    eigenvalue of the adjacency matrix of $G$.""",
+
+    "algebraic_connectivity" : r"""The algebraic connectivity of a graph $G$, denoted by $a(G)$, is the second
+    smallest eigenvalue of the Laplacian matrix $L(G) = D(G) - A(G)$ of $G$. It is positive if and only if $G$ is connected.""",
+
+    "laplacian_spectral_radius" : r"""The Laplacian spectral radius of a graph $G$, denoted by $\mu_1(G)$, is the
+    largest eigenvalue of the Laplacian matrix $L(G) = D(G) - A(G)$ of $G$.""",
+
+    "laplacian_energy" : r"""The Laplacian energy of a graph $G$ with $n$ vertices and $m$ edges, denoted by $LE(G)$,
+    is $\sum_{i=1}^{n} |\mu_i - 2m/n|$, where $\mu_1, \dots, \mu_n$ are the eigenvalues of the Laplacian matrix of $G$.""",
+
+    "signless_laplacian_spectral_radius" : r"""The signless Laplacian spectral radius of a graph $G$, denoted by $q_1(G)$,
+    is the largest eigenvalue of the signless Laplacian matrix $Q(G) = D(G) + A(G)$ of $G$.""",
+
     "min_maximal_matching_number" : r"""The minimum maximal matching number of a graph $G$, denoted by $i(L(G))$,
     is the minimum cardinality of a maximal matching in $G$; equivalently, the independent domination number of
     the line graph L(G).""",
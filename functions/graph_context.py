@@ -0,0 +1,172 @@
+import grinpy as gp
+import networkx as nx
+from functions.bitsets import BITSET_FUNCTIONS, BitsetGraph, bitset_graph
+from functions.distances import distance_matrix, eccentricities
+from functions.registry import INVARIANTS
+from functions.spectral import DENSE_ORDER, SPECTRAL_MATRICES, batched_spectra, extreme_eigenvalues, spectrum
+
+__all__ = ["GraphContext", "adjacency_eigenvalues", "prime_spectra"]
+
+
+def adjacency_eigenvalues(G):
+    """Return the eigenvalues of the adjacency matrix of G, in ascending order."""
+    return spectrum(G, "adjacency")
+
+
+class GraphContext:
+    """
+    A graph together with a cache of everything computed on it.
+
+    Every invariant is computed at most once per context, so derived columns such as
+    "(order - domination_number)" and the hypothesis properties only look up values that
+    were already computed. Intermediate objects such as the line graph, the graph powers,
+    the distances and the spectrum are cached in the same way.
+
+    The context does not watch its graph for changes; make a new context after editing the graph.
+
+    A context can also be made from a BitsetGraph, which is then shared by the bitset
+    engines, and whose NetworkX graph is only built when an invariant needs it: the
+    functions of functions.bitsets.BITSET_FUNCTIONS, such as the distance matrix, the
+    degree vectors and the spectra, are passed the BitsetGraph instead.
+
+    Attributes
+    ----------
+    graph : NetworkX graph
+        An undirected graph.
+    values : dict
+        The invariants and properties computed so far, keyed by name.
+
+    Examples
+    --------
+    >>> context = GraphContext(gp.petersen_graph())
+    >>> context["(order - domination_number)"]
+    7
+    >>> context.values["domination_number"]
+    3
+    """
+    def __init__(self, G):
+        self.values = {}
+        self._objects = {}
+        if isinstance(G, BitsetGraph):
+            self._objects[(bitset_graph,)] = G
+            self._graph = None
+        else:
+            self._graph = G
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = self._objects[(bitset_graph,)].to_networkx()
+        return self._graph
+
+    def graph_for(self, function):
+        """
+        Returns the graph to call a function of a graph on.
+
+        It is the BitsetGraph of the context if the context has one and the function is in
+        functions.bitsets.BITSET_FUNCTIONS, and the NetworkX graph otherwise.
+        """
+        if function in BITSET_FUNCTIONS and (bitset_graph,) in self._objects:
+            return self._objects[(bitset_graph,)]
+        return self.graph
+
+    def order(self):
+        """Returns the number of vertices, without building the NetworkX graph of a BitsetGraph."""
+        if self._graph is None:
+            return len(self._objects[(bitset_graph,)])
+        return self._graph.number_of_nodes()
+
+    def size(self):
+        """Returns the number of edges, without building the NetworkX graph of a BitsetGraph."""
+        if self._graph is None:
+            return self._objects[(bitset_graph,)].number_of_edges()
+        return self._graph.number_of_edges()
+
+    def __repr__(self):
+        graph = self._graph if self._graph is not None else self._objects[(bitset_graph,)]
+        return f"GraphContext({graph!r}, {len(self.values)} values)"
+
+    def __getitem__(self, name):
+        if name not in self.values:
+            invariant = INVARIANTS.get(name)
+            if invariant is None:
+                value = getattr(gp, name)(self.graph)
+            elif invariant.context:
+                value = invariant.function(self)
+            else:
+                value = invariant.function(self.graph_for(invariant.function))
+            self.values[name] = value
+        return self.values[name]
+
+    def cached(self, function, *args):
+        """Returns function(graph, *args), computing it only once for this context; see graph_for."""
+        key = (function,) + args
+        if key not in self._objects:
+            self._objects[key] = function(self.graph_for(function), *args)
+        return self._objects[key]
+
+    def is_cached(self, function, *args):
+        """Returns True if function(graph, *args) is already known to this context."""
+        return (function,) + args in self._objects
+
+    def set_cached(self, value, function, *args):
+        """Stores value as the result of function(graph, *args), e.g. when it was computed in a batch."""
+        self._objects[(function,) + args] = value
+
+    def is_connected(self):
+        return self["a connected graph"]
+
+    def line_graph(self):
+        return self.cached(gp.line_graph)
+
+    def power(self, k):
+        return self.cached(nx.power, k)
+
+    def distances(self):
+        """Returns the matrix of the distances between all pairs of vertices; see functions.distances.distance_matrix."""
+        return self.cached(distance_matrix)
+
+    def eccentricities(self):
+        """Returns the eccentricities of the vertices, raising NetworkXError if the graph is not connected."""
+        return eccentricities(self.distances())
+
+    def spectrum(self, kind="adjacency"):
+        """Returns the eigenvalues of the adjacency matrix, or another of SPECTRAL_MATRICES, in ascending order."""
+        return self.cached(spectrum, kind)
+
+    def extreme_eigenvalues(self, k, largest=True, kind="adjacency"):
+        """
+        Returns the k largest eigenvalues, in descending order, or the k smallest, in ascending order.
+
+        They are read from the cached spectrum when it is known or cheap to compute, and
+        otherwise computed by the sparse solver of functions.spectral.extreme_eigenvalues.
+        """
+        if self.is_cached(spectrum, kind) or self.order() <= DENSE_ORDER:
+            values = self.spectrum(kind)
+            return values[::-1][:k] if largest else values[:k]
+        return self.cached(extreme_eigenvalues, k, largest, kind)
+
+
+def prime_spectra(contexts, kinds=SPECTRAL_MATRICES):
+    """
+    Computes the spectra of many graph contexts at once and caches them on the contexts.
+
+    The graphs of equal order are solved together by functions.spectral.batched_spectra.
+    Graphs above DENSE_ORDER, and spectra that are already cached, are left alone.
+
+    Parameters
+    ----------
+    contexts : list of GraphContexts
+        The contexts of the graphs.
+    kinds : list of strings
+        The matrices whose spectra are computed, among SPECTRAL_MATRICES.
+    """
+    for kind in kinds:
+        pending = [
+            context for context in contexts
+            if not context.is_cached(spectrum, kind) and context.order() <= DENSE_ORDER
+        ]
+        graphs = [context.graph_for(spectrum) for context in pending]
+        for context, values in zip(pending, batched_spectra(graphs, kind)):
+            context.set_cached(values, spectrum, kind)
+    return None
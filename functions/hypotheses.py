@@ -0,0 +1,198 @@
+import operator
+import re
+import grinpy as gp
+from functions.bitsets import accepts_bitset_graph, is_connected
+from functions.forbidden_subgraphs import forbidden_subgraph_witnesses
+from functions.registry import COST_CLASSES, INVARIANTS
+
+__all__ = [
+    "ATOMS",
+    "HYPOTHESES",
+    "atom_bit",
+    "hypothesis",
+    "hypothesis_cost",
+    "hypothesis_invariants",
+]
+
+
+def _is_free(name):
+    return lambda context: context.cached(forbidden_subgraph_witnesses)[name] is None
+
+
+def _is_complete(context):
+    n = context.order()
+    return context.size() == n * (n - 1) // 2
+
+
+# The named atomic predicates, as (function of a GraphContext, cost class). Besides these, an
+# atom can compare a registered invariant with a number or another invariant, as in
+# "min_degree >= 3" or "min_degree == max_degree".
+ATOMS = {
+    "connected": (lambda context: context.cached(is_connected), "linear"),
+    "tree": (lambda context: context.cached(gp.is_tree), "linear"),
+    "bipartite": (lambda context: context.cached(gp.is_bipartite), "linear"),
+    "eulerian": (lambda context: context.cached(gp.is_eulerian), "linear"),
+    "planar": (lambda context: context.cached(gp.is_planar), "linear"),
+    "chordal": (lambda context: context.cached(gp.is_chordal), "linear"),
+    "not complete": (lambda context: not _is_complete(context), "linear"),
+    "triangle-free": (_is_free("triangle"), "polynomial"),
+    "claw-free": (_is_free("claw"), "polynomial"),
+    "diamond-free": (_is_free("diamond"), "polynomial"),
+    "bull-free": (_is_free("bull"), "polynomial"),
+    "at-free": (_is_free("asteroidal triple"), "polynomial"),
+}
+
+# The compound hypotheses, as conjunctions of atoms. The atoms are evaluated in the order
+# given and the evaluation stops at the first false one, so cheap atoms such as "connected"
+# come first. A new hypothesis only needs a new entry here.
+HYPOTHESES = {
+    "a connected graph": ["connected"],
+    "a tree graph": ["connected", "tree"],
+    "a connected_graph with min_degree at least 2": ["connected", "min_degree >= 2"],
+    "a connected_graph with min_degree at least 3": ["connected", "min_degree >= 3"],
+    "a connected_graph with min_degree at least 4": ["connected", "min_degree >= 4"],
+    "a connected and bipartite graph": ["connected", "bipartite"],
+    "an eulerian graph": ["connected", "eulerian"],
+    "a connected and planar graph": ["connected", "planar"],
+    "a connected and regular graph": ["connected", "min_degree == max_degree"],
+    "a connected and cubic graph": ["connected", "min_degree == 3", "max_degree == 3"],
+    "a connected graph which is not K_n": ["connected", "not complete"],
+    "a connected and triangle-free graph": ["connected", "triangle-free"],
+    "a connected and at-free graph": ["connected", "at-free"],
+    "a connected and claw-free graph": ["connected", "claw-free"],
+    "a connected graph with maximum degree at most 3": ["connected", "max_degree <= 3"],
+    "a connected graph which is not K_n and has maximum degree at most 3": ["connected", "not complete", "max_degree <= 3"],
+    "a connected, claw-free, and cubic graph": ["connected", "min_degree == 3", "max_degree == 3", "claw-free"],
+    "a connected, planar, and cubic graph": ["connected", "min_degree == 3", "max_degree == 3", "planar"],
+    "a connected and cubic graph which is not K_4": ["connected", "min_degree == 3", "max_degree == 3", "not complete"],
+    "a connected and well-covered graph": ["connected", "independence_number == independent_domination_number"],
+    "a connected graph with diameter at most 3": ["connected", "diameter <= 3"],
+    "a connected and planar graph with diameter at most 3": ["connected", "planar", "diameter <= 3"],
+    "a connected and chordal graph": ["connected", "chordal"],
+    **{
+        f"a connected and {family} graph with min_degree at least {k}": ["connected", family, f"min_degree >= {k}"]
+        for family in ["bipartite", "planar"]
+        for k in [2, 3, 4]
+    },
+    **{
+        f"a connected graph which is not K_n with min_degree at least {k}": ["connected", "not complete", f"min_degree >= {k}"]
+        for k in [2, 3, 4]
+    },
+    **{
+        f"a connected and {family} graph with min_degree at least {k}": ["connected", family, f"min_degree >= {k}"]
+        for family in ["triangle-free", "at-free", "claw-free"]
+        for k in [2, 3, 4]
+    },
+    "a connected graph with min_degree at least 2 and maximum degree at most 3": ["connected", "min_degree >= 2", "max_degree <= 3"],
+    "a connected and chordal graph with min_degree at least 2": ["connected", "chordal", "min_degree >= 2"],
+    "a connected and chordal graph with min_degree at least 3": ["connected", "chordal", "min_degree >= 3"],
+    "a connected and diamond-free graph": ["connected", "diamond-free"],
+    "a connected, cubic, and diamond-free graph": ["connected", "min_degree == 3", "max_degree == 3", "diamond-free"],
+    "a connected and bull-free graph": ["connected", "bull-free"],
+}
+
+_COMPARISON = re.compile(r"^(\w+) (>=|<=|==|!=|>|<) (\w+)$")
+
+_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+}
+
+# The bit of every atom seen so far, assigned in order of first use.
+_BITS = {}
+
+
+def _parse(atom):
+    # Returns the function and the invariants of an atom.
+    if atom in ATOMS:
+        return ATOMS[atom][0], []
+    match = _COMPARISON.match(atom)
+    if match is None:
+        raise ValueError(f"Unknown atom {atom!r}; expected one of {list(ATOMS)} or a comparison such as 'min_degree >= 2'.")
+    left, symbol, right = match.groups()
+    compare = _OPERATORS[symbol]
+    if right.isdigit():
+        value = int(right)
+        return (lambda context: compare(context[left], value)), [left]
+    return (lambda context: compare(context[left], context[right])), [left, right]
+
+
+def atom_bit(atom):
+    """Returns the bit standing for an atom in the atom bitmasks of a graph."""
+    if atom not in _BITS:
+        _parse(atom)
+        _BITS[atom] = 1 << len(_BITS)
+    return _BITS[atom]
+
+
+@accepts_bitset_graph
+class _AtomValues:
+    # The atoms evaluated on a graph so far, as the bitmask of the evaluated atoms and the
+    # bitmask of the true ones. One instance is cached on every GraphContext.
+    def __init__(self, G):
+        self.known = 0
+        self.true = 0
+
+
+def hypothesis(atoms):
+    """
+    Returns the registry function of the conjunction of the given atoms.
+
+    Every atom is evaluated at most once per GraphContext, however many hypotheses share it,
+    and a hypothesis holds when the bits of all of its atoms are set in the bitmask of the
+    true atoms of the graph.
+
+    Parameters
+    ----------
+    atoms : list of strings
+        Names of ATOMS, or comparisons of a registered invariant with a number or another
+        invariant, such as "min_degree >= 2" or "min_degree == max_degree".
+
+    Returns
+    -------
+    callable
+        A function taking a GraphContext and returning a bool.
+    """
+    steps = [(atom_bit(atom), _parse(atom)[0]) for atom in atoms]
+    mask = sum(bit for bit, _ in steps)
+
+    def holds(context):
+        values = context.cached(_AtomValues)
+        for bit, function in steps:
+            if not values.known & bit:
+                if function(context):
+                    values.true |= bit
+                values.known |= bit
+            if not values.true & bit:
+                return False
+        return values.true & mask == mask
+
+    return holds
+
+
+def hypothesis_invariants(atoms):
+    """
+    Returns the registered invariants compared by the atoms of a hypothesis, in order of first use.
+
+    They are the dependencies of the hypothesis, so that a dataset build computes them once,
+    before the hypotheses that share them.
+    """
+    depends = []
+    for atom in atoms:
+        for name in _parse(atom)[1]:
+            if name not in depends:
+                depends.append(name)
+    return depends
+
+
+def hypothesis_cost(atoms):
+    """
+    Returns the cost class of a hypothesis, the cost of its most expensive atom.
+    """
+    costs = [ATOMS[atom][1] if atom in ATOMS else "linear" for atom in atoms]
+    costs += [INVARIANTS[name].cost if name in INVARIANTS else "polynomial" for name in hypothesis_invariants(atoms)]
+    return max(costs, key=COST_CLASSES.index)
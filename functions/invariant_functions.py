@@ -1,18 +1,40 @@
 import grinpy as gp
 import networkx as nx
 import numpy as np
-import itertools
-
-__all__ = ["compute", "factors_compute"]
+from functions.registry import register
+from functions.bitsets import accepts_bitset_graph, as_bitset_graph, is_connected
+from functions.graph_context import GraphContext, adjacency_eigenvalues
+from functions.spectral import SPECTRAL_MATRICES, spectrum
+from functions.degree_indices import DegreeTerms, degree_indices
+from functions.degree_sequences import DegreeSequences
+from functions.cliques import chromatic_number, clique_number, independence_number, maximum_clique, maximum_independent_set
+from functions.edge_coloring import chromatic_index
+from functions.distances import UNREACHABLE, distance_matrix, triameter, wiener_index
+from functions.domination import solve_domination
+from functions.forbidden_subgraphs import find_diamond
+from functions.hypotheses import HYPOTHESES, hypothesis, hypothesis_cost, hypothesis_invariants
+from functions.forcing import (
+    connected_zero_forcing_number,
+    power_domination_number,
+    psd_zero_forcing_number,
+    total_zero_forcing_number,
+    zero_forcing_number,
+)
+
+__all__ = ["compute", "factors_compute", "SPECTRAL_INVARIANTS", "spectral_kinds"]
 
 
 def compute(G, property):
     """
     Returns the value of a given graph property for a given graph G.
 
+    The property is looked up in the invariant registry; names that are not registered
+    are taken from GrinPy. Pass a GraphContext instead of a graph to reuse the values and
+    intermediate objects computed for earlier properties of the same graph.
+
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph, BitsetGraph or GraphContext
         An undirected graph.
     property : string
         The name of the graph property to be calculated for the graph G.
@@ -22,278 +44,9 @@ def compute(G, property):
     int or float or bool
         The value of the graph property for the graph G.
     """
-    if property == "k_slater_index":
-        return k_slater_index(G)
-    elif property == "wiener_index":
-        return gp.wiener_index(G)
-    elif property == "vertex_cover_number":
-        return vertex_cover_number(G)
-    elif property == "k_residual_index":
-        return k_residual_index(G)
-    elif property == "order":
-        return gp.number_of_nodes(G)
-    elif property == "size":
-        return gp.number_of_edges(G)
-    elif property == "edge_domination_number":
-        LG = gp.line_graph(G)
-        return gp.domination_number(LG)
-    elif property == "min_maximal_matching_number":
-        LG = gp.line_graph(G)
-        return gp.independent_domination_number(LG)
-    elif property == "roman_domination_number":
-        return roman_domination_number(G)
-    elif property == "double_roman_domination_number":
-        return double_roman_domination_number(G)
-    elif property == "two_rainbow_domination_number":
-        return two_rainbow_domination_number(G)
-    elif property == "three_rainbow_domination_number":
-        return three_rainbow_domination_number(G)
-    elif property == "restrained_domination_number":
-        return restrained_domination_number(G)
-    elif property == "(order - domination_number)":
-        return gp.number_of_nodes(G) - gp.domination_number(G)
-    elif property == "(order - total_domination_number)":
-        return gp.number_of_nodes(G) - gp.total_domination_number(G)
-    elif property == "(order - connected_domination_number)":
-        return gp.number_of_nodes(G) - gp.connected_domination_number(G)
-    elif property == "(order - independence_number)":
-        return gp.number_of_nodes(G) - gp.independence_number(G)
-    elif property == "(order - power_domination_number)":
-        return gp.number_of_nodes(G) - gp.power_domination_number(G)
-    elif property == "(order - zero_forcing_number)":
-        return gp.number_of_nodes(G) - gp.zero_forcing_number(G)
-    elif property == "(order - diameter)":
-        return gp.number_of_nodes(G) - gp.diameter(G)
-    elif property == "(order - radius)":
-        return gp.number_of_nodes(G) - gp.radius(G)
-    elif property == "(order - triameter)":
-        return gp.number_of_nodes(G) - gp.triameter(G)
-    elif property == "(size - diameter)":
-        return gp.number_of_edges(G) - gp.diameter(G)
-    elif property == "(size - radius)":
-        return gp.number_of_edges(G) - gp.radius(G)
-    elif property == "(size - triameter)":
-        return gp.number_of_edges(G) - gp.triameter(G)
-    elif property == "(order - independent_domination_number)":
-        return gp.number_of_nodes(G) - gp.independent_domination_number(G)
-    elif property == "(order - chromatic_number)":
-        return gp.number_of_nodes(G) - gp.chromatic_number(G)
-    elif property == "(order - matching_number)":
-        return gp.number_of_nodes(G) - gp.matching_number(G)
-    elif property == "(order - min_maximal_matching_number)":
-        return gp.number_of_nodes(G) - gp.min_maximal_matching_number(G)
-    elif property == "(size - matching_number)":
-        return gp.number_of_edges(G) - gp.matching_number(G)
-    elif property == "(size - min_maximal_matching_number)":
-        return gp.number_of_edges(G) - gp.min_maximal_matching_number(G)
-    elif property == "(order - min_degree)":
-        return gp.number_of_nodes(G) - gp.min_degree(G)
-    elif property == "(order - max_degree)":
-        return gp.number_of_nodes(G) - gp.max_degree(G)
-    elif property == "(order - clique_number)":
-        return gp.number_of_nodes(G) - gp.clique_number(G)
-    elif property == "(order - residue)":
-        return gp.number_of_nodes(G) - gp.residue(G)
-    elif property == "(order - annihilation_number)":
-        return gp.number_of_nodes(G) - gp.annihilation_number(G)
-    elif property == "(order - sub_total_domination_number)":
-        return gp.number_of_nodes(G) - gp.sub_total_domination_number(G)
-    elif property == "(order - slater)":
-        return gp.number_of_nodes(G) - gp.slater(G)
-    elif property == "(order - k_slater_index)":
-        return gp.number_of_nodes(G) - k_slater_index(G)
-    elif property == "(order - k_residual_index)":
-        return gp.number_of_nodes(G) - k_residual_index(G)
-    elif property == "min_edge_cover":
-        return len(gp.min_edge_cover(G))
-    elif property == "[(annihilation_number + residue)/ max_degree]":
-        return (gp.annihilation_number(G) + gp.residue(G)) / gp.max_degree(G)
-    elif property == "[order/ max_degree]":
-        return gp.number_of_nodes(G) / gp.max_degree(G)
-    elif property == "[order/ (max_degree + 1)]":
-        return gp.number_of_nodes(G) / (gp.max_degree(G) + 1)
-    elif property == "[order/ (max_degree - 1)]":
-        return gp.number_of_nodes(G) / (gp.max_degree(G) - 1)
-    elif property == "[order/ (max_degree + 2)]":
-        return gp.number_of_nodes(G) / (gp.max_degree(G) + 2)
-    elif property == "(residue + annihilation_number)":
-        return gp.residue(G) + gp.annihilation_number(G)
-    elif property == "graph_energy":
-        return graph_energy(G)
-    elif property == "square_positive_energy":
-        return square_positive_energy(G)
-    elif property == "square_negative_energy":
-        return square_negative_energy(G)
-    elif property == "positive_semidefinite_zero_forcing_number":
-        return positive_semidefinite_zero_forcing_number(G)
-    elif property == "second_largest_eigenvalue":
-        return second_largest_eigenvalue(G)
-    elif property == "a connected graph":
-        return gp.is_connected(G)
-    elif property == "a connected and planar graph":
-        return gp.is_connected(G) and gp.check_planarity(G)[0]
-    elif property == "a connected and regular graph":
-        return gp.is_connected(G) and gp.min_degree(G) == gp.max_degree(G)
-    elif property == "a connected and cubic graph":
-        return gp.is_connected(G) and gp.min_degree(G) == 3 and gp.max_degree(G) == 3
-    elif property == "a connected graph which is not K_n":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False
-    elif property == "a connected and triangle-free graph":
-        return gp.is_connected(G) and set(gp.triangles(G).values()) == {0}
-    elif property == "a connected and claw-free graph":
-        return gp.is_connected(G) and gp.is_claw_free(G)
-    elif property == "a connected and chordal graph":
-        return gp.is_connected(G) and gp.is_chordal(G)
-    elif property == "a tree graph":
-        return gp.is_connected(G) and gp.is_tree(G)
-    elif property == "a connected and at-free graph":
-        return gp.is_connected(G) and gp.is_at_free(G)
-    elif property == "an eulerian graph":
-        return gp.is_connected(G) and gp.is_eulerian(G)
-    elif property == "a connected and bipartite graph":
-        return gp.is_connected(G) and gp.is_bipartite(G)
-    elif property == "a connected graph with maximum degree at most 3":
-        return gp.is_connected(G) and gp.max_degree(G) <= 3
-    elif property == "a connected graph which is not K_n and has maximum degree at most 3":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False and gp.max_degree(G) <= 3
-    elif property == "a connected and cubic graph which is not K_4":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False and gp.min_degree(G) == 3 and gp.max_degree(G) == 3
-    elif property == "a connected, claw-free, and cubic graph":
-        return gp.is_connected(G) and gp.min_degree(G) == 3 and gp.max_degree(G) == 3 and gp.is_claw_free(G)
-    elif property == "a connected, planar, and cubic graph":
-        return gp.is_connected(G) and gp.min_degree(G) == 3 and gp.max_degree(G) == 3 and gp.is_planar(G)
-    elif property == "a connected graph with a total domination number equal to the domination number":
-        return gp.is_connected(G) and gp.total_domination_number(G) == gp.domination_number(G)
-    elif property == "a connected and well-covered graph":
-        return gp.is_connected(G) and gp.independence_number(G) == gp.independent_domination_number(G)
-    elif property == "a connected and Class-1 graph":
-        new_G = gp.line_graph(G)
-        return gp.is_connected(G) and gp.chromatic_number(new_G) == gp.max_degree(G)
-    elif property == "a connected and Class-2 graph":
-        new_G = gp.line_graph(G)
-        return gp.is_connected(G) and gp.chromatic_number(new_G) == gp.max_degree(G) + 1
-    elif property == "a connected graph with diameter at most 3":
-        return gp.is_connected(G) and gp.diameter(G) <= 3
-    elif property == "a connected and planar graph with diameter at most 3":
-        return gp.is_connected(G) and gp.is_planar(G) and gp.diameter(G) <= 3
-    elif property == "a connected_graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.min_degree(G) >= 2
-    elif property == "a connected_graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.min_degree(G) >= 3
-    elif property == "a connected_graph with min_degree at least 4":
-        return gp.is_connected(G) and gp.min_degree(G) >= 4
-    elif property == "a connected and bipartite graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_bipartite(G) and gp.min_degree(G) >= 2
-    elif property == "a connected and bipartite graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_bipartite(G) and gp.min_degree(G) >= 3
-    elif property == "a connected and bipartite graph with min_degree at least 4":
-        return gp.is_connected(G) and gp.is_bipartite(G) and gp.min_degree(G) >= 4
-    elif property == "a connected and planar graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_planar(G) and gp.min_degree(G) >= 2
-    elif property == "a connected and planar graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_planar(G) and gp.min_degree(G) >= 3
-    elif property == "a connected and planar graph with min_degree at least 4":
-        return gp.is_connected(G) and gp.is_planar(G) and gp.min_degree(G) >= 4
-    elif property == "a connected graph which is not K_n with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False and gp.min_degree(G) >= 2
-    elif property == "a connected graph which is not K_n with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False and gp.min_degree(G) >= 3
-    elif property == "a connected graph which is not K_n with min_degree at least 4":
-        return gp.is_connected(G) and gp.is_isomorphic(G, gp.complete_graph(gp.number_of_nodes(G))) == False and gp.min_degree(G) >= 4
-    elif property == "a connected and triangle-free graph with min_degree at least 2":
-        return gp.is_connected(G) and set(gp.triangles(G).values()) == {0} and gp.min_degree(G) >= 2
-    elif property == "a connected and triangle-free graph with min_degree at least 3":
-        return gp.is_connected(G) and set(gp.triangles(G).values()) == {0} and gp.min_degree(G) >= 3
-    elif property == "a connected and triangle-free graph with min_degree at least 4":
-        return gp.is_connected(G) and set(gp.triangles(G).values()) == {0} and gp.min_degree(G) >= 4
-    elif property == "a connected and at-free graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_at_free(G) and gp.min_degree(G) >= 2
-    elif property == "a connected and at-free graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_at_free(G) and gp.min_degree(G) >= 3
-    elif property == "a connected and at-free graph with min_degree at least 4":
-        return gp.is_connected(G) and gp.is_at_free(G) and gp.min_degree(G) >= 4
-    elif property == "a connected and claw-free graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_claw_free(G) and gp.min_degree(G) >= 2
-    elif property == "a connected and claw-free graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_claw_free(G) and gp.min_degree(G) >= 3
-    elif property == "a connected and claw-free graph with min_degree at least 4":
-        return gp.is_connected(G) and gp.is_claw_free(G) and gp.min_degree(G) >= 4
-    elif property == "a connected and chordal graph with min_degree at least 2":
-        return gp.is_connected(G) and gp.is_chordal(G) and gp.min_degree(G) >= 2
-    elif property == "a connected and chordal graph with min_degree at least 3":
-        return gp.is_connected(G) and gp.is_chordal(G) and gp.min_degree(G) >= 3
-    elif  property == "a connected graph with min_degree at least 2 and maximum degree at most 3":
-        return gp.is_connected(G) and gp.min_degree(G) >= 2 and gp.max_degree(G) <= 3
-    elif property == "a connected and diamond-free graph":
-        return gp.is_connected(G) and is_diamond_free(G)
-    elif property == "a connected, cubic, and diamond-free graph":
-        return gp.is_connected(G) and is_cubic_and_diamond_free(G)
-    elif property == "a connected and bull-free graph":
-        return gp.is_connected(G) and gp.is_bull_free(G)
-    elif property == "semitotal_domination_number":
-        return semitotal_domination_number(G)
-    elif property == "a block graph":
-        return is_block_graph(G)
-    elif property == "outer_connected_domination_number":
-        return outer_connected_domination_number(G)
-    elif property == "strong_harmonic_index":
-        return strong_harmonic_index(G)
-    elif property == "reciprocal_first_zagreb_index":
-        return reciprocal_first_zagreb_index(G)
-    elif property == "reciprocal_second_zagreb_index":
-        return reciprocal_second_zagreb_index(G)
-    elif property == "reciprocal_harary_index":
-        return reciprocal_harary_index(G)
-    elif property == "reciprocal_second_zagreb_variation":
-        return reciprocal_second_zagreb_variation(G)
-    elif property == "reciprocal_randic_index":
-        return reciprocal_randic_index(G)
-    elif property == "reciprocal_augmented_zagreb_index":
-        return reciprocal_augmented_zagreb_index(G)
-    elif property == "reciprocal_sum_connectivity_index":
-        return reciprocal_sum_connectivity_index(G)
-    elif property == "reciprocal_hyper_zagreb_index":
-        return reciprocal_hyper_zagreb_index(G)
-    elif property == "reciprocal_geometric_arithmetic_index":
-        return reciprocal_geometric_arithmetic_index(G)
-    elif property == "inverse_degree_plus_one_sum":
-        return inverse_degree_plus_one_sum(G)
-    elif property == "inverse_degree_plus_two_sum":
-        return inverse_degree_plus_two_sum(G)
-    elif property == "inverse_edge_degree_plus_one_sum":
-        return inverse_edge_degree_plus_one_sum(G)
-    elif property == "inverse_edge_degree_plus_two_sum":
-        return inverse_edge_degree_plus_two_sum(G)
-
-
-    # New 2-degree based indices
-    elif property == "first_zagreb_index_2_degree":
-        return first_zagreb_index_2_degree(G)
-    elif property == "second_zagreb_index_2_degree":
-        return second_zagreb_index_2_degree(G)
-    elif property == "reciprocal_first_zagreb_index_2_degree":
-        return reciprocal_first_zagreb_index_2_degree(G)
-    elif property == "reciprocal_second_zagreb_index_2_degree":
-        return reciprocal_second_zagreb_index_2_degree(G)
-    elif property == "average_degree_2_degree":
-        return average_degree_2_degree(G)
-    elif property == "reciprocal_randic_index_2_degree":
-        return reciprocal_randic_index_2_degree(G)
-    elif property == "reciprocal_sum_connectivity_index_2_degree":
-        return reciprocal_sum_connectivity_index_2_degree(G)
-    elif property == "hyper_zagreb_index_2_degree":
-        return hyper_zagreb_index_2_degree(G)
-    elif property == "reciprocal_geometric_arithmetic_index_2_degree":
-        return reciprocal_geometric_arithmetic_index_2_degree(G)
-
-    elif property == "augmented_average_edge_degree":
-        return augmented_average_edge_degree(G)
-
-    elif property == "a connected graph that is a line graph":
-        return is_line_graph_modified(G)
-
-    else:
-        return getattr(gp, property)(G)
+    if not isinstance(G, GraphContext):
+        G = GraphContext(G)
+    return G[property]
 
 def factors_compute(G, H, property):
     # Split the property string by the operation (either + or *)
@@ -320,22 +73,23 @@ def factors_compute(G, H, property):
 
 
 
-def k_slater_index(G):
+def k_slater_index(G, domination_number=None):
     """Return a the smallest integer k so that the sub-k-domination number
     of G is at least the domination number of G.
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
+    domination_number : int
+        The domination number of G, if already known.
     Returns
     -------
     number
         The smallest ineteger k such that gp.domination_number(G) <= gp.sub_k_domination_number(G, k).
     """
-    k = 1
-    while gp.sub_k_domination_number(G, k) < gp.domination_number(G):
-        k += 1
-    return k
+    if domination_number is None:
+        domination_number = gp.domination_number(G)
+    return int(DegreeSequences([G]).k_slater_indices([domination_number])[0])
 
 def vertex_cover_number(G):
     """Return a the size of smallest vertex cover in the graph G.
@@ -348,25 +102,26 @@ def vertex_cover_number(G):
     number
         The size of a smallest vertex cover of G.
     """
-    return gp.number_of_nodes(G) - gp.independence_number(G)
+    return gp.number_of_nodes(G) - independence_number(G)
 
-def k_residual_index(G):
+def k_residual_index(G, independence_number=None):
     """Return a the smallest integer k so that the k-residue of G is at least the
     independence number of G.
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
+    independence_number : int
+        The independence number of G, if already known.
     Returns
     -------
     number
         The smallest ineteger k such that gp.independence_number(G) <= gp.k_residue(G, k).
 
     """
-    k = 1
-    while gp.k_residue(G, k) < gp.independence_number(G):
-        k += 1
-    return k
+    if independence_number is None:
+        independence_number = len(maximum_independent_set(G))
+    return int(DegreeSequences([G]).k_residual_indices([independence_number])[0])
 
 def is_diamond_free(G):
     """Return True if the graph G is diamond-free, and False otherwise.
@@ -383,15 +138,7 @@ def is_diamond_free(G):
     bool
         True if G is diamond-free, and False otherwise.
     """
-    diamond = gp.complete_graph(4)
-    diamond.remove_edge(1, 2)
-     # enumerate over all possible combinations of 5 vertices contained in G
-    for S in set(itertools.combinations(G.nodes(), 4)):
-        H = G.subgraph(list(S))
-        if gp.is_isomorphic(H, diamond):
-            return False
-    # if the above loop completes, the graph is bull-free
-    return True
+    return find_diamond(G) is None
 
 def is_cubic_and_diamond_free(G):
     """Return True if the graph G is cubic and diamond-free, and False otherwise.
@@ -410,70 +157,48 @@ def is_cubic_and_diamond_free(G):
     """
     return gp.min_degree(G) == gp.max_degree(G) == 3 and is_diamond_free(G)
 
-import networkx as nx
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary
-
-def closed_neighborhood(G, node):
-    """Return the closed neighborhood of a node."""
-    return set(G.neighbors(node)).union({node})
-
-def min_semitotal_dominating_set_ilp(G):
+def min_semitotal_dominating_set(G):
     """Return a smallest semitotal dominating set in the graph.
 
     A semitotal dominating set in a graph *G* is a set *D* of nodes of *G* such that:
     1. *D* is a dominating set.
     2. Each vertex in *D* has another vertex in *D* within distance 2.
 
-    This method uses integer programming to compute a smallest semitotal dominating set.
+    The set is found by the "semitotal" program of functions.domination.
 
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or GraphContext
         An undirected graph.
 
     Returns
     -------
-    set
-        A set of nodes in a smallest semitotal dominating set in the graph.
+    list
+        A list of nodes in a smallest semitotal dominating set in the graph.
     """
-    prob = LpProblem("min_semitotal_dominating_set", LpMinimize)
-    variables = {node: LpVariable("x{}".format(i + 1), 0, 1, LpBinary) for i, node in enumerate(G.nodes())}
-
-    # Set the semitotal domination number objective function
-    prob += lpSum([variables[n] for n in variables])
-
-    # Constraint 1: Dominating set constraint
-    for node in G.nodes():
-        combination = [variables[n] for n in variables if n in closed_neighborhood(G, node)]
-        prob += lpSum(combination) >= 1
-
-    # Constraint 2: Semitotal domination constraint
-    for node in G.nodes():
-        if len(closed_neighborhood(G, node).intersection(G.nodes())) > 1:
-            prob += variables[node] + lpSum(variables[neighbor] for neighbor in G.neighbors(node) if neighbor != node) >= 2
-
-    prob.solve()
-    solution_set = {node for node in variables if variables[node].value() == 1}
-    return solution_set
+    return solve_domination(G, "semitotal").vertices("x")
 
-def semitotal_domination_number(G):
+def semitotal_domination_number(G, domination_number=None):
     """Return the semitotal domination number of the graph.
 
     The semitotal domination number of a graph *G* is the size of a smallest semitotal dominating set in *G*.
 
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or GraphContext
         An undirected graph.
+    domination_number : int
+        The domination number of G, if known. It bounds the program from below.
 
     Returns
     -------
     int
         The semitotal domination number of the graph.
     """
-    return len(min_semitotal_dominating_set_ilp(G))
+    return solve_domination(G, "semitotal", lower_bound=domination_number).value
+
 
-def graph_energy(G):
+def graph_energy(G, eigenvalues=None):
     """
     Compute the energy of a graph G.
 
@@ -481,24 +206,24 @@ def graph_energy(G):
     ----------
     G : NetworkX graph
         An undirected graph.
+    eigenvalues : array
+        The eigenvalues of the adjacency matrix of G, if already known.
 
     Returns
     -------
     float
         The energy of the graph G.
     """
-    # Step 1: Compute the adjacency matrix A(G)
-    A = nx.adjacency_matrix(G).todense()
-
-    # Step 2: Compute the eigenvalues of the adjacency matrix
-    eigenvalues = np.linalg.eigvals(A)
+    # Step 1: Compute the eigenvalues of the adjacency matrix A(G), unless already known
+    if eigenvalues is None:
+        eigenvalues = adjacency_eigenvalues(G)
 
-    # Step 3: Calculate the energy as the sum of the absolute values of the eigenvalues
-    energy = sum(np.abs(eigenvalues))
+    # Step 2: Calculate the energy as the sum of the absolute values of the eigenvalues
+    energy = np.abs(eigenvalues).sum()
 
     return round(energy)
 
-def square_positive_energy(G):
+def square_positive_energy(G, eigenvalues=None):
     """
     Compute the square positive energy of a graph G.
 
@@ -506,27 +231,24 @@ def square_positive_energy(G):
     ----------
     G : NetworkX graph
         An undirected graph.
+    eigenvalues : array
+        The eigenvalues of the adjacency matrix of G, if already known.
 
     Returns
     -------
     float
         The square positive energy of the graph G.
     """
-    # Step 1: Compute the adjacency matrix A(G)
-    A = nx.adjacency_matrix(G).todense()
-
-    # Step 2: Compute the eigenvalues of the adjacency matrix
-    eigenvalues = np.linalg.eigvals(A)
-
-    positive_eigenvalues_sqaures = [eig**2 for eig in eigenvalues if eig > 0]
-    # negative_eigenvalues = [eig for eig in eigenvalues if eig < 0]
+    # Step 1: Compute the eigenvalues of the adjacency matrix A(G), unless already known
+    if eigenvalues is None:
+        eigenvalues = adjacency_eigenvalues(G)
 
-    # Step 3: Calculate the energy as the sum of the absolute values of the eigenvalues
-    energy = sum(positive_eigenvalues_sqaures)
+    # Step 2: Calculate the energy as the sum of the squares of the positive eigenvalues
+    energy = np.square(eigenvalues[eigenvalues > 0]).sum()
 
     return round(energy)
 
-def square_negative_energy(G):
+def square_negative_energy(G, eigenvalues=None):
     """
     Compute the square negative energy of a graph G.
 
@@ -534,225 +256,119 @@ def square_negative_energy(G):
     ----------
     G : NetworkX graph
         An undirected graph.
+    eigenvalues : array
+        The eigenvalues of the adjacency matrix of G, if already known.
 
     Returns
     -------
     float
         The square negative energy of the graph G.
     """
-    # Step 1: Compute the adjacency matrix A(G)
-    A = nx.adjacency_matrix(G).todense()
+    # Step 1: Compute the eigenvalues of the adjacency matrix A(G), unless already known
+    if eigenvalues is None:
+        eigenvalues = adjacency_eigenvalues(G)
 
-    # Step 2: Compute the eigenvalues of the adjacency matrix
-    eigenvalues = np.linalg.eigvals(A)
-
-    negative_eigenvalues_sqaures = [eig**2 for eig in eigenvalues if eig < 0]
-
-    # Step 3: Calculate the energy as the sum of the absolute values of the eigenvalues
-    energy = sum(negative_eigenvalues_sqaures)
+    # Step 2: Calculate the energy as the sum of the squares of the negative eigenvalues
+    energy = np.square(eigenvalues[eigenvalues < 0]).sum()
 
     return round(energy)
 
 
-from itertools import combinations
-from networkx import is_connected, Graph, neighbors
-
-def is_psd_forcing_vertex(G, v, black_set, component):
-    """
-    Return whether or not v can force any white vertex in the component.
-
-    Parameters
-    ----------
-    G : NetworkX graph
-        An undirected graph.
-
-    v : node
-        A single node in G.
-
-    black_set : set
-        A set of black vertices in G.
-
-    component : set
-        A set of vertices in a component of G - black_set.
-
-    Returns
-    -------
-    tuple
-        A tuple (True, w) if v can force the white vertex w in the component, (False, None) otherwise.
-    """
-    set_neighbors = set(neighbors(G, v))
-    white_neighbors_in_component = set_neighbors.intersection(component)
-
-    if len(white_neighbors_in_component) == 1:
-        w = white_neighbors_in_component.pop()
-        return (True, w)
-    return (False, None)
-
-
-def psd_color_change(G, black_set):
+def positive_semidefinite_zero_forcing_number(G):
     """
-    Apply the PSD color change rule repeatedly until no more vertices can be forced.
+    Return the PSD zero forcing number of G.
 
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
 
-    black_set : set
-        A set of initial black vertices.
-
     Returns
     -------
-    set
-        The derived set of black vertices.
+    int
+        The PSD zero forcing number of G.
     """
-    black_set = set(black_set)
-    white_set = set(G.nodes()) - black_set
-
-    while True:
-        new_black = set()
-        components = [set(c) for c in nx.connected_components(G.subgraph(white_set))]
-
-        for component in components:
-            for v in black_set:
-                can_force, w = is_psd_forcing_vertex(G, v, black_set, component)
-                if can_force:
-                    new_black.add(w)
+    return psd_zero_forcing_number(G)
 
-        if not new_black:
-            break
-
-        black_set.update(new_black)
-        white_set -= new_black
-
-    return black_set
-
-
-def is_psd_zero_forcing_set(G, black_set):
+def second_largest_eigenvalue(G, eigenvalues=None):
     """
-    Return whether or not the vertices in black_set comprise a PSD zero forcing set in G.
+    Compute the second largest eigenvalue of the adjacency matrix of a graph G.
 
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
-
-    black_set : set
-        A set of initial black vertices.
+    eigenvalues : array
+        The eigenvalues of the adjacency matrix of G, if already known.
 
     Returns
     -------
-    boolean
-        True if the black_set is a PSD zero forcing set in G. False otherwise.
+    float
+        The second largest eigenvalue of the adjacency matrix of G.
     """
-    derived_set = psd_color_change(G, black_set)
-    return len(derived_set) == G.order()
+    # Step 1: Compute the eigenvalues of the adjacency matrix A(G), unless already known
+    if eigenvalues is None:
+        eigenvalues = adjacency_eigenvalues(G)
 
+    # Step 2: Sort the eigenvalues in descending order
+    sorted_eigenvalues = np.sort(eigenvalues)[::-1]
 
-def min_psd_zero_forcing_set(G):
-    """
-    Return a smallest PSD zero forcing set in G.
-
-    The method used to compute the set is brute force.
+    value = round(sorted_eigenvalues[1])
 
-    Parameters
-    ----------
-    G : NetworkX graph
-        An undirected graph.
+    value = int(value)
 
-    Returns
-    -------
-    list
-        A list of nodes in a smallest PSD zero forcing set in G.
-    """
-    for i in range(1, G.order() + 1):
-        for black_set in combinations(G.nodes(), i):
-            if is_psd_zero_forcing_set(G, black_set):
-                return list(black_set)
+    # Step 3: Return the second largest eigenvalue
+    return value
 
+def spectral_radius(G, eigenvalues=None):
+    """Return the largest eigenvalue of the adjacency matrix of G."""
+    if eigenvalues is None:
+        eigenvalues = adjacency_eigenvalues(G)
+    return float(np.max(eigenvalues))
 
-def positive_semidefinite_zero_forcing_number(G):
+def algebraic_connectivity(G, eigenvalues=None):
     """
-    Return the PSD zero forcing number of G.
+    Return the algebraic connectivity of G, the second smallest eigenvalue of its Laplacian matrix.
 
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
+    eigenvalues : array
+        The eigenvalues of the Laplacian matrix of G, in ascending order, if already known.
 
     Returns
     -------
-    int
-        The PSD zero forcing number of G.
+    float
+        The algebraic connectivity of G, which is positive exactly when G is connected.
     """
-    return len(min_psd_zero_forcing_set(G))
-
-import pulp
-import networkx as nx
-
-def semitotal_domination_number(G):
-    # Map node labels to indices
-    node_mapping = {node: idx for idx, node in enumerate(G.nodes())}
-    inv_node_mapping = {idx: node for node, idx in node_mapping.items()}
-    n = len(G)
-
-    # Create a linear-integer problem
-    prob = pulp.LpProblem("SemitotalDomination", pulp.LpMinimize)
-
-    # Decision variables
-    x = pulp.LpVariable.dicts("x", range(n), 0, 1, pulp.LpBinary)
-
-    # Objective function
-    prob += pulp.lpSum(x[i] for i in range(n)), "MinimizeSemitotalDominationSet"
-
-    # Dominating set constraint
-    for i in range(n):
-        node = inv_node_mapping[i]
-        prob += x[i] + pulp.lpSum(x[node_mapping[j]] for j in G.neighbors(node)) >= 1, f"DominatingSet_{i}"
-
-    # Semitotal constraint
-    for i in range(n):
-        node = inv_node_mapping[i]
-        distance_2_neighbors = set(nx.single_source_shortest_path_length(G, node, cutoff=2).keys())
-        distance_2_neighbors.discard(node)  # Exclude the vertex itself
-        prob += x[i] <= pulp.lpSum(x[node_mapping[j]] for j in distance_2_neighbors), f"Semitotal_{i}"
-
-    # Solve the problem
-    prob.solve()
-
-    # Get the solution
-    semitotal_dominating_set = [inv_node_mapping[i] for i in range(n) if x[i].varValue > 0.5]
-    return len(semitotal_dominating_set), semitotal_dominating_set
-
-def second_largest_eigenvalue(G):
+    if eigenvalues is None:
+        eigenvalues = spectrum(G, "laplacian")
+    if len(eigenvalues) < 2:
+        return 0.0
+    # The smallest Laplacian eigenvalue is 0; clip the rounding error of the solver.
+    return max(float(eigenvalues[1]), 0.0)
+
+def laplacian_energy(G, eigenvalues=None):
     """
-    Compute the second largest eigenvalue of the adjacency matrix of a graph G.
+    Return the Laplacian energy of G, the sum of |mu - 2m/n| over the Laplacian eigenvalues mu of G.
 
     Parameters
     ----------
     G : NetworkX graph
         An undirected graph.
+    eigenvalues : array
+        The eigenvalues of the Laplacian matrix of G, if already known.
 
     Returns
     -------
     float
-        The second largest eigenvalue of the adjacency matrix of G.
+        The Laplacian energy of G.
     """
-    # Step 1: Compute the adjacency matrix A(G)
-    A = nx.adjacency_matrix(G).todense()
-
-    # Step 2: Compute the eigenvalues of the adjacency matrix
-    eigenvalues = np.linalg.eigvals(A)
-
-    # Step 3: Sort the eigenvalues in descending order
-    sorted_eigenvalues = np.sort(eigenvalues)[::-1]
-
-    value = round(sorted_eigenvalues[1])
-
-    value = int(value)
-
-    # Step 4: Return the second largest eigenvalue
-    return value
+    if eigenvalues is None:
+        eigenvalues = spectrum(G, "laplacian")
+    average_degree = 2 * G.number_of_edges() / G.number_of_nodes()
+    return float(np.abs(eigenvalues - average_degree).sum())
 
 def is_complete_graph(G):
     """Check if a graph G is a complete graph."""
@@ -776,213 +392,78 @@ def is_block_graph(G):
 
     return True
 
-import itertools
-
 def is_dominating_set(G, S):
-    X = G.nodes() - S
-    for u in X:
-        if not any(v in S for v in G.neighbors(u)):
-            return False
-    return True
+    graph = as_bitset_graph(G)
+    mask = graph.mask(S)
+    return graph.neighborhood(mask) | mask == graph.full
 
 def complement_is_connected(G, S):
-    X = G.nodes() - S
-    return nx.is_connected(G.subgraph(X))
+    graph = as_bitset_graph(G)
+    rest = graph.full & ~graph.mask(S)
+    return rest == 0 or graph.is_connected(rest)
 
 def is_outer_connected_dominating_set(G, S):
     return is_dominating_set(G, S) and complement_is_connected(G, S)
 
-def min_outer_connected_dominating_set(G):
-    n = len(G.nodes())
-    min_set = None
-
-    for r in range(1, n + 1):  # Try all subset sizes
-        for S in itertools.combinations(G.nodes(), r):
-            S = set(S)
-            if is_outer_connected_dominating_set(G, S):
-                return S
-
-def outer_connected_domination_number(G):
-    return len(min_outer_connected_dominating_set(G))
-
-
-from pulp import LpProblem, LpMinimize, LpVariable, lpSum, LpBinary, value
-
-def roman_domination(graph):
-    # Initialize the problem
-    prob = LpProblem("RomanDomination", LpMinimize)
-
-    # Define variables x_v, y_v for each vertex v
-    x = {v: LpVariable(f"x_{v}", cat=LpBinary) for v in graph.nodes()}
-    y = {v: LpVariable(f"y_{v}", cat=LpBinary) for v in graph.nodes()}
-
-    # Objective function: min sum(x_v + 2*y_v)
-    prob += lpSum(x[v] + 2 * y[v] for v in graph.nodes()), "MinimizeCost"
-
-    # Dominance Constraint: x_v + y_v + sum(y_u for u in N(v)) >= 1 for all v
-    for v in graph.nodes():
-        neighbors = list(graph.neighbors(v))
-        prob += x[v] + y[v] + lpSum(y[u] for u in neighbors) >= 1, f"DominanceConstraint_{v}"
-
-    # Mutual Exclusivity: x_v + y_v <= 1 for all v
-    for v in graph.nodes():
-        prob += x[v] + y[v] <= 1, f"ExclusivityConstraint_{v}"
-
-    # Solve the problem
-    prob.solve()
-
-    # Extract solution
-    solution = {
-        "x": {v: value(x[v]) for v in graph.nodes()},
-        "y": {v: value(y[v]) for v in graph.nodes()},
-        "objective": value(prob.objective)
-    }
-
-    return solution
-
-def roman_domination_number(graph):
-    solution = roman_domination(graph)
-    return solution["objective"]
-
-
-def double_roman_domination(graph):
-    # Initialize the problem
-    prob = LpProblem("DoubleRomanDomination", LpMinimize)
-
-    # Define variables x_v, y_v, z_v for each vertex v
-    x = {v: LpVariable(f"x_{v}", cat=LpBinary) for v in graph.nodes()}
-    y = {v: LpVariable(f"y_{v}", cat=LpBinary) for v in graph.nodes()}
-    z = {v: LpVariable(f"z_{v}", cat=LpBinary) for v in graph.nodes()}
-
-    # Objective function: min sum(x_v + 2*y_v + 3*z_v)
-    prob += lpSum(x[v] + 2 * y[v] + 3 * z[v] for v in graph.nodes()), "MinimizeCost"
-
-    # Constraint (1b): xv + yv + zv + 1/2 * sum(yu for u in N(v)) + sum(zu for u in N(v)) >= 1
-    for v in graph.nodes():
-        neighbors = list(graph.neighbors(v))
-        prob += x[v] + y[v] + z[v] + 0.5 * lpSum(y[u] for u in neighbors) + lpSum(z[u] for u in neighbors) >= 1, f"Constraint_1b_{v}"
-
-    # Constraint (1c): sum(yu + zu) >= xv for each vertex v
-    for v in graph.nodes():
-        neighbors = list(graph.neighbors(v))
-        prob += lpSum(y[u] + z[u] for u in neighbors) >= x[v], f"Constraint_1c_{v}"
-
-    # Constraint (1d): xv + yv + zv <= 1
-    for v in graph.nodes():
-        prob += x[v] + y[v] + z[v] <= 1, f"Constraint_1d_{v}"
-
-    # Solve the problem
-    prob.solve()
-
-    # Extract solution
-    solution = {
-        "x": {v: value(x[v]) for v in graph.nodes()},
-        "y": {v: value(y[v]) for v in graph.nodes()},
-        "z": {v: value(z[v]) for v in graph.nodes()},
-        "objective": value(prob.objective)
-    }
-
-    return solution
-
-def double_roman_domination_number(graph):
-    solution = double_roman_domination(graph)
-    return solution["objective"]
+def min_outer_connected_dominating_set(G, domination_number=None):
+    """Return a smallest dominating set of G whose complement is empty or induces a connected subgraph.
 
+    The set is found by the "outer_connected" program of functions.domination, whose flow
+    constraints keep the complement connected.
+    """
+    return set(solve_domination(G, "outer_connected", lower_bound=domination_number).vertices("x"))
 
-def solve_rainbow_domination(G, k):
-    # Create a PuLP problem instance
-    prob = pulp.LpProblem("Rainbow_Domination", pulp.LpMinimize)
-
-    # Create binary variables f_vi where f_vi = 1 if vertex v is colored with color i
-    f = pulp.LpVariable.dicts("f", ((v, i) for v in G.nodes for i in range(1, k+1)), cat='Binary')
-
-    # Create binary variables x_v where x_v = 1 if vertex v is uncolored
-    x = pulp.LpVariable.dicts("x", G.nodes, cat='Binary')
+def outer_connected_domination_number(G, domination_number=None):
+    # gamma(G) <= outer connected domination number
+    return solve_domination(G, "outer_connected", lower_bound=domination_number).value
 
-    # Objective function: Minimize the total number of colored vertices
-    prob += pulp.lpSum(f[v, i] for v in G.nodes for i in range(1, k+1)), "Minimize total colored vertices"
 
-    # Constraint 1: Each vertex is either colored with one of the k colors or remains uncolored
-    for v in G.nodes:
-        prob += pulp.lpSum(f[v, i] for i in range(1, k+1)) + x[v] == 1, f"Color or Uncolored constraint for vertex {v}"
+def roman_domination(G):
+    """Return an optimal Roman dominating function of G as a DominationSolution.
 
-    # Constraint 2: If a vertex is uncolored (x_v = 1), it must be adjacent to vertices colored with all k colors
-    for v in G.nodes:
-        for i in range(1, k+1):
-            # Ensure that uncolored vertex v is adjacent to a vertex colored with color i
-            prob += pulp.lpSum(f[u, i] for u in G.neighbors(v)) >= x[v], f"Rainbow domination for vertex {v} color {i}"
+    Blocks "x" and "y" of the solution mark the vertices with value 1 and 2.
+    """
+    return solve_domination(G, "roman")
 
-    # Solve the problem using PuLP's default solver
-    prob.solve()
+def roman_domination_number(G, domination_number=None):
+    # gamma(G) <= gamma_R(G) <= 2 gamma(G)
+    upper_bound = None if domination_number is None else 2 * domination_number
+    return solve_domination(G, "roman", lower_bound=domination_number, upper_bound=upper_bound).value
 
-    # Output results
-    # print("Status:", pulp.LpStatus[prob.status])
 
-    # Print which vertices are colored and with what color
-    colored_vertices = [(v, i) for v in G.nodes for i in range(1, k+1) if pulp.value(f[v, i]) == 1]
-    uncolored_vertices = [v for v in G.nodes if pulp.value(x[v]) == 1]
+def double_roman_domination(G):
+    """Return an optimal double Roman dominating function of G as a DominationSolution.
 
-    print(f"Colored vertices: {colored_vertices}")
-    print(f"Uncolored vertices: {uncolored_vertices}")
+    Blocks "x", "y" and "z" of the solution mark the vertices with value 1, 2 and 3.
+    """
+    return solve_domination(G, "double_roman")
 
-    return colored_vertices, uncolored_vertices
+def double_roman_domination_number(G, domination_number=None):
+    # 2 gamma(G) <= gamma_dR(G) <= 3 gamma(G)
+    if domination_number is None:
+        return solve_domination(G, "double_roman").value
+    return solve_domination(
+        G, "double_roman", lower_bound=2 * domination_number, upper_bound=3 * domination_number
+    ).value
 
 
-def rainbow_domination_number(G, k):
-    colored_vertices, uncolored_vertices = solve_rainbow_domination(G, k)
-    return len(colored_vertices)
+def rainbow_domination_number(G, k, domination_number=None):
+    # The colored vertices dominate G, so there are at least gamma(G) of them.
+    return solve_domination(G, "rainbow", lower_bound=domination_number, k=k).value
 
 
-def two_rainbow_domination_number(G):
-    return rainbow_domination_number(G, 2)
+def two_rainbow_domination_number(G, domination_number=None):
+    return rainbow_domination_number(G, 2, domination_number)
 
-def three_rainbow_domination_number(G):
-    return rainbow_domination_number(G, 3)
+def three_rainbow_domination_number(G, domination_number=None):
+    return rainbow_domination_number(G, 3, domination_number)
 
 
 def minimum_restrained_dominating_set(G):
-    # Initialize the linear programming problem
-    prob = pulp.LpProblem("MinimumRestrainedDomination", pulp.LpMinimize)
-
-    # Decision variables: x_v is 1 if vertex v is in the restrained dominating set, 0 otherwise
-    x = {v: pulp.LpVariable(f"x_{v}", cat="Binary") for v in G.nodes()}
-
-    # Objective: Minimize the sum of x_v
-    prob += pulp.lpSum(x[v] for v in G.nodes()), "Objective"
-
-    # Constraint 1: Domination condition
-    for v in G.nodes():
-        prob += x[v] + pulp.lpSum(x[u] for u in G.neighbors(v)) >= 1, f"Domination_{v}"
-
-    # Constraint 2: No isolated vertices in the complement of the dominating set
-    for v in G.nodes():
-        prob += pulp.lpSum(1 - x[u] for u in G.neighbors(v)) >= (1 - x[v]), f"NoIsolated_{v}"
-
-    # Solve the problem
-    prob.solve(pulp.PULP_CBC_CMD(msg=0))
-
-    # Extract the solution
-    restrained_dom_set = [v for v in G.nodes() if pulp.value(x[v]) == 1]
+    return solve_domination(G, "restrained").vertices("x")
 
-    return restrained_dom_set
-
-def restrained_domination_number(G):
-    restrained_dom_set = minimum_restrained_dominating_set(G)
-    return len(restrained_dom_set)
-
-def min_reciprocal_degree(G, v, w):
-    return min(1/G.degree(v), 1/G.degree(w))
-
-def strong_harmonic_index(G):
-    return sum(min_reciprocal_degree(G, v, w) for v, w in G.edges())
-
-# Reciprocal First Zagreb Index
-def reciprocal_first_zagreb_index(G):
-    return sum(1 / (d ** 2) for v, d in G.degree() if d > 0)
-
-# Reciprocal Second Zagreb Index
-def reciprocal_second_zagreb_index(G):
-    return sum(1 / (G.degree(u) * G.degree(v)) for u, v in G.edges() if G.degree(u) > 0 and G.degree(v) > 0)
+def restrained_domination_number(G, domination_number=None):
+    return solve_domination(G, "restrained", lower_bound=domination_number).value
 
 # # Reciprocal Estrada Index
 # def reciprocal_estrada_index(G):
@@ -990,104 +471,13 @@ def reciprocal_second_zagreb_index(G):
 #     return sum(1 / np.exp(l) for l in eigenvalues if np.exp(l) > 0)
 
 # Reciprocal Harary Index
-def reciprocal_harary_index(G):
-    return sum(1 / (nx.shortest_path_length(G, u, v) ** 2) for u in G for v in G if u != v)
-
-# Reciprocal Second Zagreb Index Variation
-def reciprocal_second_zagreb_variation(G):
-    return sum(1 / (G.degree(u) + G.degree(v)) for u, v in G.edges() if (G.degree(u) + G.degree(v)) > 0)
-
-# Reciprocal Randić Index
-def reciprocal_randic_index(G):
-    return sum(1 / np.sqrt(G.degree(u) * G.degree(v)) for u, v in G.edges() if G.degree(u) > 0 and G.degree(v) > 0)
-
-# Reciprocal Augmented Zagreb Index
-def reciprocal_augmented_zagreb_index(G):
-    return sum(((G.degree(u) + G.degree(v) - 2) / (G.degree(u) * G.degree(v))) ** 3 for u, v in G.edges() if G.degree(u) > 0 and G.degree(v) > 0)
-
-# Reciprocal Sum-connectivity Index
-def reciprocal_sum_connectivity_index(G):
-    return sum(1 / np.sqrt(G.degree(u) + G.degree(v)) for u, v in G.edges() if (G.degree(u) + G.degree(v)) > 0)
-
-# Reciprocal Hyper-Zagreb Index
-def reciprocal_hyper_zagreb_index(G):
-    return sum(1 / (d * (d - 1)) for v, d in G.degree() if d > 1)
-
-# Reciprocal Geometric-Arithmetic Index
-def reciprocal_geometric_arithmetic_index(G):
-    return sum(2 * np.sqrt(G.degree(u) * G.degree(v)) / (G.degree(u) + G.degree(v)) for u, v in G.edges() if (G.degree(u) + G.degree(v)) > 0)
-
-def two_degree(G, v):
-    return len(set(nx.single_source_shortest_path_length(G, v, cutoff=2)) - {v})
-
-# 2-degree First Zagreb Index
-def first_zagreb_index_2_degree(G):
-    return sum(two_degree(G, v) ** 2 for v in G.nodes())
-
-# 2-degree Second Zagreb Index
-def second_zagreb_index_2_degree(G):
-    return sum(two_degree(G, u) * two_degree(G, v) for u, v in G.edges())
-
-# Reciprocal 2-degree First Zagreb Index
-def reciprocal_first_zagreb_index_2_degree(G):
-    return sum(1 / (two_degree(G, v) ** 2) for v in G.nodes() if two_degree(G, v) > 0)
-
-# Reciprocal 2-degree Second Zagreb Index
-def reciprocal_second_zagreb_index_2_degree(G):
-    return sum(1 / (two_degree(G, u) * two_degree(G, v)) for u, v in G.edges() if two_degree(G, u) > 0 and two_degree(G, v) > 0)
-
-# 2-degree Average Degree
-def average_degree_2_degree(G):
-    return sum(two_degree(G, v) for v in G.nodes()) / G.number_of_nodes()
-
-# Reciprocal 2-degree Randić Index
-def reciprocal_randic_index_2_degree(G):
-    return sum(1 / np.sqrt(two_degree(G, u) * two_degree(G, v)) for u, v in G.edges() if two_degree(G, u) > 0 and two_degree(G, v) > 0)
-
-# Reciprocal 2-degree Sum-connectivity Index
-def reciprocal_sum_connectivity_index_2_degree(G):
-    return sum(1 / np.sqrt(two_degree(G, u) + two_degree(G, v)) for u, v in G.edges() if (two_degree(G, u) + two_degree(G, v)) > 0)
-
-# 2-degree Hyper-Zagreb Index
-def hyper_zagreb_index_2_degree(G):
-    return sum(two_degree(G, v) * (two_degree(G, v) - 1) for v in G.nodes() if two_degree(G, v) > 1)
-
-# Reciprocal 2-degree Geometric-Arithmetic Index
-def reciprocal_geometric_arithmetic_index_2_degree(G):
-    return sum(2 * np.sqrt(two_degree(G, u) * two_degree(G, v)) / (two_degree(G, u) + two_degree(G, v)) for u, v in G.edges() if (two_degree(G, u) + two_degree(G, v)) > 0)
-
-
-def edge_degree(G, e):
-    """Returns the degree of an edge, which is the number of edges sharing an endpoint with the given edge e."""
-    u, v = e
-    return len(set(G.edges(u)) | set(G.edges(v))) - 1  # Subtract 1 to avoid double-counting the edge itself
-
-def average_edge_degree(G):
-    """Computes the average edge degree of the graph G."""
-    total_edge_degree = sum(edge_degree(G, e) for e in G.edges())
-    return total_edge_degree / G.number_of_edges()
-
-def augmented_average_edge_degree(G):
-    """Computes 2 * |E(G)| / (average_edge_degree(G) + 2)."""
-    num_edges = G.number_of_edges()
-    avg_edge_degree = average_edge_degree(G)
-    return 2 * num_edges / (avg_edge_degree + 2)
-
-def inverse_degree_plus_one_sum(G):
-    """Computes the sum of the inverse of the degree plus one for all vertices in G."""
-    return sum(1 / (G.degree(v) + 1) for v in G.nodes())
-
-def inverse_degree_plus_two_sum(G):
-    """Computes the sum of the inverse of the degree plus one for all vertices in G."""
-    return sum(1 / (G.degree(v) + 2) for v in G.nodes())
-
-def inverse_edge_degree_plus_one_sum(G):
-    """Computes the sum of the inverse of the edge degree plus one for all edges in G."""
-    return sum(1 / (edge_degree(G, e) + 1) for e in G.edges())
-
-def inverse_edge_degree_plus_two_sum(G):
-    """Computes the sum of the inverse of the edge degree plus one for all edges in G."""
-    return sum(1 / (edge_degree(G, e) + 2) for e in G.edges())
+def reciprocal_harary_index(G, distances=None):
+    if distances is None:
+        distances = distance_matrix(G)
+    if (distances == UNREACHABLE).any():
+        raise nx.NetworkXNoPath("The graph is not connected, so some pairs of vertices are joined by no path.")
+    pairs = distances[~np.eye(len(distances), dtype=bool)].astype(float)
+    return float((1 / pairs ** 2).sum())
 
 # Define the forbidden subgraphs based on Beineke's theorem
 def get_forbidden_subgraphs():
@@ -1154,3 +544,426 @@ def is_line_graph_modified(G):
             return False  # Contains a forbidden subgraph, so not a line graph
 
     return True  # No forbidden subgraphs found, so it's a line graph
+
+def _difference(left, right):
+    return lambda context: context[left] - context[right]
+
+def _with_domination_number(function):
+    """Return a function calling function(context, domination_number), so the programs of the
+    domination variants are bounded by the already computed domination number."""
+    return lambda context: function(context, context["domination_number"])
+
+def _domination_program(variant, bounded=True):
+    """Return a function solving the program of a domination variant of functions.domination,
+    bounded below by the domination number unless bounded is False."""
+    def number(context):
+        lower_bound = context["domination_number"] if bounded else None
+        return solve_domination(context, variant, lower_bound=lower_bound).value
+    return number
+
+def _connected_domination_number(context):
+    # Disconnected graphs have no connected dominating set; GrinPy reports 0 for them.
+    if not context.cached(is_connected):
+        return 0
+    return _domination_program("connected")(context)
+
+def _without_isolated_vertices(number):
+    """Return number, reporting 0 for graphs with an isolated vertex, which have no total or
+    semitotal dominating set, as _connected_domination_number does for disconnected graphs."""
+    def guarded(context):
+        if context.cached(_degree_sequences).invariant("min_degree")[0] == 0:
+            return 0
+        return number(context)
+    return guarded
+
+def _power_sum(name, k):
+    """Return a function summing a degree sequence invariant over the powers G, G^2, ..., G^k,
+    where k is either a number or the name of an invariant of G. The powers are one batch."""
+    def power_sum(context):
+        n = context[k] if isinstance(k, str) else k
+        return sum(DegreeSequences([context.power(i) for i in range(1, n + 1)]).invariant(name))
+    return power_sum
+
+@accepts_bitset_graph
+def _degree_sequences(G):
+    return DegreeSequences([G])
+
+def _degree_sequence_invariant(name, graph=None):
+    """Returns the registry function of an invariant of functions.degree_sequences, of the
+    graph itself or of the graph returned by graph(context), such as its line graph."""
+    if graph is None:
+        return lambda context: context.cached(_degree_sequences).invariant(name)[0]
+    return lambda context: DegreeSequences([graph(context)]).invariant(name)[0]
+
+def _degree_index(name):
+    """Returns the registry function of a degree-based index of functions.degree_indices.
+    The degree vectors are extracted once per context and shared by all of the indices."""
+    return lambda context: degree_indices(context.cached(DegreeTerms), [name])[name]
+
+
+# The matrix whose spectrum each spectral invariant reads from its GraphContext, so that the
+# spectra of many graphs can be computed together with functions.graph_context.prime_spectra.
+SPECTRAL_INVARIANTS = {
+    "graph_energy": "adjacency",
+    "square_positive_energy": "adjacency",
+    "square_negative_energy": "adjacency",
+    "second_largest_eigenvalue": "adjacency",
+    "spectral_radius": "adjacency",
+    "algebraic_connectivity": "laplacian",
+    "laplacian_spectral_radius": "laplacian",
+    "laplacian_energy": "laplacian",
+    "signless_laplacian_spectral_radius": "signless_laplacian",
+}
+
+
+def spectral_kinds(invariants):
+    """Returns the matrices whose spectra the given invariants read, in a fixed order."""
+    kinds = {SPECTRAL_INVARIANTS[invariant] for invariant in invariants if invariant in SPECTRAL_INVARIANTS}
+    return [kind for kind in SPECTRAL_MATRICES if kind in kinds]
+
+
+# Invariant registry. Listed invariants and properties are registered in the order in which
+# they appear in invariants.txt and properties.txt; see functions.registry.write_invariant_lists.
+# Functions registered with context=True take a GraphContext, so they share cached values
+# and intermediate objects (line graph, powers, distances, spectrum) with the other columns.
+
+#
+# The dataset holds connected graphs, but a user may enter any graph. On a disconnected graph:
+#   - connected_domination_number is 0, and so are total_domination_number and
+#     semitotal_domination_number when the graph has an isolated vertex, as GrinPy reports
+#     for a program with no solution;
+#   - diameter and radius raise NetworkXError, and triameter and
+#     reciprocal_harary_index raise NetworkXNoPath, as their NetworkX counterparts do;
+#   - wiener_index is infinite, as networkx.wiener_index is;
+#   - outer_connected_domination_number is defined, since the whole vertex set is always
+#     outer-connected dominating; on an edgeless graph it is the order;
+#   - the other invariants are computed as for connected graphs; augmented_average_edge_degree
+#     is NaN on any graph without edges.
+# tests/test_invariants.py checks these cases.
+
+# Invariants that other registered invariants are computed from, but that are not dataset columns.
+register(
+    "min_maximal_matching_number",
+    lambda context: solve_domination(context, "independent_edge").value,
+    cost="exponential",
+    listed=False,
+    context=True,
+)
+register("chromatic_index", chromatic_index, cost="exponential", listed=False, context=True)
+register("first_zagreb_index_2_degree", _degree_index("first_zagreb_index_2_degree"), cost="polynomial", listed=False, context=True)
+register("second_zagreb_index_2_degree", _degree_index("second_zagreb_index_2_degree"), cost="polynomial", listed=False, context=True)
+register("average_degree_2_degree", _degree_index("average_degree_2_degree"), returns="float", cost="polynomial", listed=False, context=True)
+register("hyper_zagreb_index_2_degree", _degree_index("hyper_zagreb_index_2_degree"), cost="polynomial", listed=False, context=True)
+
+# Invariants (invariants.txt).
+register("domination_number", _domination_program("domination", bounded=False), cost="exponential", context=True)
+register(
+    "total_domination_number",
+    _without_isolated_vertices(_domination_program("total")),
+    cost="exponential",
+    depends=["domination_number"],
+    context=True,
+)
+register(
+    "connected_domination_number",
+    _connected_domination_number,
+    cost="exponential",
+    depends=["domination_number"],
+    context=True,
+)
+register(
+    "semitotal_domination_number",
+    _without_isolated_vertices(_with_domination_number(semitotal_domination_number)),
+    cost="exponential",
+    depends=["domination_number"],
+    context=True,
+    version=2,
+)
+register("independence_number", independence_number, cost="exponential", context=True)
+register("power_domination_number", power_domination_number, cost="exponential", context=True)
+register("zero_forcing_number", zero_forcing_number, cost="exponential", context=True)
+register(
+    "total_zero_forcing_number",
+    lambda context: total_zero_forcing_number(context, context["zero_forcing_number"]),
+    cost="exponential",
+    depends=["zero_forcing_number"],
+    context=True,
+)
+register(
+    "connected_zero_forcing_number",
+    lambda context: connected_zero_forcing_number(context, context["zero_forcing_number"]),
+    cost="exponential",
+    depends=["zero_forcing_number"],
+    context=True,
+)
+register("diameter", lambda context: int(context.eccentricities().max()), cost="polynomial", context=True)
+register("radius", lambda context: int(context.eccentricities().min()), cost="polynomial", context=True)
+register("order", lambda context: context.order(), cost="linear", context=True)
+register("size", lambda context: context.size(), cost="linear", context=True)
+register(
+    "independent_domination_number",
+    _domination_program("independent"),
+    cost="exponential",
+    depends=["domination_number"],
+    context=True,
+)
+register(
+    "chromatic_number",
+    lambda context: chromatic_number(context, context.cached(maximum_clique)),
+    cost="exponential",
+    context=True,
+)
+# Edmonds' blossom algorithm, in-process; grinpy's matching_number solves an ILP with CBC.
+register("matching_number", lambda G: len(nx.max_weight_matching(G, maxcardinality=True)), cost="polynomial")
+register(
+    "edge_domination_number",
+    lambda context: solve_domination(context, "edge").value,
+    cost="exponential",
+    context=True,
+)
+register("triameter", lambda context: triameter(context.distances()), cost="polynomial", context=True)
+register("randic_index", _degree_index("randic_index"), returns="float", cost="linear", context=True)
+register("harmonic_index", _degree_index("harmonic_index"), returns="float", cost="linear", context=True)
+register("sum_connectivity_index", _degree_index("sum_connectivity_index"), returns="float", cost="linear", context=True)
+register("min_degree", _degree_sequence_invariant("min_degree"), cost="linear", context=True)
+register("max_degree", _degree_sequence_invariant("max_degree"), cost="linear", context=True)
+register("clique_number", lambda context: len(context.cached(maximum_clique)), cost="exponential", context=True)
+register("residue", _degree_sequence_invariant("residue"), cost="polynomial", context=True)
+register("annihilation_number", _degree_sequence_invariant("annihilation_number"), cost="polynomial", context=True)
+register("sub_total_domination_number", _degree_sequence_invariant("sub_total_domination_number"), cost="polynomial", context=True)
+register("slater", _degree_sequence_invariant("slater"), cost="polynomial", context=True)
+register(
+    "k_slater_index",
+    lambda context: int(context.cached(_degree_sequences).k_slater_indices([context["domination_number"]])[0]),
+    depends=["domination_number"],
+    context=True,
+)
+register("wiener_index", lambda context: wiener_index(context.distances()), cost="polynomial", context=True)
+register("vertex_cover_number", _difference("order", "independence_number"), depends=["order", "independence_number"], context=True)
+register(
+    "k_residual_index",
+    lambda context: int(context.cached(_degree_sequences).k_residual_indices([context["independence_number"]])[0]),
+    depends=["independence_number"],
+    context=True,
+)
+for other in [
+    "domination_number",
+    "total_domination_number",
+    "connected_domination_number",
+    "power_domination_number",
+    "zero_forcing_number",
+    "triameter",
+    "diameter",
+    "radius",
+    "independent_domination_number",
+    "chromatic_number",
+    "matching_number",
+    "min_maximal_matching_number",
+    "min_degree",
+    "max_degree",
+    "clique_number",
+    "residue",
+    "annihilation_number",
+    "sub_total_domination_number",
+    "slater",
+    "k_slater_index",
+    "k_residual_index",
+]:
+    register(f"(order - {other})", _difference("order", other), depends=["order", other], context=True)
+register("min_edge_cover", lambda G: len(gp.min_edge_cover(G)), cost="polynomial")
+register(
+    "(residue + annihilation_number)",
+    lambda context: context["residue"] + context["annihilation_number"],
+    depends=["residue", "annihilation_number"],
+    context=True,
+)
+register("graph_energy", lambda context: graph_energy(context.graph_for(spectrum), context.spectrum()), cost="polynomial", context=True)
+register(
+    "square_positive_energy",
+    lambda context: square_positive_energy(context.graph_for(spectrum), context.spectrum()),
+    cost="polynomial",
+    context=True,
+)
+register(
+    "square_negative_energy",
+    lambda context: square_negative_energy(context.graph_for(spectrum), context.spectrum()),
+    cost="polynomial",
+    context=True,
+)
+register("positive_semidefinite_zero_forcing_number", psd_zero_forcing_number, cost="exponential", context=True)
+register(
+    "second_largest_eigenvalue",
+    lambda context: second_largest_eigenvalue(context.graph_for(spectrum), context.extreme_eigenvalues(2)),
+    cost="polynomial",
+    context=True,
+)
+register(
+    "spectral_radius",
+    lambda context: spectral_radius(context.graph_for(spectrum), context.extreme_eigenvalues(1)),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register(
+    "algebraic_connectivity",
+    lambda context: algebraic_connectivity(context.graph_for(spectrum), context.extreme_eigenvalues(2, largest=False, kind="laplacian")),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register(
+    "laplacian_spectral_radius",
+    lambda context: float(context.extreme_eigenvalues(1, kind="laplacian")[0]),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register(
+    "laplacian_energy",
+    lambda context: laplacian_energy(context.graph_for(spectrum), context.spectrum("laplacian")),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register(
+    "signless_laplacian_spectral_radius",
+    lambda context: float(context.extreme_eigenvalues(1, kind="signless_laplacian")[0]),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register("LG_residue", _degree_sequence_invariant("residue", GraphContext.line_graph), cost="polynomial", context=True)
+register("LG_annihilation", _degree_sequence_invariant("annihilation_number", GraphContext.line_graph), cost="polynomial", context=True)
+register("LG_graph_energy", lambda context: graph_energy(context.line_graph()), cost="polynomial", context=True)
+register("LG_slater", _degree_sequence_invariant("slater", GraphContext.line_graph), cost="polynomial", context=True)
+register("square_residue", _degree_sequence_invariant("residue", lambda context: context.power(2)), cost="polynomial", context=True)
+register("square_annihilation", _degree_sequence_invariant("annihilation_number", lambda context: context.power(2)), cost="polynomial", context=True)
+register("square_zero_forcing_number", lambda context: zero_forcing_number(context.power(2)), cost="exponential", context=True)
+register("square_clique_number", lambda context: clique_number(context.power(2)), cost="exponential", context=True)
+register(
+    "outer_connected_domination_number",
+    _with_domination_number(outer_connected_domination_number),
+    cost="exponential",
+    depends=["domination_number"],
+    context=True,
+)
+register("square_chromatic_number", lambda context: chromatic_number(context.power(2)), cost="exponential", context=True)
+register("cubed_chromatic_number", lambda context: chromatic_number(context.power(3)), cost="exponential", context=True)
+register("cube_residue", _degree_sequence_invariant("residue", lambda context: context.power(3)), cost="polynomial", context=True)
+register("cube_annihilation", _degree_sequence_invariant("annihilation_number", lambda context: context.power(3)), cost="polynomial", context=True)
+register("power_2_residue_sum", _power_sum("residue", 2), cost="polynomial", context=True)
+register("power_3_residue_sum", _power_sum("residue", 3), cost="polynomial", context=True)
+register("power_2_annihilation_sum", _power_sum("annihilation_number", 2), cost="polynomial", context=True)
+register("power_3_annihilation_sum", _power_sum("annihilation_number", 3), cost="polynomial", context=True)
+register("power_max_degree_residue_sum", _power_sum("residue", "max_degree"), cost="polynomial", context=True)
+register("power_max_degree_annihilation_sum", _power_sum("annihilation_number", "max_degree"), cost="polynomial", context=True)
+register("power_min_degree_residue_sum", _power_sum("residue", "min_degree"), cost="polynomial", context=True)
+register("power_min_degree_annihilation_sum", _power_sum("annihilation_number", "min_degree"), cost="polynomial", context=True)
+register("residue_residue_power_sum", _power_sum("residue", "residue"), cost="polynomial", context=True)
+for name, function in [
+    ("roman_domination_number", roman_domination_number),
+    ("double_roman_domination_number", double_roman_domination_number),
+    ("two_rainbow_domination_number", two_rainbow_domination_number),
+    ("three_rainbow_domination_number", three_rainbow_domination_number),
+    ("restrained_domination_number", restrained_domination_number),
+]:
+    register(name, _with_domination_number(function), cost="exponential", depends=["domination_number"], context=True)
+register("strong_harmonic_index", _degree_index("strong_harmonic_index"), returns="float", cost="linear", context=True)
+register("reciprocal_first_zagreb_index", _degree_index("reciprocal_first_zagreb_index"), returns="float", cost="linear", context=True)
+register("reciprocal_second_zagreb_index", _degree_index("reciprocal_second_zagreb_index"), returns="float", cost="linear", context=True)
+register(
+    "reciprocal_harary_index",
+    lambda context: reciprocal_harary_index(context.graph_for(distance_matrix), context.distances()),
+    returns="float",
+    cost="polynomial",
+    context=True,
+)
+register("reciprocal_second_zagreb_variation", _degree_index("reciprocal_second_zagreb_variation"), returns="float", cost="linear", context=True)
+register("reciprocal_randic_index", _degree_index("reciprocal_randic_index"), returns="float", cost="linear", context=True)
+register("reciprocal_augmented_zagreb_index", _degree_index("reciprocal_augmented_zagreb_index"), returns="float", cost="linear", context=True)
+register("reciprocal_sum_connectivity_index", _degree_index("reciprocal_sum_connectivity_index"), returns="float", cost="linear", context=True)
+register("reciprocal_hyper_zagreb_index", _degree_index("reciprocal_hyper_zagreb_index"), returns="float", cost="linear", context=True)
+register("reciprocal_geometric_arithmetic_index", _degree_index("reciprocal_geometric_arithmetic_index"), returns="float", cost="linear", context=True)
+register("reciprocal_first_zagreb_index_2_degree", _degree_index("reciprocal_first_zagreb_index_2_degree"), returns="float", cost="polynomial", context=True)
+register("reciprocal_second_zagreb_index_2_degree", _degree_index("reciprocal_second_zagreb_index_2_degree"), returns="float", cost="polynomial", context=True)
+register("reciprocal_randic_index_2_degree", _degree_index("reciprocal_randic_index_2_degree"), returns="float", cost="polynomial", context=True)
+register("reciprocal_sum_connectivity_index_2_degree", _degree_index("reciprocal_sum_connectivity_index_2_degree"), returns="float", cost="polynomial", context=True)
+register("reciprocal_geometric_arithmetic_index_2_degree", _degree_index("reciprocal_geometric_arithmetic_index_2_degree"), returns="float", cost="polynomial", context=True)
+register("augmented_average_edge_degree", _degree_index("augmented_average_edge_degree"), returns="float", cost="linear", context=True)
+register("inverse_degree_plus_one_sum", _degree_index("inverse_degree_plus_one_sum"), returns="float", cost="linear", context=True)
+register("inverse_degree_plus_two_sum", _degree_index("inverse_degree_plus_two_sum"), returns="float", cost="linear", context=True)
+register("inverse_edge_degree_plus_one_sum", _degree_index("inverse_edge_degree_plus_one_sum"), returns="float", cost="linear", context=True)
+register("inverse_edge_degree_plus_two_sum", _degree_index("inverse_edge_degree_plus_two_sum"), returns="float", cost="linear", context=True)
+
+# Derived invariants that are not dataset columns.
+for left, right in [
+    ("order", "independence_number"),
+    ("size", "diameter"),
+    ("size", "radius"),
+    ("size", "triameter"),
+    ("size", "matching_number"),
+    ("size", "min_maximal_matching_number"),
+]:
+    register(f"({left} - {right})", _difference(left, right), depends=[left, right], listed=False, context=True)
+register(
+    "[(annihilation_number + residue)/ max_degree]",
+    lambda context: (context["annihilation_number"] + context["residue"]) / context["max_degree"],
+    returns="float",
+    depends=["annihilation_number", "residue", "max_degree"],
+    listed=False,
+    context=True,
+)
+for name, shift in [
+    ("[order/ max_degree]", 0),
+    ("[order/ (max_degree + 1)]", 1),
+    ("[order/ (max_degree - 1)]", -1),
+    ("[order/ (max_degree + 2)]", 2),
+]:
+    register(
+        name,
+        lambda context, shift=shift: context["order"] / (context["max_degree"] + shift),
+        returns="float",
+        depends=["order", "max_degree"],
+        listed=False,
+        context=True,
+    )
+
+# Properties (properties.txt). The compound hypotheses are conjunctions of shared atomic
+# predicates; see functions.hypotheses.
+for name, atoms in HYPOTHESES.items():
+    register(
+        name,
+        hypothesis(atoms),
+        returns="bool",
+        cost=hypothesis_cost(atoms),
+        depends=hypothesis_invariants(atoms),
+        context=True,
+    )
+register("a block graph", is_block_graph, returns="bool", cost="linear")
+register("a connected graph that is a line graph", is_line_graph_modified, returns="bool", cost="polynomial")
+
+# Properties that are not dataset columns.
+register(
+    "a connected graph with a total domination number equal to the domination number",
+    lambda context: context.is_connected() and context["total_domination_number"] == context["domination_number"],
+    returns="bool",
+    depends=["total_domination_number", "domination_number"],
+    listed=False,
+    context=True,
+)
+register(
+    "a connected and Class-1 graph",
+    lambda context: context.is_connected() and context["chromatic_index"] == context["max_degree"],
+    returns="bool",
+    cost="exponential",
+    listed=False,
+    context=True,
+)
+register(
+    "a connected and Class-2 graph",
+    lambda context: context.is_connected() and context["chromatic_index"] == context["max_degree"] + 1,
+    returns="bool",
+    cost="exponential",
+    listed=False,
+    context=True,
+)
@@ -0,0 +1,372 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import grinpy as gp
+import networkx as nx
+import pandas as pd
+from functions.canonical import graph_certificate
+from functions.corpus import read_graph
+from functions.degree_sequences import prime_degree_sequence_invariants
+from functions.graph_context import GraphContext, prime_spectra
+from functions.invariant_functions import SPECTRAL_INVARIANTS, compute, spectral_kinds
+from functions.registry import INVARIANTS
+
+__all__ = [
+    "STORE_FILE",
+    "BATCH_SIZE",
+    "invariant_version",
+    "InvariantStore",
+]
+
+STORE_FILE = "training-data/invariant-store.sqlite"
+
+# The number of edgelists read and prepared together by InvariantStore.add_edgelists.
+BATCH_SIZE = 256
+
+
+def _graph_payload(G):
+    # The vertices and edges of G as a JSON string, to store a representative graph.
+    nodes = sorted(str(v) for v in G.nodes())
+    edges = sorted(sorted((str(u), str(v))) for u, v in G.edges())
+    return json.dumps([nodes, edges])
+
+
+def _graph_from_payload(payload):
+    nodes, edges = json.loads(payload)
+    G = nx.Graph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    return G
+
+
+def _dependency_closure(name):
+    # The names of the registered invariants the invariant is computed from, directly or
+    # through other invariants, and the invariant itself.
+    closure = set()
+    pending = [name]
+    while pending:
+        current = pending.pop()
+        if current not in closure:
+            closure.add(current)
+            pending.extend(INVARIANTS[current].depends)
+    return closure
+
+
+def invariant_version(name):
+    """
+    Returns the version under which the values of the invariant with the given name are stored.
+
+    It is the implementation version of an invariant without dependencies. For a derived
+    invariant, such as "(order - domination_number)", it is a digest of the versions of the
+    invariant and of everything it is computed from, so that bumping the version of a
+    dependency also invalidates the stored values derived from it. Names that are not
+    registered are computed by grinpy and have version 0.
+    """
+    invariant = INVARIANTS.get(name)
+    if invariant is None:
+        return 0
+    if not invariant.depends:
+        return invariant.version
+    versions = ";".join(f"{other}:{INVARIANTS[other].version}" for other in sorted(_dependency_closure(name)))
+    # Seven bytes of the digest fit the signed 64-bit integers of SQLite.
+    return int.from_bytes(hashlib.sha256(versions.encode()).digest()[:7], "big")
+
+
+class InvariantStore:
+    """
+    A persistent store of computed invariants, keyed by (graph digest, invariant name, version).
+
+    Only the cells that are missing from the store are computed, so adding a graph or an
+    invariant to the dataset does not recompute the rest of it. Values stored for an older
+    version of an invariant are ignored and recomputed. The dataset is exported as a
+    dataframe or csv file on demand.
+
+    The digest of a graph identifies its isomorphism class (see graph_key), so isomorphic
+    graphs share their stored values whatever their names and vertex labels.
+
+    Parameters
+    ----------
+    file_path : string
+        The path to the SQLite file backing the store. It is created if it does not exist.
+
+    Examples
+    --------
+    >>> store = InvariantStore(":memory:")
+    >>> store.add_graph("petersen", gp.petersen_graph(), ["order", "domination_number"])
+    {'order': 10, 'domination_number': 3}
+    """
+    def __init__(self, file_path=STORE_FILE):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(file_path)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS graphs (name TEXT PRIMARY KEY, digest TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS graph_classes ("
+                "certificate TEXT NOT NULL, position INTEGER NOT NULL, graph TEXT NOT NULL, "
+                "PRIMARY KEY (certificate, position))"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS invariant_values ("
+                "digest TEXT NOT NULL, invariant TEXT NOT NULL, version INTEGER NOT NULL, value BLOB, "
+                "PRIMARY KEY (digest, invariant, version))"
+            )
+
+    def __repr__(self):
+        return f"InvariantStore({self.file_path!r})"
+
+    def close(self):
+        self.connection.close()
+
+    def graph_names(self):
+        """Returns the names of the graphs in the store, in the order they were added."""
+        rows = self.connection.execute("SELECT name FROM graphs ORDER BY rowid")
+        return [name for (name,) in rows]
+
+    def graph_key(self, G, add=True):
+        """
+        Returns the digest of the isomorphism class of the graph G.
+
+        Graphs are bucketed by functions.canonical.graph_certificate, and a representative of
+        every isomorphism class is stored. The digest is the certificate followed by the
+        position of the class in its bucket, found by an exact isomorphism test against the
+        representatives sharing the certificate.
+
+        Parameters
+        ----------
+        G : NetworkX graph
+            An undirected graph.
+        add : bool
+            If True, a graph of a new isomorphism class is stored as its representative;
+            otherwise None is returned for it.
+
+        Returns
+        -------
+        string or None
+            The digest of G.
+        """
+        certificate = graph_certificate(G)
+        rows = self.connection.execute(
+            "SELECT position, graph FROM graph_classes WHERE certificate = ? ORDER BY position", (certificate,)
+        ).fetchall()
+        for position, payload in rows:
+            if nx.is_isomorphic(G, _graph_from_payload(payload)):
+                return f"{certificate}-{position}"
+        if not add:
+            return None
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO graph_classes (certificate, position, graph) VALUES (?, ?, ?)",
+                (certificate, len(rows), _graph_payload(G)),
+            )
+        return f"{certificate}-{len(rows)}"
+
+    def index_edgelists(self, names=None, path="graph-edgelists"):
+        """
+        Adds the graphs of an edgelist directory to the store without computing any invariant.
+
+        Only the graphs whose names are not in the store yet are read and given a digest, so
+        the directory is read once, and a later call only reads the edgelists added since.
+        find_graph then matches a graph against all of them by one certificate lookup.
+
+        Parameters
+        ----------
+        names : list of strings
+            The names of the graphs to add. Defaults to every graph in the directory.
+        path : string
+            The path to the directory containing the graphs.
+
+        Returns
+        -------
+        list of strings
+            The names of the graphs that were added.
+        """
+        if names is None:
+            names = [name[:-4] for name in os.listdir(path)]
+        known = set(self.graph_names())
+        added = [name for name in names if name not in known]
+        rows = [(name, self.graph_key(read_graph(path, name))) for name in added]
+        with self.connection:
+            self.connection.executemany("INSERT INTO graphs (name, digest) VALUES (?, ?)", rows)
+        return added
+
+    def find_graph(self, G):
+        """Returns the names of the stored graphs isomorphic to G."""
+        digest = self.graph_key(G, add=False)
+        if digest is None:
+            return []
+        rows = self.connection.execute("SELECT name FROM graphs WHERE digest = ? ORDER BY rowid", (digest,))
+        return [name for (name,) in rows]
+
+    def stored_values(self, digest, invariants):
+        """Returns the stored values of the current versions of the invariants for a graph digest."""
+        values = {}
+        for invariant in invariants:
+            row = self.connection.execute(
+                "SELECT value FROM invariant_values WHERE digest = ? AND invariant = ? AND version = ?",
+                (digest, invariant, invariant_version(invariant)),
+            ).fetchone()
+            if row is not None:
+                values[invariant] = pickle.loads(row[0])
+        return values
+
+    def add_graph(self, name, G, invariants, ignore_errors=False, context=None):
+        """
+        Adds the graph G to the store and computes the invariants missing for it.
+
+        Values already stored for G are reused, including as the dependencies of derived
+        invariants such as "(order - domination_number)".
+
+        Parameters
+        ----------
+        name : string
+            The name of the graph G.
+        G : NetworkX graph
+            An undirected graph.
+        invariants : list of strings
+            The invariants and properties to be available for G.
+        ignore_errors : bool
+            If True, invariants that raise an error are reported and left missing instead
+            of stopping the computation. Missing values are retried on the next call.
+        context : GraphContext
+            A context of G whose cached objects, such as batched spectra, are reused.
+
+        Returns
+        -------
+        dict
+            The values of the invariants for G, keyed by name. Missing values are None.
+        """
+        context = GraphContext(G) if context is None else context
+        digest = context.cached(self.graph_key)
+        stored = {}
+        for invariant, version, value in self.connection.execute(
+            "SELECT invariant, version, value FROM invariant_values WHERE digest = ?", (digest,)
+        ):
+            if version == invariant_version(invariant):
+                stored[invariant] = pickle.loads(value)
+        context.values.update(stored)
+
+        new_values = []
+        for invariant in invariants:
+            if invariant in stored:
+                continue
+            try:
+                value = compute(context, invariant)
+            except Exception as e:
+                if not ignore_errors:
+                    raise
+                print(f"Error processing {invariant} for {name}: {e}")
+                continue
+            new_values.append((digest, invariant, invariant_version(invariant), pickle.dumps(value)))
+
+        with self.connection:
+            self.connection.execute(
+                "INSERT INTO graphs (name, digest) VALUES (?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET digest = excluded.digest",
+                (name, digest),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO invariant_values (digest, invariant, version, value) VALUES (?, ?, ?, ?)",
+                new_values,
+            )
+        return {invariant: context.values.get(invariant) for invariant in invariants}
+
+    def add_edgelists(self, invariants, names=None, path="graph-edgelists", ignore_errors=False):
+        """
+        Adds the graphs of an edgelist directory to the store and computes their missing invariants.
+
+        Each edgelist is read once, however many invariants are added. The graphs are read in
+        chunks of BATCH_SIZE, and the spectra needed by the spectral invariants and the
+        invariants of the degree sequences are computed for each chunk at once; see
+        functions.graph_context.prime_spectra and
+        functions.degree_sequences.prime_degree_sequence_invariants. The graphs are read from
+        the packed corpus of the directory when it is up to date; see functions.corpus.read_graph.
+
+        Parameters
+        ----------
+        invariants : list of strings
+            The invariants and properties to be available for the graphs.
+        names : list of strings
+            The names of the graphs to add. Defaults to every graph in the directory.
+        path : string
+            The path to the directory containing the graphs.
+        ignore_errors : bool
+            If True, invariants that raise an error are left missing.
+
+        Returns
+        -------
+        None
+        """
+        if names is None:
+            names = [name[:-4] for name in os.listdir(path)]
+        names = list(names)
+        kinds = spectral_kinds(invariants)
+        for start in range(0, len(names), BATCH_SIZE):
+            chunk = names[start:start + BATCH_SIZE]
+            contexts = [GraphContext(read_graph(path, name)) for name in chunk]
+            if kinds:
+                # Only the graphs with a spectral invariant left to compute need their spectra.
+                spectral = [invariant for invariant in invariants if invariant in SPECTRAL_INVARIANTS]
+                pending = [
+                    context for context in contexts
+                    if len(self.stored_values(context.cached(self.graph_key), spectral)) < len(spectral)
+                ]
+                prime_spectra(pending, kinds)
+            prime_degree_sequence_invariants(contexts, invariants)
+            for name, context in zip(chunk, contexts):
+                self.add_graph(name, context.graph, invariants, ignore_errors, context=context)
+        return None
+
+    def dataframe(self, invariants, names=None):
+        """
+        Returns a pandas dataframe of the stored invariants, indexed by graph name.
+
+        Parameters
+        ----------
+        invariants : list of strings
+            The columns of the dataframe.
+        names : list of strings
+            The graphs to include, in order. Defaults to every graph in the store.
+
+        Returns
+        -------
+        pandas dataframe
+            The stored values, with None for cells that have not been computed.
+        """
+        if names is None:
+            names = self.graph_names()
+        hashes = dict(self.connection.execute("SELECT name, digest FROM graphs"))
+        data = []
+        for name in names:
+            values = self.stored_values(hashes[name], invariants) if name in hashes else {}
+            row = {"name": name}
+            for invariant in invariants:
+                row[invariant] = values.get(invariant)
+            data.append(row)
+        df = pd.DataFrame(data, columns=["name"] + list(invariants))
+        df.set_index("name", inplace=True)
+        return df
+
+    def to_csv(self, file_path, invariants, names=None):
+        """Writes the stored invariants to a csv file in the layout of training-data/data.csv."""
+        self.dataframe(invariants, names).to_csv(file_path)
+        return None
+
+    def prune(self):
+        """Deletes the stored values of outdated invariant versions and of graphs no longer in the store."""
+        hashes = {digest for (digest,) in self.connection.execute("SELECT digest FROM graphs")}
+        stale = [
+            (digest, invariant, version)
+            for digest, invariant, version in self.connection.execute(
+                "SELECT digest, invariant, version FROM invariant_values"
+            )
+            if digest not in hashes or version != invariant_version(invariant)
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM invariant_values WHERE digest = ? AND invariant = ? AND version = ?", stale
+            )
+        return len(stale)
@@ -1,19 +1,252 @@
 from pulp import LpProblem, LpMinimize, LpMaximize, LpVariable, lpSum
 from fractions import Fraction
 from itertools import combinations
+from scipy.optimize import linprog
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from classes.conjecture import Hypothesis, MultiLinearConclusion, MultiLinearConjecture
+from functions.conjecture_evaluation import evaluate_conjectures
 
 __all__ = [
+    "LinearConjectureTemplate",
+    "set_sharp_graphs",
+    "single_invariant_bound",
     "make_upper_linear_conjecture",
     "make_lower_linear_conjecture",
     "make_upper_mip_linear_conjecture",
     "make_lower_mip_linear_conjecture",
     "make_upper_lower_mip_linear_conjecture",
+    "linear_conjecture_tasks",
+    "linear_conjecture_executor",
+    "solve_linear_conjectures",
     "make_all_upper_linear_conjectures",
     "make_all_lower_linear_conjectures",
     "make_all_mip_linear_conjectures",
 ]
 
+class LinearConjectureTemplate:
+    """
+    The linear programs of the upper and lower bound conjectures on one target and hypothesis.
+
+    The rows satisfying the hypothesis and the invariant columns are extracted from the
+    dataframe once, as NumPy arrays. Each call to upper or lower only swaps in the columns of
+    the given other invariants and solves the linear program in-process with the HiGHS solver
+    of SciPy, so no model files are written and no solver process is started.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe containing the data.
+    target : string
+        The name of the target variable.
+    hyp : string
+        The name of the hypothesis variable.
+    symbol : string
+        The symbol of the object in the conjecture.
+    """
+    def __init__(self, df, target, hyp="a connected graph", symbol="G"):
+        self.df = df[df[hyp] == True]
+        self.target = target
+        self.hyp = hyp
+        self.symbol = symbol
+        self.true_objects = self.df["name"].tolist()
+        self.Y = self.df[target].to_numpy(dtype=float)
+        self._columns = {}
+
+    def column(self, name):
+        """Returns the values of an invariant on the graphs satisfying the hypothesis."""
+        if name not in self._columns:
+            self._columns[name] = self.df[name].to_numpy(dtype=float)
+        return self._columns[name]
+
+    def extreme_rows(self, others, upper=True):
+        """
+        Returns a boolean mask of the rows whose target value is the maximum (or minimum, if
+        upper is False) among the rows with the same values of the other invariants.
+        """
+        X = np.column_stack([self.column(other) for other in others])
+        mask = np.zeros(len(self.Y), dtype=bool)
+        valid = np.isfinite(X).all(axis=1)
+        if not valid.any():
+            return mask
+        _, groups = np.unique(X[valid], axis=0, return_inverse=True)
+        groups = groups.ravel()
+        extreme = np.full(groups.max() + 1, -np.inf if upper else np.inf)
+        (np.fmax if upper else np.fmin).at(extreme, groups, self.Y[valid])
+        mask[valid] = self.Y[valid] == extreme[groups]
+        return mask
+
+    def solve(self, others, upper=True):
+        """
+        Returns the conjecture bounding the target by the other invariants, or None if the
+        linear program has no solution. Its touch number and sharp graphs are not computed;
+        see set_sharp_graphs.
+
+        For an upper bound the linear program is
+
+            minimize    sum_j (w . x_j + b - y_j)
+            subject to  w . x_j + b >= y_j  and  w . x_j - b >= 0  for every row j,
+
+        over the rows j attaining the maximum target for their values x_j of the other
+        invariants, with -4 <= w <= 4 and -3 <= b <= 3. The lower bound is the same program
+        maximized, with the inequality on y_j reversed, over the rows attaining the minimum.
+        """
+        mask = self.extreme_rows(others, upper)
+        X = np.column_stack([self.column(other) for other in others])[mask]
+        Y = self.Y[mask]
+        rows, k = X.shape
+
+        if k == 1 and rows:
+            solution = single_invariant_bound(X[:, 0], Y, upper)
+        else:
+            sign = 1 if upper else -1
+            ones = np.ones((rows, 1))
+            c = sign * np.append(X.sum(axis=0), rows)
+            A_ub = np.vstack([-sign * np.hstack([X, ones]), np.hstack([-X, ones])])
+            b_ub = np.concatenate([-sign * Y, np.zeros(rows)])
+            bounds = [(-4, 4)] * k + [(-3, 3)]
+            result = linprog(c, A_ub=A_ub if rows else None, b_ub=b_ub if rows else None, bounds=bounds, method="highs")
+            solution = result.x if result.status == 0 else None
+        if solution is None:
+            return None
+
+        # Extract the solution.
+        weights = [Fraction(w).limit_denominator(10) for w in solution[:k]]
+        b_value = Fraction(solution[k]).limit_denominator(10)
+
+        # Create the hypothesis and conclusion objects.
+        hypothesis = Hypothesis(self.hyp, true_object_set=self.true_objects)
+        conclusion = MultiLinearConclusion(self.target, "<=" if upper else ">=", weights, others, b_value)
+
+        return MultiLinearConjecture(hypothesis, conclusion, self.symbol)
+
+    def upper(self, others):
+        """Returns the upper bound conjecture on the target in terms of the other invariants."""
+        return self.solve(others, upper=True)
+
+    def lower(self, others):
+        """Returns the lower bound conjecture on the target in terms of the other invariants."""
+        return self.solve(others, upper=False)
+
+def set_sharp_graphs(conjectures, df):
+    """
+    Sets the touch number and the names of the sharp graphs of every conjecture.
+
+    All of the conjectures are evaluated together by
+    functions.conjecture_evaluation.evaluate_conjectures.
+
+    Parameters
+    ----------
+    conjectures : list of MultiLinearConjecture
+        The conjectures, changed in place.
+    df : pandas.DataFrame
+        The dataframe containing the data, with a "name" column.
+
+    Returns
+    -------
+    list
+        The conjectures.
+    """
+    _, sharp, touch = evaluate_conjectures(conjectures, df)
+    names = df["name"].to_numpy()
+    for conjecture, rows, count in zip(conjectures, sharp, touch):
+        conjecture.sharps = set(names[rows].tolist())
+        conjecture.touch = int(count)
+    return conjectures
+
+def _hull(points, upper=True):
+    """
+    Returns the upper (or lower) convex hull of points sorted by distinct x, from left to right.
+    """
+    sign = 1 if upper else -1
+    hull = []
+    for x, y in points:
+        while len(hull) >= 2:
+            (x1, y1), (x2, y2) = hull[-2], hull[-1]
+            if sign * ((x2 - x1) * (y - y1) - (y2 - y1) * (x - x1)) >= 0:
+                hull.pop()
+            else:
+                break
+        hull.append((x, y))
+    return hull
+
+def single_invariant_bound(x, y, upper=True, tolerance=1e-9):
+    """
+    Returns the optimal slope and intercept of the single-invariant bound program without
+    solving a linear program, or None if the program is infeasible.
+
+    The program is the one of LinearConjectureTemplate.solve with one other invariant: for an
+    upper bound, minimize sum_j (w * x_j + b - y_j) subject to w * x_j + b >= y_j,
+    w * x_j - b >= 0, -4 <= w <= 4 and -3 <= b <= 3. For a fixed slope w the best intercept
+    is the smallest feasible one, max(max_j (y_j - w * x_j), -3), and the maximum is attained
+    at a vertex of the upper convex hull of the points. The objective is then a convex
+    piecewise linear function of w alone, and its minimum is attained where two of the
+    pieces bounding b meet: at the slope of a hull edge, or where a hull vertex, the
+    constraint b <= w * x_j or the bounds on w and b become tight. Only those O(n)
+    candidate slopes are evaluated, after an O(n log n) hull computation.
+
+    The lower bound is the mirror image, with the lower hull and the largest feasible intercept.
+
+    Parameters
+    ----------
+    x : numpy array
+        The values of the other invariant on the extreme rows.
+    y : numpy array
+        The values of the target on the extreme rows.
+    upper : bool
+        True for an upper bound, False for a lower bound.
+    tolerance : float
+        The tolerance of the feasibility and optimality tests.
+
+    Returns
+    -------
+    tuple of floats
+        The slope w and intercept b, or None.
+    """
+    x_min, x_max = x.min(), x.max()
+    # The extreme rows have one y per distinct x (up to repeated rows), so the hull is
+    # computed on the distinct points.
+    points = sorted(set(zip(x.tolist(), y.tolist())))
+    hull = _hull(points, upper)
+
+    # Each piece bounding b is a line b = a * w + c.
+    hull_lines = [(-xj, yj) for xj, yj in hull]
+    other_lines = [(x_min, 0.0), (x_max, 0.0), (0.0, 3.0), (0.0, -3.0)]
+
+    def meet(first, second):
+        (a1, c1), (a2, c2) = first, second
+        if a1 != a2:
+            return (c2 - c1) / (a1 - a2)
+        return None
+
+    candidates = {-4.0, 4.0}
+    for first, second in zip(hull_lines, hull_lines[1:]):
+        candidates.add(meet(first, second))
+    for line in hull_lines + other_lines:
+        for other in other_lines:
+            candidates.add(meet(line, other))
+    # When several slopes are optimal the largest one is kept, which is also the vertex the
+    # HiGHS solver returns in almost every such case.
+    candidates = sorted((w for w in candidates if w is not None and -4 <= w <= 4), reverse=True)
+
+    # The envelope max_j (y_j - w * x_j) (or min_j) is attained on the hull vertices.
+    w = np.array(candidates)
+    hull_x, hull_y = np.array(hull).T
+    envelope = hull_y[None, :] - w[:, None] * hull_x[None, :]
+    ceiling = np.minimum(np.minimum(w * x_min, w * x_max), 3.0)
+    if upper:
+        b = np.maximum(envelope.max(axis=1), -3.0)
+        feasible = b <= ceiling + tolerance
+        values = x.sum() * w + len(x) * b
+    else:
+        b = np.minimum(envelope.min(axis=1), ceiling)
+        feasible = b >= -3.0 - tolerance
+        values = -(x.sum() * w + len(x) * b)
+    if not feasible.any():
+        return None
+    best = np.flatnonzero(feasible & (values <= values[feasible].min() + tolerance))[0]
+    return np.array([w[best], b[best]])
+
 def make_upper_linear_conjecture(
         df,
         target,
@@ -41,60 +274,13 @@ def make_upper_linear_conjecture(
     Returns
     -------
     LinearConjecture
-        The conjecture with the given hypothesis, target, and k other variables.
+        The conjecture with the given hypothesis, target, and k other variables, or None
+        if the linear program has no solution.
     """
-
-    # Filter data for the hypothesis condition.
-    df = df[df[hyp] == True]
-
-    # Get the names of each row in the dataframe.
-    true_objects = df["name"].tolist()
-
-    # df = df.groupby(others, as_index=False)[target].max()
-    # Compute the maximum for each group and compare with the target column
-    df['max_target'] = df.groupby(others)[target].transform('max')
-
-    # Filter rows where the target value is equal to the group max
-    df = df[df[target] == df['max_target']]
-
-    # Extract the data from the dataframe for each 'other' variable and the target variable.
-    Xs = [df[other].tolist() for other in others]  # List of lists, one list for each variable
-    Y = df[target].tolist()   # List of values for the target variable
-
-    # Initialize the LP problem.
-    prob = LpProblem("Test_Problem", LpMinimize)
-
-    # Initialize the variables for the LP, one for each "other" variable.
-    ws = [LpVariable(f"w{i+1}", upBound=4, lowBound=-4) for i in range(len(others))]  # List of weight variables (w1, w2, ..., wk)
-    b = LpVariable("b", upBound=3, lowBound=-3)
-
-    # Define the objective function.
-    prob += lpSum([lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) + b - Y[j] for j in range(len(Y))])
-
-    # Define the LP constraints.
-    for j in range(len(Y)):
-        prob += lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) + b >= Y[j]
-        prob += lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) - b >= 0.0
-
-    # Solve the LP.
-    prob.solve()
-
-    # Extract the solution.
-    weights = [Fraction(w.varValue).limit_denominator(10) for w in ws]
-    b_value = Fraction(b.varValue).limit_denominator(10)
-
-    # Compute the number of instances of equality - the touch number of the conjecture.
-    touch_set = set([true_objects[j] for j in range(len(Y))
-                if Y[j] == sum(weights[i] * Xs[i][j] for i in range(len(others))) + b_value])
-
-    touch = len(touch_set)
-
-    # Create the hypothesis and conclusion objects.
-    hypothesis = Hypothesis(hyp, true_object_set=true_objects)
-    conclusion = MultiLinearConclusion(target, "<=", weights, others, b_value)
-
-    # Return the full conjecture object (not the conclusion directly).
-    return MultiLinearConjecture(hypothesis, conclusion, symbol, touch, touch_set)
+    conjecture = LinearConjectureTemplate(df, target, hyp, symbol).upper(others)
+    if conjecture is not None:
+        set_sharp_graphs([conjecture], df)
+    return conjecture
 
 from pulp import *
 
@@ -173,59 +359,13 @@ def make_lower_linear_conjecture(
     Returns
     -------
     LinearConjecture
-        The conjecture with the given hypothesis, target, and k other variables.
+        The conjecture with the given hypothesis, target, and k other variables, or None
+        if the linear program has no solution.
     """
-
-    # Filter data for the hypothesis condition.
-    df = df[df[hyp] == True]
-
-    # Get the names of each row in the dataframe.
-    true_objects = df["name"].tolist()
-
-    # Compute the maximum for each group and compare with the target column
-    df['min_target'] = df.groupby(others)[target].transform('min')
-
-    # Filter rows where the target value is equal to the group max
-    df = df[df[target] == df['min_target']]
-
-    # Extract the data from the dataframe for each 'other' variable and the target variable.
-    Xs = [df[other].tolist() for other in others]  # List of lists, one list for each variable
-    Y = df[target].tolist()   # List of values for the target variable
-
-    # Initialize the LP problem.
-    prob = LpProblem("Test_Problem", LpMaximize)
-
-    # Initialize the variables for the LP, one for each "other" variable.
-    ws = [LpVariable(f"w{i+1}", upBound=4, lowBound=-4) for i in range(len(others))]  # List of weight variables (w1, w2, ..., wk)
-    b = LpVariable("b", upBound=3, lowBound=-3)  # Intercept
-
-    # Define the objective function.
-    prob += lpSum([lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) + b - Y[j] for j in range(len(Y))])
-
-    # Define the LP constraints.
-    for j in range(len(Y)):
-        prob += lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) + b <= Y[j]
-        prob += lpSum([ws[i] * Xs[i][j] for i in range(len(others))]) - b >= 0.0
-
-    # Solve the LP.
-    prob.solve()
-
-    # Extract the solution.
-    weights = [Fraction(w.varValue).limit_denominator(10) for w in ws]
-    b_value = Fraction(b.varValue).limit_denominator(10)
-
-    # Compute the number of instances of equality - the touch number of the conjecture.
-    touch_set = set([true_objects[j] for j in range(len(Y))
-                if Y[j] == sum(weights[i] * Xs[i][j] for i in range(len(others))) + b_value])
-
-    touch = len(touch_set)
-
-    # Create the hypothesis and conclusion objects.
-    hypothesis = Hypothesis(hyp, true_object_set=true_objects)
-    conclusion = MultiLinearConclusion(target, ">=", weights, others, b_value)
-
-    # Return the full conjecture object (not the conclusion directly).
-    return MultiLinearConjecture(hypothesis, conclusion, symbol, touch, touch_set)
+    conjecture = LinearConjectureTemplate(df, target, hyp, symbol).lower(others)
+    if conjecture is not None:
+        set_sharp_graphs([conjecture], df)
+    return conjecture
 
 def make_lower_mip_linear_conjecture(
         df,
@@ -491,6 +631,129 @@ def make_upper_lower_mip_linear_conjecture(
 
 
 
+def linear_conjecture_tasks(target, others, properties, upper=True, pairs=True):
+    """
+    Returns the linear programs solved by make_all_upper_linear_conjectures (or, if upper is
+    False, make_all_lower_linear_conjectures), in the order they are solved.
+
+    Parameters
+    ----------
+    target : string
+        The name of the target variable.
+    others : list of strings
+        The list of invariant names to consider for generating conjectures.
+    properties : list of strings
+        The list of boolean properties (hypotheses) to filter the dataset.
+    upper : bool
+        True for upper bounds, False for lower bounds.
+    pairs : bool
+        Whether to include the bounds in terms of two invariants.
+
+    Returns
+    -------
+    list of tuples
+        The tasks (others, property, upper), one per linear program.
+    """
+    tasks = []
+    for invariant in others:
+        if invariant != target:
+            for prop in properties:
+                tasks.append(([invariant], prop, upper))
+    if pairs:
+        for other1, other2 in combinations(others, 2):
+            for prop in properties:
+                # Ensure that neither of the 'other' invariants is equal to the target
+                if other1 != target and other2 != target:
+                    tasks.append(([other1, other2], prop, upper))
+    return tasks
+
+# The dataframe and templates of a worker process of a linear_conjecture_executor.
+_worker_df = None
+_worker_templates = {}
+
+def _initialize_worker(df):
+    global _worker_df
+    _worker_df = df
+    _worker_templates.clear()
+
+def _solve_task(target, others, prop, upper):
+    if (target, prop) not in _worker_templates:
+        _worker_templates[(target, prop)] = LinearConjectureTemplate(_worker_df, target, prop)
+    return _worker_templates[(target, prop)].solve(others, upper)
+
+def linear_conjecture_executor(df, workers=None):
+    """
+    Returns a process pool whose workers hold a copy of df, for solve_linear_conjectures.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe containing the data.
+    workers : int
+        The number of worker processes. Defaults to the number of processors.
+
+    Returns
+    -------
+    concurrent.futures.ProcessPoolExecutor
+        The process pool.
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker, initargs=(df,))
+
+def solve_linear_conjectures(df, target, tasks, executor=None, chunksize=1, progress=None):
+    """
+    Solves the linear programs of a list of tasks, serially or on a process pool.
+
+    The conjectures are returned in the order of the tasks either way, so the result does not
+    depend on the number of workers.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe containing the data.
+    target : string
+        The name of the target variable.
+    tasks : list of tuples
+        The tasks (others, property, upper), as returned by linear_conjecture_tasks.
+    executor : concurrent.futures.ProcessPoolExecutor
+        A pool made by linear_conjecture_executor(df). If None, the tasks are solved in this process.
+    chunksize : int
+        The number of tasks sent to a worker at a time.
+    progress : callable
+        If given, called as progress(done, total) after each solved program.
+
+    Returns
+    -------
+    list
+        The MultiLinearConjecture objects, skipping the programs that have no solution. Their
+        touch numbers and sharp graphs are evaluated together once all programs are solved.
+    """
+    if executor is None:
+        templates = {}
+
+        def solutions():
+            for others, prop, upper in tasks:
+                if prop not in templates:
+                    templates[prop] = LinearConjectureTemplate(df, target, prop)
+                yield templates[prop].solve(others, upper)
+        results = solutions()
+    else:
+        results = executor.map(
+            _solve_task,
+            [target] * len(tasks),
+            [others for others, _, _ in tasks],
+            [prop for _, prop, _ in tasks],
+            [upper for _, _, upper in tasks],
+            chunksize=chunksize,
+        )
+
+    conjectures = []
+    for done, conjecture in enumerate(results, start=1):
+        if conjecture is not None:
+            conjectures.append(conjecture)
+        if progress is not None:
+            progress(done, len(tasks))
+    return set_sharp_graphs(conjectures, df)
+
 def make_all_upper_linear_conjectures(df, target, others, properties):
     """
     Generates upper bound conjectures for all combinations of two invariants in the dataset.
@@ -511,43 +774,13 @@ def make_all_upper_linear_conjectures(df, target, others, properties):
     list
         A list of LinearConjecture objects representing the conjectures.
     """
-
-    # Create conjectures for every pair of invariants in 'others' combined with each property
-    conjectures = []
-
-    # Iterate over all combinations of two invariants from 'others'
-    for invariant in others:
-        if invariant != target:
-            for prop in properties:
-                conjecture = make_upper_linear_conjecture(df, target, [invariant], hyp=prop)
-                conjectures.append(conjecture)
-    for other1, other2 in combinations(others, 2):
-        for prop in properties:
-            # Ensure that neither of the 'other' invariants is equal to the target
-            if other1 != target and other2 != target:
-                # Generate the conjecture for this combination of two invariants
-                conjecture = make_upper_linear_conjecture(df, target, [other1, other2], hyp=prop)
-                conjectures.append(conjecture)
-    return conjectures
+    tasks = linear_conjecture_tasks(target, others, properties, upper=True)
+    return solve_linear_conjectures(df, target, tasks)
 
 def make_all_lower_linear_conjectures(df, target, others, properties):
-    # Create conjectures for every pair of invariants in 'others' combined with each property
-    conjectures = []
-
-    # Iterate over all combinations of two invariants from 'others'
-    for invariant in others:
-        if invariant != target:
-            for prop in properties:
-                conjecture = make_lower_linear_conjecture(df, target, [invariant], hyp=prop)
-                conjectures.append(conjecture)
-    for other1, other2 in combinations(others, 2):
-        for prop in properties:
-            # Ensure that neither of the 'other' invariants is equal to the target
-            if other1 != target and other2 != target:
-                # Generate the conjecture for this combination of two invariants
-                conjecture = make_lower_linear_conjecture(df, target, [other1, other2], hyp=prop)
-
-    return conjectures
+    # The bounds in terms of two invariants are not used for lower bounds.
+    tasks = linear_conjecture_tasks(target, others, properties, upper=False, pairs=False)
+    return solve_linear_conjectures(df, target, tasks)
 
 
 def make_all_mip_linear_conjectures(df, target, others, properties):
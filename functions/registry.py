@@ -0,0 +1,156 @@
+__all__ = [
+    "Invariant",
+    "INVARIANTS",
+    "COST_CLASSES",
+    "register",
+    "get_invariant",
+    "registered_names",
+    "write_invariant_lists",
+]
+
+# Cost classes, ordered from cheapest to most expensive.
+COST_CLASSES = ["linear", "polynomial", "exponential"]
+
+# Maps the name of every registered invariant and property to its Invariant record.
+INVARIANTS = {}
+
+
+class Invariant:
+    """
+    A registered graph invariant or graph property.
+
+    Attributes
+    ----------
+    name : string
+        The name of the invariant, as used for the column in the dataset.
+    function : callable
+        A function taking a NetworkX graph, or a GraphContext if context is True, and
+        returning the value of the invariant.
+    returns : string
+        The type of the returned value, one of "int", "float" or "bool".
+    cost : string
+        The cost class of the invariant, one of the entries of COST_CLASSES.
+    depends : tuple of strings
+        The names of the registered invariants this invariant is computed from.
+    polynomial : bool
+        True if the invariant is computable in polynomial time.
+    listed : bool
+        True if the invariant is written to the invariant and property lists in functions/.
+    context : bool
+        True if the function takes a GraphContext instead of a NetworkX graph.
+    version : int
+        The version of the implementation. Stored values of an older version are recomputed.
+    """
+    def __init__(self, name, function, returns="int", cost="polynomial", depends=(), polynomial=None, listed=True, context=False, version=1):
+        self.name = name
+        self.function = function
+        self.returns = returns
+        self.cost = cost
+        self.depends = tuple(depends)
+        self.polynomial = cost != "exponential" if polynomial is None else polynomial
+        self.listed = listed
+        self.context = context
+        self.version = version
+
+    def __repr__(self):
+        return f"Invariant({self.name!r}, returns={self.returns!r}, cost={self.cost!r})"
+
+
+def register(name, function, returns="int", cost=None, depends=(), polynomial=None, listed=True, context=False, version=1):
+    """
+    Registers a graph invariant or property under the given name.
+
+    If no cost class is given, the cost of the invariant is the cost of its most expensive
+    dependency, and it is polynomial only when all of its dependencies are.
+
+    Parameters
+    ----------
+    name : string
+        The name of the invariant.
+    function : callable
+        A function taking a NetworkX graph, or a GraphContext if context is True, and
+        returning the value of the invariant.
+    returns : string
+        The type of the returned value, one of "int", "float" or "bool".
+    cost : string
+        The cost class of the invariant.
+    depends : list of strings
+        The names of the registered invariants this invariant is computed from.
+    polynomial : bool
+        Whether the invariant is computable in polynomial time.
+    listed : bool
+        Whether the invariant is written to the invariant and property lists.
+    context : bool
+        Whether the function takes a GraphContext instead of a NetworkX graph.
+    version : int
+        The version of the implementation. Bump it whenever the function changes its
+        values, so that results kept in an InvariantStore are recomputed, along with the
+        results of the invariants derived from it.
+
+    Returns
+    -------
+    Invariant
+        The registered invariant.
+    """
+    dependencies = [INVARIANTS[dependency] for dependency in depends]
+    if cost is None:
+        cost = max((d.cost for d in dependencies), key=COST_CLASSES.index, default="polynomial")
+    if polynomial is None and dependencies:
+        polynomial = all(d.polynomial for d in dependencies) and cost != "exponential"
+    if cost not in COST_CLASSES:
+        raise ValueError(f"Unknown cost class {cost!r} for {name!r}.")
+    invariant = Invariant(name, function, returns, cost, depends, polynomial, listed, context, version)
+    INVARIANTS[name] = invariant
+    return invariant
+
+
+def get_invariant(name):
+    """
+    Returns the registered invariant with the given name, or None if there is none.
+    """
+    return INVARIANTS.get(name)
+
+
+def registered_names(returns=None, polynomial=None, listed=None):
+    """
+    Returns the names of the registered invariants, in registration order.
+
+    Parameters
+    ----------
+    returns : string or list of strings
+        Only keep invariants whose return type is (one of) the given type(s).
+    polynomial : bool
+        Only keep invariants that are (or are not) computable in polynomial time.
+    listed : bool
+        Only keep invariants that are (or are not) written to the lists.
+
+    Returns
+    -------
+    list of strings
+        The names of the matching invariants.
+    """
+    if isinstance(returns, str):
+        returns = [returns]
+    return [
+        name for name, invariant in INVARIANTS.items()
+        if (returns is None or invariant.returns in returns)
+        and (polynomial is None or invariant.polynomial == polynomial)
+        and (listed is None or invariant.listed == listed)
+    ]
+
+
+def write_invariant_lists(path="functions"):
+    """
+    Writes invariants.txt and properties.txt from the registry.
+
+    computable_invariants.txt, the curated default of the conjecture pages, is maintained by
+    hand and is not written.
+    """
+    lists = {
+        "invariants.txt": registered_names(returns=["int", "float"], listed=True),
+        "properties.txt": registered_names(returns="bool", listed=True),
+    }
+    for file_name, names in lists.items():
+        with open(f"{path}/{file_name}", "w") as f:
+            f.write("\n".join(names))
+    return None
@@ -0,0 +1,171 @@
+import networkx as nx
+import numpy as np
+from scipy.sparse import diags
+from scipy.sparse.linalg import eigsh
+from functions.bitsets import BitsetGraph, accepts_bitset_graph
+
+__all__ = [
+    "SPECTRAL_MATRICES",
+    "DENSE_ORDER",
+    "spectral_matrix",
+    "spectrum",
+    "batched_spectra",
+    "extreme_eigenvalues",
+]
+
+# The symmetric matrices of a graph whose spectra are computed: A, the Laplacian D - A and the
+# signless Laplacian D + A.
+SPECTRAL_MATRICES = ["adjacency", "laplacian", "signless_laplacian"]
+
+# Graphs up to this order get their whole spectrum from the dense symmetric solver. Above it,
+# invariants that only need a few extreme eigenvalues use the sparse Lanczos solver instead.
+DENSE_ORDER = 400
+
+
+def spectral_matrix(G, kind="adjacency", sparse=False):
+    """
+    Returns a symmetric matrix of the graph G.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+    kind : string
+        One of SPECTRAL_MATRICES.
+    sparse : bool
+        If True, a scipy sparse matrix is returned instead of a dense numpy array.
+
+    Returns
+    -------
+    numpy array or scipy sparse matrix
+        The matrix, with rows and columns in the order of G.nodes().
+    """
+    if kind not in SPECTRAL_MATRICES:
+        raise ValueError(f"Unknown matrix {kind!r}; expected one of {SPECTRAL_MATRICES}.")
+    if isinstance(G, BitsetGraph):
+        # The adjacency of a BitsetGraph has no loops and no weights.
+        A = G.adjacency_matrix(dtype=float)
+        if not sparse:
+            A = A.toarray()
+    elif sparse:
+        A = nx.to_scipy_sparse_array(G, weight=None, format="csr", dtype=float)
+        A.setdiag(0)
+        A.eliminate_zeros()
+        A.data[:] = 1
+    else:
+        A = nx.to_numpy_array(G, weight=None)
+        np.fill_diagonal(A, 0)
+    if sparse:
+        if kind == "adjacency":
+            return A
+        D = diags(np.asarray(A.sum(axis=1)).reshape(-1), format="csr")
+        return D - A if kind == "laplacian" else D + A
+    if kind == "adjacency":
+        return A
+    degrees = A.sum(axis=1)
+    M = A if kind == "signless_laplacian" else -A
+    M[np.diag_indices_from(M)] = degrees
+    return M
+
+
+@accepts_bitset_graph
+def spectrum(G, kind="adjacency"):
+    """
+    Returns the eigenvalues of a symmetric matrix of the graph G, in ascending order.
+
+    The matrices of a graph are real and symmetric, so the eigenvalues are computed by the
+    symmetric solver numpy.linalg.eigvalsh, which is faster than the general one and returns
+    real eigenvalues.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+    kind : string
+        One of SPECTRAL_MATRICES.
+
+    Returns
+    -------
+    numpy array
+        The eigenvalues, in ascending order.
+    """
+    if G.number_of_nodes() == 0:
+        return np.zeros(0)
+    return np.linalg.eigvalsh(spectral_matrix(G, kind))
+
+
+def batched_spectra(graphs, kind="adjacency"):
+    """
+    Returns the spectra of a list of graphs, solving the graphs of equal order together.
+
+    The matrices of the graphs of each order are stacked into one array and passed to a
+    single call of numpy.linalg.eigvalsh, which removes the per-call overhead that dominates
+    for the small graphs of the dataset.
+
+    Parameters
+    ----------
+    graphs : list of NetworkX graphs or BitsetGraphs
+        Undirected graphs.
+    kind : string
+        One of SPECTRAL_MATRICES.
+
+    Returns
+    -------
+    list of numpy arrays
+        The spectrum of every graph, in ascending order, in the order of graphs.
+    """
+    spectra = [None] * len(graphs)
+    by_order = {}
+    for i, G in enumerate(graphs):
+        by_order.setdefault(G.number_of_nodes(), []).append(i)
+    for order, indices in by_order.items():
+        if order == 0:
+            for i in indices:
+                spectra[i] = np.zeros(0)
+            continue
+        stacked = np.stack([spectral_matrix(graphs[i], kind) for i in indices])
+        for i, values in zip(indices, np.linalg.eigvalsh(stacked)):
+            spectra[i] = values
+    return spectra
+
+
+@accepts_bitset_graph
+def extreme_eigenvalues(G, k, largest=True, kind="adjacency"):
+    """
+    Returns the k largest or k smallest eigenvalues of a symmetric matrix of the graph G.
+
+    Graphs of order at most DENSE_ORDER use the full spectrum. Larger graphs use the sparse
+    solver scipy.sparse.linalg.eigsh, which only computes the requested eigenvalues.
+
+    Parameters
+    ----------
+    G : NetworkX graph or BitsetGraph
+        An undirected graph.
+    k : int
+        The number of eigenvalues.
+    largest : bool
+        If True, the largest eigenvalues are returned, in descending order; otherwise the
+        smallest ones, in ascending order.
+    kind : string
+        One of SPECTRAL_MATRICES.
+
+    Returns
+    -------
+    numpy array
+        The eigenvalues, at most the order of G of them.
+    """
+    n = G.number_of_nodes()
+    if n <= DENSE_ORDER or k >= n - 1:
+        values = spectrum(G, kind)
+        return values[::-1][:k] if largest else values[:k]
+    M = spectral_matrix(G, kind, sparse=True)
+    if largest:
+        values = eigsh(M, k, which="LA", return_eigenvectors=False)
+        return np.sort(values)[::-1]
+    if kind == "adjacency":
+        values = eigsh(M, k, which="SA", return_eigenvectors=False)
+    else:
+        # The Laplacians are positive semidefinite, so shift-invert around -1 finds the
+        # eigenvalues nearest 0 on a well-conditioned factorization.
+        values = eigsh(M, k, sigma=-1, which="LM", return_eigenvectors=False)
+    return np.sort(values)
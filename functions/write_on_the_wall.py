@@ -11,6 +11,9 @@ from functions import (
     make_more_general_conjectures,
     make_all_mip_linear_conjectures,
     make_upper_lower_mip_linear_conjecture,
+    linear_conjecture_tasks,
+    linear_conjecture_executor,
+    solve_linear_conjectures,
 )
 
 from functions import (
@@ -22,6 +25,7 @@ from functions import (
 __all__ = [
     "write_on_the_wall",
     "write_on_the_wall_with_mip",
+    "write_on_the_wall_by_target",
 ]
 
 DOUBLE_INVARIANTS = [
@@ -50,6 +54,25 @@ DOUBLE_INVARIANTS = [
 ]
 
 
+def _bound_tasks(target, numerical_columns, boolean_columns, upper, type_two_conjectures):
+    # The linear programs of one bound direction, in the order write_on_the_wall uses them.
+    tasks = []
+    for other in numerical_columns:
+        if other != target:
+            tasks += linear_conjecture_tasks(target, [other], boolean_columns, upper)
+    if type_two_conjectures and len(boolean_columns) <= 3:
+        new_numerical_columns = [column for column in numerical_columns if column not in DOUBLE_INVARIANTS]
+        # The bounds in terms of two invariants are only kept for upper bounds.
+        tasks += linear_conjecture_tasks(target, new_numerical_columns, boolean_columns, upper, pairs=upper)
+    return tasks
+
+def _mip_others(target, numerical_columns, boolean_columns, type_two_conjectures):
+    # The other invariants of the programs of write_on_the_wall_with_mip, in order.
+    others = [other for other in numerical_columns if other != target]
+    if type_two_conjectures and len(boolean_columns) <= 3:
+        others += [column for column in numerical_columns if column not in DOUBLE_INVARIANTS]
+    return others
+
 def write_on_the_wall(
         df,
         target,
@@ -61,30 +84,43 @@ def write_on_the_wall(
         make_upper_conjectures=True,
         make_lower_conjectures=True,
         type_two_conjectures=False,
+        workers=None,
+        progress=None,
+        executor=None,
     ):
+    """
+    Returns the conjectures on the target invariant that survive the filters and heuristics.
+
+    If workers is more than 1, the linear programs of all candidate conjectures are solved on a
+    pool of that many processes. The candidates are merged in the serial order, so the
+    conjectures are the same as with a serial run. A pool made by linear_conjecture_executor(df)
+    can be passed as executor to reuse it across calls.
+
+    If progress is given, it is called as progress(done, total) after each linear program.
+    """
 
     # if "a connected graph" not in boolean_columns:
     #     boolean_columns.append("a connected graph")
 
+    upper_tasks = _bound_tasks(target, numerical_columns, boolean_columns, True, type_two_conjectures) if make_upper_conjectures else []
+    lower_tasks = _bound_tasks(target, numerical_columns, boolean_columns, False, type_two_conjectures) if make_lower_conjectures else []
+    tasks = upper_tasks + lower_tasks
+    chunksize = max(1, len(tasks) // (4 * workers)) if workers else 1
+    if executor is not None:
+        candidates = solve_linear_conjectures(df, target, tasks, executor, chunksize, progress)
+    elif workers is not None and workers > 1:
+        with linear_conjecture_executor(df, workers) as executor:
+            candidates = solve_linear_conjectures(df, target, tasks, executor, chunksize, progress)
+    else:
+        candidates = solve_linear_conjectures(df, target, tasks, progress=progress)
+    candidate_upper_conjectures = [conj for conj in candidates if conj.conclusion.inequality == "<="]
+    candidate_lower_conjectures = [conj for conj in candidates if conj.conclusion.inequality == ">="]
+
     # # print(numerical_columns)
     upper_conjectures = []
     if make_upper_conjectures:
-        for other in numerical_columns:
-            if other != target:
-                upper_conjectures += make_all_upper_linear_conjectures(
-                    df,
-                    target,
-                    [other],
-                    boolean_columns,
-                )
+        upper_conjectures = candidate_upper_conjectures
         if type_two_conjectures and len(boolean_columns) <= 3:
-            new_numerical_columns = [column for column in numerical_columns if column not in DOUBLE_INVARIANTS]
-            upper_conjectures += make_all_upper_linear_conjectures(
-                    df,
-                    target,
-                    new_numerical_columns,
-                    boolean_columns,
-                )
             upper_conjectures = [conj for conj in upper_conjectures if conj.conclusion.slopes != [0, 0]]
             filtered_conjectures = [upper_conjectures[0]]
             for conj in upper_conjectures[1:]:
@@ -106,22 +142,8 @@ def write_on_the_wall(
 
     lower_conjectures = []
     if make_lower_conjectures:
-        for other in numerical_columns:
-            if other != target:
-                lower_conjectures += make_all_lower_linear_conjectures(
-                    df,
-                    target,
-                    [other],
-                    boolean_columns,
-                )
+        lower_conjectures = candidate_lower_conjectures
         if type_two_conjectures and len(boolean_columns) <= 3:
-            new_numerical_columns = [column for column in numerical_columns if column not in DOUBLE_INVARIANTS]
-            lower_conjectures += make_all_lower_linear_conjectures(
-                    df,
-                    target,
-                    new_numerical_columns,
-                    boolean_columns,
-                )
             lower_conjectures = [conj for conj in lower_conjectures if conj.conclusion.slopes != [0, 0]]
             filtered_conjectures = [lower_conjectures[0]]
             for conj in lower_conjectures[1:]:
@@ -155,32 +177,27 @@ def write_on_the_wall_with_mip(
         known_conjectures=[],
         use_strong_dalmatian=False,
         type_two_conjectures=False,
+        progress=None,
     ):
 
     upper_conjectures = []
     lower_conjectures = []
     equal_conjectures = []
 
-    for other in numerical_columns:
-        if other != target:
-            for prop in boolean_columns:
-                upper_conj, lower_conj = make_upper_lower_mip_linear_conjecture(df, target, [other], hyp=prop)
-                if lower_conj:
-                    upper_conjectures.append(upper_conj)
-                    lower_conjectures.append(lower_conj)
-                else:
-                    equal_conjectures.append(upper_conj)
-
-    if type_two_conjectures and len(boolean_columns) <= 3:
-        new_numerical_columns = [column for column in numerical_columns if column not in DOUBLE_INVARIANTS]
-        for other in new_numerical_columns:
-            for prop in boolean_columns:
-                upper_conj, lower_conj = make_upper_lower_mip_linear_conjecture(df, target, [other], hyp=prop)
-                if lower_conj:
-                    upper_conjectures.append(upper_conj)
-                    lower_conjectures.append(lower_conj)
-                else:
-                    equal_conjectures.append(upper_conj)
+    others = _mip_others(target, numerical_columns, boolean_columns, type_two_conjectures)
+    total = len(others) * len(boolean_columns)
+    done = 0
+    for other in others:
+        for prop in boolean_columns:
+            upper_conj, lower_conj = make_upper_lower_mip_linear_conjecture(df, target, [other], hyp=prop)
+            if lower_conj:
+                upper_conjectures.append(upper_conj)
+                lower_conjectures.append(lower_conj)
+            else:
+                equal_conjectures.append(upper_conj)
+            done += 1
+            if progress is not None:
+                progress(done, total)
 
     upper_conjectures = filter_false_conjectures(upper_conjectures, df)
     lower_conjectures = filter_false_conjectures(lower_conjectures, df)
@@ -222,4 +239,85 @@ def write_on_the_wall_with_mip(
     if conjectures != []:
         conjectures = sort_conjectures(conjectures, filter_touch=2)
     print(conjectures)
-    return conjectures
\ No newline at end of file
+    return conjectures
+
+
+def write_on_the_wall_by_target(
+        df,
+        targets,
+        numerical_columns,
+        boolean_columns,
+        use_mip=False,
+        workers=None,
+        progress=None,
+        **options,
+    ):
+    """
+    Writes the conjectures on several targets, yielding them as each target finishes.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The dataframe containing the data.
+    targets : list of strings
+        The target invariants, in the order they are conjectured on.
+    numerical_columns : list of strings
+        The invariants the targets are bounded by.
+    boolean_columns : list of strings
+        The hypotheses of the conjectures.
+    use_mip : bool
+        If True, the conjectures are written by write_on_the_wall_with_mip.
+    workers : int
+        The number of processes solving the linear programs of write_on_the_wall. One pool
+        is shared by all of the targets.
+    progress : callable
+        If given, called as progress(done, total) after each linear program, where total is
+        the number of linear programs of all the targets together.
+    **options
+        The other keyword arguments of write_on_the_wall or write_on_the_wall_with_mip.
+
+    Yields
+    ------
+    tuple
+        The target and the list of its conjectures.
+    """
+    type_two_conjectures = options.get("type_two_conjectures", False)
+    counts = []
+    for target in targets:
+        if use_mip:
+            others = _mip_others(target, numerical_columns, boolean_columns, type_two_conjectures)
+            counts.append(len(others) * len(boolean_columns))
+        else:
+            count = 0
+            if options.get("make_upper_conjectures", True):
+                count += len(_bound_tasks(target, numerical_columns, boolean_columns, True, type_two_conjectures))
+            if options.get("make_lower_conjectures", True):
+                count += len(_bound_tasks(target, numerical_columns, boolean_columns, False, type_two_conjectures))
+            counts.append(count)
+    total = sum(counts)
+
+    def report(offset):
+        if progress is None:
+            return None
+        return lambda done, _: progress(offset + done, total)
+
+    executor = None
+    if not use_mip and workers is not None and workers > 1:
+        executor = linear_conjecture_executor(df, workers)
+    try:
+        offset = 0
+        for target, count in zip(targets, counts):
+            if use_mip:
+                conjectures = write_on_the_wall_with_mip(
+                    df, target, numerical_columns, boolean_columns, progress=report(offset), **options
+                )
+            else:
+                conjectures = write_on_the_wall(
+                    df, target, numerical_columns, boolean_columns,
+                    workers=workers, progress=report(offset), executor=executor, **options
+                )
+            offset += count
+            yield target, conjectures
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -2,6 +2,7 @@ import os
 import itertools
 import networkx as nx
 from functions import compute, factors_compute
+from functions.corpus import read_graph
 import os
 import itertools
 import networkx as nx
@@ -45,6 +46,9 @@ def create_product_data(graph_dir='graph-small-edgelists', output_dir='training-
     # Get all graph file names
     graph_files = [f for f in os.listdir(graph_dir) if f.endswith('.txt')]
 
+    # Read every graph once, from the packed corpus of graph_dir when it is up to date
+    graphs = {f: read_graph(graph_dir, f[:-4], nodetype=int) for f in graph_files}
+
     # Read single invariants
     with open('functions/product_invariants.txt', 'r') as f:
         single_invariants = [line.strip() for line in f if line.strip()]
@@ -56,13 +60,10 @@ def create_product_data(graph_dir='graph-small-edgelists', output_dir='training-
     data = []  # This will store the rows of data
 
     for graph in graph_files:
-        graph1_path = os.path.join(graph_dir, graph)
-        graph2_path= os.path.join(graph_dir, graph)
         name = f"{graph.split('.')[0]}_product_{graph.split('.')[0]}.txt"
 
-        # Read graphs using networkx.read_edgelist
-        G1 = nx.read_edgelist(graph1_path, nodetype=int)
-        G2 = nx.read_edgelist(graph2_path, nodetype=int)
+        G1 = graphs[graph]
+        G2 = graphs[graph]
 
 
         row_data = {'graph_name': name}  # Dictionary for storing invariant values for this row
@@ -93,14 +94,11 @@ def create_product_data(graph_dir='graph-small-edgelists', output_dir='training-
 
     # Generate all combinations of 2 graph names
     for graph1_name, graph2_name in itertools.combinations(graph_files, 2):
-        graph1_path = os.path.join(graph_dir, graph1_name)
-        graph2_path = os.path.join(graph_dir, graph2_name)
         name = f"{graph1_name.split('.')[0]}_product_{graph2_name.split('.')[0]}.txt"
 
 
-        # Read graphs using networkx.read_edgelist
-        G1 = nx.read_edgelist(graph1_path, nodetype=int)
-        G2 = nx.read_edgelist(graph2_path, nodetype=int)
+        G1 = graphs[graph1_name]
+        G2 = graphs[graph2_name]
 
 
         row_data = {'graph_name': name}  # Dictionary for storing invariant values for this row
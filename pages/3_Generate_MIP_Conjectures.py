@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from functions.app_cache import load_dataset, load_json, load_lines
 from functions import (
     rows_multi_radio,
     multi_radio,
@@ -11,59 +12,33 @@ from functions import (
     tex_map,
 )
 
-from functions.write_on_the_wall import write_on_the_wall_with_mip
-import json
+from functions.write_on_the_wall import write_on_the_wall_by_target
 
 
 DATA_FILE = "training-data/data.csv"
 CONJECTURE_DATA = "training-data/conjecture-data.json"
 
 # Load data from JSON file
-with open(CONJECTURE_DATA, 'r') as f:
-    data = json.load(f)
+data = load_json(CONJECTURE_DATA)
 
 known_conjectures = data["known_conjectures"]
 known_inequalities = data["known_inequalities"]
 
-invariants = [
-    line.rstrip("\n")
-    for line in open("functions/invariants.txt")
-]
-
-booleans = [
-    line.rstrip("\n")
-    for line in open("functions/properties.txt")
-]
-
-computable_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/computable_invariants.txt")
-]
-
-classic_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/classic_invariants.txt")
-]
-
-degree_sequence_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/degree_sequence_invariants.txt")
-]
-
-domination_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/domination_invariants.txt")
-]
-
-zero_forcing_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/zero_forcing_invariants.txt")
-]
-
-energy_invariants = [
-    line.rstrip("\n")
-    for line in open("functions/energy_invariants.txt")
-]
+invariants = load_lines("functions/invariants.txt")
+
+booleans = load_lines("functions/properties.txt")
+
+computable_invariants = load_lines("functions/computable_invariants.txt")
+
+classic_invariants = load_lines("functions/classic_invariants.txt")
+
+degree_sequence_invariants = load_lines("functions/degree_sequence_invariants.txt")
+
+domination_invariants = load_lines("functions/domination_invariants.txt")
+
+zero_forcing_invariants = load_lines("functions/zero_forcing_invariants.txt")
+
+energy_invariants = load_lines("functions/energy_invariants.txt")
 
 def generate_conjectures():
     st.set_page_config(page_title="Conjecture Generator") #, page_icon="📈")
@@ -83,7 +58,7 @@ def generate_conjectures():
         """
     )
 
-    df = pd.read_csv(DATA_FILE)
+    df = load_dataset(DATA_FILE)
     numerical_columns = [col for col in df.columns if col in invariants if col not in ["semitotal_domination_number", "square_negative_energy", "square_positive_energy", "second_largest_eigenvalues", "size"]]
     boolean_columns = ["all"]
     for col in df.columns:
@@ -133,44 +108,59 @@ def generate_conjectures():
             boolean_columns = single_property
         else:
             boolean_columns = [col for col in df.columns if col in booleans]
-        for invariant in invariant_column:
-
-            with st.spinner(f'Learning conjectures for the {invariant} ...'):
-                conjectures += write_on_the_wall_with_mip(
-                    df,
-                    invariant,
-                    numerical_columns,
-                    boolean_columns,
-                    known_inequalities=known_inequalities,
-                    known_conjectures=known_conjectures,
-                    use_strong_dalmatian=use_strong_dalmatian,
-                    type_two_conjectures=type_two_conjectures,
-                )
-        for conj in conjectures:
-            print(conj)
-        st.subheader("TxGraffiti conjectures the following inequalities:")
-        for i, conjecture in enumerate(conjectures):
-            print(conjecture)
-            with st.expander(f"# Conjecture {i + 1}"):
-                hypothesis = tex_map(conjecture.hypothesis.statement)
-                st.write(f"{hypothesis}")
-                st.latex(conjecture_to_latex(conjecture))
-                st.write(r" $\text{with equality on }$" +  f"{conjecture.touch}" +  r"$\text{ graphs in the known collection of graphs.}$")
-
-                lhs = conjecture.conclusion.lhs
-                rhs = conjecture.conclusion.rhs
-                st.write(f"**Definitions:** {def_map(conjecture.hypothesis.statement)} \n \n {def_map(lhs)} \n \n {def_map(rhs)}")
 
-                # Generate the plot for the conjecture
-                fig = conjecture.plot(df)
-                if fig:
-                    st.pyplot(fig)  # Display the plot below the conjecture
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        shown = {"percent": 0}
 
-                print(conjecture.false_graphs(df))
+        def show_progress(done, total):
+            # Only redraw when the percentage changes, not after every program.
+            percent = 100 * done // total if total else 100
+            if percent != shown["percent"]:
+                shown["percent"] = percent
+                progress_bar.progress(percent)
+                status_text.text(f"Solved {done} of {total} mixed-integer programs ...")
 
+        st.subheader("TxGraffiti conjectures the following inequalities:")
+        # Show the conjectures on each target as soon as they are written.
+        for invariant, new_conjectures in write_on_the_wall_by_target(
+            df,
+            invariant_column,
+            numerical_columns,
+            boolean_columns,
+            use_mip=True,
+            progress=show_progress,
+            known_inequalities=known_inequalities,
+            known_conjectures=known_conjectures,
+            use_strong_dalmatian=use_strong_dalmatian,
+            type_two_conjectures=type_two_conjectures,
+        ):
+            for conjecture in new_conjectures:
+                display_conjecture(len(conjectures) + 1, conjecture, df)
+                conjectures.append(conjecture)
+        status_text.text("Done!")
 
         st.session_state.conjectures = [conjecture_to_dict(conj) for conj in conjectures]
         st.session_state.filtered_indices = list(range(len(conjectures)))
 
 
+def display_conjecture(i, conjecture, df):
+    print(conjecture)
+    with st.expander(f"# Conjecture {i}"):
+        hypothesis = tex_map(conjecture.hypothesis.statement)
+        st.write(f"{hypothesis}")
+        st.latex(conjecture_to_latex(conjecture))
+        st.write(r" $\text{with equality on }$" +  f"{conjecture.touch}" +  r"$\text{ graphs in the known collection of graphs.}$")
+
+        lhs = conjecture.conclusion.lhs
+        rhs = conjecture.conclusion.rhs
+        st.write(f"**Definitions:** {def_map(conjecture.hypothesis.statement)} \n \n {def_map(lhs)} \n \n {def_map(rhs)}")
+
+        # Generate the plot for the conjecture
+        fig = conjecture.plot(df)
+        if fig:
+            st.pyplot(fig)  # Display the plot below the conjecture
+
+        print(conjecture.false_graphs(df))
+
 generate_conjectures()
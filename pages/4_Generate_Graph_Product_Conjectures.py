@@ -1,11 +1,12 @@
 import streamlit as st
 import pandas as pd
 from fractions import Fraction
+from functions.app_cache import load_dataset
 from functions import (
-    write_on_the_wall,
+    write_on_the_wall_by_target,
 )
 import numpy as np
-import time
+import os
 
 # Move set_page_config to the top to avoid potential errors later
 # st.set_page_config(page_title="Conjecture Generator")
@@ -1367,21 +1368,6 @@ TRIVIAL_BOUNDS = [
 
 ]
 
-import time
-
-def long_computation():
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    for i in range(100):
-        progress_bar.progress(i + 1)
-        status_text.text(f'Filtering and sorting the proposed inequalities... {i + 1}%')
-        time.sleep(0.1)  # Simulate a long computation
-
-    status_text.text('Done!')
-    st.success('Process complete!')
-
-
 def fraction_to_str(fraction):
     return f"{fraction.numerator}/{fraction.denominator}"
 
@@ -1470,7 +1456,7 @@ def generate_conjectures():
 
 
 
-    df = pd.read_csv(DATA_FILE)
+    df = load_dataset(DATA_FILE)
     # Make a new column for "a connected graph" which is all true
     # df["a connected graph"] = True
 
@@ -1517,67 +1503,80 @@ def generate_conjectures():
     generate_conjectures = st.button('Generate Conjectures')
     conjectures = []
     if generate_conjectures:
-        for invariant in invariant_column:
-            with st.spinner(f'Learning conjectures for the {invariant} ...'):
-                conjectures += write_on_the_wall(
-                    df,
-                    invariant,
-                    invariants,
-                    ["is_connected"],
-                    use_strong_dalmatian=use_strong_dalmatian,
-                    )
-                long_computation()
-
-        for conj in conjectures:
-            print(conj.conclusion)
-        # conjectures = dalmatian(df, conjectures)
-
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+        shown = {"percent": 0}
+
+        def show_progress(done, total):
+            # Only redraw when the percentage changes, not after every linear program.
+            percent = 100 * done // total if total else 100
+            if percent != shown["percent"]:
+                shown["percent"] = percent
+                progress_bar.progress(percent)
+                status_text.text(f"Solved {done} of {total} linear programs ...")
 
         st.subheader("TxGraffiti conjectures the following inequalities:")
-        for i, conjecture in enumerate(conjectures):
-            with st.expander(f"# Conjecture {i + 1}"):
-                lhs = TEX_MAP[conjecture.conclusion.lhs]
-                rhs = TEX_MAP[str(conjecture.conclusion.rhs[0])]
-                inequality = TEX_MAP[conjecture.conclusion.inequality]
-                slope = conjecture.conclusion.slopes[0]
-                if slope == 1:
-                    slope = ""
-                elif slope.denominator == 1:
-                    slope = str(slope.numerator)
-                else:
-                    slope = fraction_to_str(slope)
-                # slope = fraction_to_str(conjecture.conclusion.slope) if conjecture.conclusion.slope != 1 else ""
-                intercept = fraction_to_str(conjecture.conclusion.intercept) if conjecture.conclusion.intercept != 0 else ""
-
-                if conjecture.conclusion.intercept > 0:
-                    if conjecture.conclusion.intercept.denominator == 1:
-                        st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
-                        st.write(f"$${lhs} {inequality} {slope} {rhs} + {conjecture.conclusion.intercept.numerator}$$,")
-                        # st.write(f"and this bound is sharp.")
-                    else:
-                        st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
-                        st.write(f"$${lhs} {inequality} {slope} {rhs} + {intercept}$$,")
-                        # st.write(f"and this bound is sharp.")
-                elif conjecture.conclusion.intercept < 0:
-                    if conjecture.conclusion.intercept.denominator == 1:
-                        st.write(f"If $G$ and $H$ are nontrivial connected graphs, then")
-                        st.write(f"$${lhs} {inequality} {slope} {rhs} {conjecture.conclusion.intercept.numerator}$$,")
-                        # st.write(f"and this bound is sharp.")
-                    else:
-                        st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
-                        st.write(f"$${lhs} {inequality} {slope} {rhs} {intercept}$$,")
-                        # st.write(f"and this bound is sharp.")
-                else:
-                    st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
-                    st.write(f"$${lhs} {inequality} {slope} {rhs}$$,")
-
-                st.write(f"and this bound is sharp on {conjecture.touch} graphs.")
-
-                fig = conjecture.plot(df)
-                if fig:
-                    st.pyplot(fig)  # Display the plot below the conjecture
-
-                print(conjecture.false_graphs(df))
+        # Show the conjectures on each target as soon as they are written.
+        for invariant, new_conjectures in write_on_the_wall_by_target(
+            df,
+            invariant_column,
+            invariants,
+            ["is_connected"],
+            workers=os.cpu_count(),
+            progress=show_progress,
+            use_strong_dalmatian=use_strong_dalmatian,
+        ):
+            for conjecture in new_conjectures:
+                print(conjecture.conclusion)
+                display_conjecture(len(conjectures) + 1, conjecture, df)
+                conjectures.append(conjecture)
+        status_text.text("Done!")
+
+
+def display_conjecture(i, conjecture, df):
+    with st.expander(f"# Conjecture {i}"):
+        lhs = TEX_MAP[conjecture.conclusion.lhs]
+        rhs = TEX_MAP[str(conjecture.conclusion.rhs[0])]
+        inequality = TEX_MAP[conjecture.conclusion.inequality]
+        slope = conjecture.conclusion.slopes[0]
+        if slope == 1:
+            slope = ""
+        elif slope.denominator == 1:
+            slope = str(slope.numerator)
+        else:
+            slope = fraction_to_str(slope)
+        # slope = fraction_to_str(conjecture.conclusion.slope) if conjecture.conclusion.slope != 1 else ""
+        intercept = fraction_to_str(conjecture.conclusion.intercept) if conjecture.conclusion.intercept != 0 else ""
+
+        if conjecture.conclusion.intercept > 0:
+            if conjecture.conclusion.intercept.denominator == 1:
+                st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
+                st.write(f"$${lhs} {inequality} {slope} {rhs} + {conjecture.conclusion.intercept.numerator}$$,")
+                # st.write(f"and this bound is sharp.")
+            else:
+                st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
+                st.write(f"$${lhs} {inequality} {slope} {rhs} + {intercept}$$,")
+                # st.write(f"and this bound is sharp.")
+        elif conjecture.conclusion.intercept < 0:
+            if conjecture.conclusion.intercept.denominator == 1:
+                st.write(f"If $G$ and $H$ are nontrivial connected graphs, then")
+                st.write(f"$${lhs} {inequality} {slope} {rhs} {conjecture.conclusion.intercept.numerator}$$,")
+                # st.write(f"and this bound is sharp.")
+            else:
+                st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
+                st.write(f"$${lhs} {inequality} {slope} {rhs} {intercept}$$,")
+                # st.write(f"and this bound is sharp.")
+        else:
+            st.write(f"If $G$ and $H$ are nontrivial connected graphs, then ")
+            st.write(f"$${lhs} {inequality} {slope} {rhs}$$,")
+
+        st.write(f"and this bound is sharp on {conjecture.touch} graphs.")
+
+        fig = conjecture.plot(df)
+        if fig:
+            st.pyplot(fig)  # Display the plot below the conjecture
+
+        print(conjecture.false_graphs(df))
 
 # Main entry point
 if __name__ == "__main__":
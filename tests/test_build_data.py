@@ -0,0 +1,79 @@
+"""
+Tests of the dataset builders of functions.build_data.
+
+Run from the root of the repository with python -m pytest.
+"""
+import os
+import shutil
+import networkx as nx
+import pandas as pd
+import pytest
+from functions.build_data import (
+    _compute_column,
+    _dependency_levels,
+    make_graph_dataframe_from_edgelists,
+    make_graph_dataframe_from_edgelists_in_parallel,
+)
+
+EDGELISTS = "graph-edgelists"
+GRAPHS = ["PetersenGraph", "G10", "G11", "G12", "B_dom_B1", "Diamond_Necklace3"]
+INVARIANTS = [
+    "order",
+    "domination_number",
+    "total_domination_number",
+    "(order - domination_number)",
+    "independence_number",
+    "diameter",
+    "randic_index",
+    "graph_energy",
+]
+PROPERTIES = ["a connected graph", "a connected and cubic graph which is not K_4"]
+
+
+@pytest.fixture
+def edgelists(tmp_path):
+    path = tmp_path / "graphs"
+    path.mkdir()
+    for name in GRAPHS:
+        shutil.copy(os.path.join(EDGELISTS, name + ".txt"), path)
+    return str(path)
+
+
+def test_parallel_build_matches_serial_build(edgelists):
+    serial = make_graph_dataframe_from_edgelists(edgelists, INVARIANTS, PROPERTIES)
+    parallel = make_graph_dataframe_from_edgelists_in_parallel(edgelists, INVARIANTS, PROPERTIES, workers=2, timeout=60)
+    pd.testing.assert_frame_equal(serial, parallel, check_dtype=False)
+
+
+def test_timeout_bounds_the_domination_programs(tmp_path):
+    nx.write_edgelist(nx.random_regular_graph(3, 300, seed=1), tmp_path / "cubic.txt", data=False)
+    name, column, value, error = _compute_column(
+        str(tmp_path), "cubic", "connected_domination_number", {"domination_number": 1}, 0.05
+    )
+    assert value is None
+    assert error == "timed out after 0.05 seconds"
+
+
+def test_duplicates_are_only_dropped_on_request(edgelists):
+    shutil.copy(os.path.join(edgelists, "PetersenGraph.txt"), os.path.join(edgelists, "Petersen_copy.txt"))
+    kept = make_graph_dataframe_from_edgelists(edgelists, ["order"], [])
+    assert "Petersen_copy" in kept.index and len(kept) == len(GRAPHS) + 1
+    deduplicated = make_graph_dataframe_from_edgelists(edgelists, ["order"], [], deduplicate=True)
+    assert "Petersen_copy" not in deduplicated.index and len(deduplicated) == len(GRAPHS)
+
+
+def test_hypotheses_are_scheduled_after_the_invariants_they_compare():
+    hypotheses = ["a connected and well-covered graph", "a connected graph with diameter at most 3"]
+    depth = {column: i for i, level in enumerate(_dependency_levels(hypotheses)) for column in level}
+    for invariant in ["independence_number", "independent_domination_number"]:
+        assert depth[invariant] < depth["a connected and well-covered graph"]
+    assert depth["diameter"] < depth["a connected graph with diameter at most 3"]
+
+
+def test_hypotheses_do_not_need_the_invariants_of_unreached_atoms(tmp_path):
+    nx.write_edgelist(nx.disjoint_union(nx.path_graph(3), nx.path_graph(2)), tmp_path / "P3_K2.txt", data=False)
+    df = make_graph_dataframe_from_edgelists_in_parallel(
+        str(tmp_path), ["diameter"], ["a connected graph with diameter at most 3"], workers=1
+    )
+    assert df.loc["P3_K2", "diameter"] is None
+    assert df.loc["P3_K2", "a connected graph with diameter at most 3"] == False
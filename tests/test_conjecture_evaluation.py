@@ -0,0 +1,65 @@
+"""
+Tests of the batched conjecture evaluator of functions.conjecture_evaluation.
+
+Run from the root of the repository with python -m pytest.
+"""
+import os
+from fractions import Fraction
+import pandas as pd
+import pytest
+from functions.conjecture_evaluation import evaluate_conjectures
+from functions.optimizations import linear_conjecture_tasks, solve_linear_conjectures
+
+DATA = pd.read_csv(os.path.join("training-data", "data.csv"))
+# Integer-valued columns, on which the evaluator is exact.
+OTHERS = ["order", "size", "min_degree", "max_degree", "diameter", "independence_number", "residue"]
+PROPERTIES = ["a connected graph", "a tree graph", "a connected_graph with min_degree at least 2"]
+
+
+@pytest.fixture(scope="module")
+def conjectures():
+    target = "domination_number"
+    tasks = linear_conjecture_tasks(target, OTHERS, PROPERTIES, upper=True)
+    tasks += linear_conjecture_tasks(target, OTHERS, PROPERTIES, upper=False, pairs=False)
+    return solve_linear_conjectures(DATA, target, tasks)
+
+
+def _exact_rows(conjecture):
+    # The names of the false and of the sharp graphs, by Fraction arithmetic row by row.
+    conclusion = conjecture.conclusion
+    false, sharp = set(), set()
+    for _, row in DATA[DATA[conjecture.hypothesis.statement] == True].iterrows():
+        rhs = sum(Fraction(m) * int(row[r]) for m, r in zip(conclusion.slopes, conclusion.rhs)) + conclusion.intercept
+        lhs = int(row[conclusion.lhs])
+        if lhs == rhs:
+            sharp.add(row["name"])
+        if (lhs > rhs) if conclusion.inequality == "<=" else (lhs < rhs):
+            false.add(row["name"])
+    return false, sharp
+
+
+def test_evaluator_matches_exact_arithmetic(conjectures):
+    false, sharp, touch = evaluate_conjectures(conjectures, DATA)
+    for i, conjecture in enumerate(conjectures):
+        false_names, sharp_names = _exact_rows(conjecture)
+        assert false[i] == bool(false_names)
+        assert set(DATA["name"][sharp[i]]) == sharp_names
+        assert touch[i] == len(sharp_names)
+
+
+def test_conjecture_methods_match_evaluator(conjectures):
+    false, sharp, touch = evaluate_conjectures(conjectures, DATA)
+    for i, conjecture in enumerate(conjectures):
+        assert conjecture.false_graphs(DATA).empty == (not false[i])
+        assert set(conjecture.get_sharp_graphs(DATA)["name"]) == set(DATA["name"][sharp[i]])
+        assert conjecture.touch == touch[i]
+        assert conjecture.sharps == set(DATA["name"][sharp[i]])
+
+
+def test_false_conjecture_is_detected(conjectures):
+    conjecture = conjectures[0]
+    reversed_conjecture = type(conjecture)(conjecture.hypothesis, conjecture.conclusion.reversal())
+    false, _, _ = evaluate_conjectures([reversed_conjecture], DATA)
+    false_names, _ = _exact_rows(reversed_conjecture)
+    assert false[0] == bool(false_names)
+    assert set(reversed_conjecture.false_graphs(DATA)["name"]) == false_names
@@ -0,0 +1,65 @@
+"""
+Tests of the packed edgelist corpus of functions.corpus.
+
+Run from the root of the repository with python -m pytest.
+"""
+import os
+import shutil
+import networkx as nx
+import pytest
+from functions.bitsets import read_bitset_edgelist
+from functions.corpus import PackedCorpus, open_corpus, read_graph, write_packed_corpus
+
+EDGELISTS = "graph-edgelists"
+NAMES = sorted(name[:-4] for name in os.listdir(EDGELISTS) if name.endswith(".txt"))
+
+
+def _edges(G):
+    return {frozenset(edge) for edge in G.edges()}
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    file_path = str(tmp_path_factory.mktemp("corpus") / "graph-edgelists.corpus")
+    return PackedCorpus(write_packed_corpus(EDGELISTS, file_path))
+
+
+def test_corpus_matches_read_edgelist(corpus):
+    assert list(corpus) == NAMES
+    for name in NAMES:
+        path = os.path.join(EDGELISTS, name + ".txt")
+        for nodetype in [None, int]:
+            expected = nx.read_edgelist(path, nodetype=nodetype)
+            G = corpus.graph(name, str if nodetype is None else nodetype)
+            assert list(G.nodes()) == list(expected.nodes())
+            assert _edges(G) == _edges(expected)
+        bitsets = corpus.bitset_graph(name)
+        expected = read_bitset_edgelist(path)
+        assert bitsets.nodes == expected.nodes
+        assert bitsets.neighbors == expected.neighbors
+
+
+def test_stale_corpus_is_not_read(tmp_path):
+    path = tmp_path / "graphs"
+    path.mkdir()
+    for name in NAMES[:3]:
+        shutil.copy(os.path.join(EDGELISTS, name + ".txt"), path)
+    path = str(path)
+    assert open_corpus(path) is None
+
+    write_packed_corpus(path)
+    assert list(open_corpus(path)) == NAMES[:3]
+    G = read_graph(path, NAMES[0], nodetype=int)
+    assert _edges(G) == _edges(nx.read_edgelist(os.path.join(path, NAMES[0] + ".txt"), nodetype=int))
+
+    # An edgelist newer than the corpus makes the readers fall back to the text files.
+    nx.write_edgelist(nx.cycle_graph(5), os.path.join(path, "C5.txt"), data=False)
+    packed = os.path.getmtime(path + ".corpus")
+    os.utime(os.path.join(path, "C5.txt"), (packed + 10, packed + 10))
+    os.utime(path, (packed + 10, packed + 10))
+    assert open_corpus(path) is None
+    assert _edges(read_graph(path, "C5", nodetype=int)) == _edges(nx.cycle_graph(5))
+
+    write_packed_corpus(path)
+    os.utime(path + ".corpus", (packed + 20, packed + 20))
+    assert "C5" in open_corpus(path)
@@ -0,0 +1,65 @@
+"""
+Tests of the invariant store of functions.invariant_store and of the graphs entered by users.
+
+Run from the root of the repository with python -m pytest.
+"""
+import os
+import shutil
+import networkx as nx
+import pandas as pd
+import pytest
+from functions.build_data import update_data_from_user
+from functions.invariant_store import InvariantStore
+
+EDGELISTS = os.path.abspath("graph-edgelists")
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    # A copy of the layout update_data_from_user works in, with three graphs.
+    (tmp_path / "graph-edgelists").mkdir()
+    (tmp_path / "training-data").mkdir()
+    for name in ["PetersenGraph", "G10", "G11"]:
+        shutil.copy(os.path.join(EDGELISTS, name + ".txt"), tmp_path / "graph-edgelists")
+    monkeypatch.chdir(tmp_path)
+    store = InvariantStore()
+    store.add_edgelists(["order", "size"], names=["PetersenGraph", "G10", "G11"])
+    store.to_csv("training-data/data.csv", ["order", "size"], names=["PetersenGraph", "G10", "G11"])
+    store.close()
+    return tmp_path
+
+
+def _submit(monkeypatch, name, G):
+    answers = iter([name] + [f"{u} {v}" for u, v in G.edges()] + ["done"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    update_data_from_user()
+
+
+def test_isomorphic_submission_is_rejected(repository, monkeypatch):
+    petersen = nx.relabel_nodes(nx.petersen_graph(), {v: 9 - v for v in range(10)})
+    _submit(monkeypatch, "relabeled_petersen", petersen)
+    assert not os.path.exists("graph-edgelists/relabeled_petersen.txt")
+    assert list(pd.read_csv("training-data/data.csv")["name"]) == ["PetersenGraph", "G10", "G11"]
+
+
+def test_new_submission_is_added_and_indexed(repository, monkeypatch):
+    _submit(monkeypatch, "C7", nx.cycle_graph(7))
+    assert os.path.exists("graph-edgelists/C7.txt")
+    data = pd.read_csv("training-data/data.csv")
+    assert data.iloc[-1].tolist() == ["C7", 7, 7]
+
+    # The accepted graph is indexed, so an isomorphic copy is rejected without reading the corpus again.
+    store = InvariantStore()
+    assert store.index_edgelists() == []
+    assert store.find_graph(nx.relabel_nodes(nx.cycle_graph(7), lambda v: str((3 * v) % 7))) == ["C7"]
+    store.close()
+    _submit(monkeypatch, "heptagon", nx.cycle_graph(7))
+    assert not os.path.exists("graph-edgelists/heptagon.txt")
+
+
+def test_index_edgelists_only_reads_new_graphs(repository):
+    store = InvariantStore(":memory:")
+    assert sorted(store.index_edgelists()) == ["G10", "G11", "PetersenGraph"]
+    assert store.index_edgelists() == []
+    assert store.find_graph(nx.petersen_graph()) == ["PetersenGraph"]
+    assert store.find_graph(nx.complete_graph(5)) == []
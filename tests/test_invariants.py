@@ -0,0 +1,105 @@
+"""
+Regression tests of the registered invariants.
+
+The values on the graphs of graph-edgelists are checked against training-data/data.csv,
+which holds the values of the GrinPy and NetworkX implementations the registry replaced,
+except for the semitotal_domination_number, square_positive_energy and strong_harmonic_index
+columns, recomputed when their definitions were corrected. The values on small disconnected graphs follow the
+conventions listed above the registrations in functions/invariant_functions.py.
+
+Run from the root of the repository with python -m pytest.
+"""
+import math
+import os
+import networkx as nx
+import pandas as pd
+import pytest
+from functions.bitsets import BitsetGraph, read_bitset_edgelist
+from functions.corpus import read_graph
+from functions.graph_context import GraphContext
+from functions.invariant_functions import compute
+from functions.registry import INVARIANTS
+
+EDGELISTS = "graph-edgelists"
+DATA = pd.read_csv(os.path.join("training-data", "data.csv"))
+COLUMNS = [column for column in DATA.columns[1:] if column in INVARIANTS]
+
+# The exponential invariants are only checked on the smaller graphs, so the tests stay fast.
+EXPONENTIAL_ORDER = 10
+
+
+def _same(value, expected):
+    if isinstance(expected, float) and math.isnan(expected):
+        return value is None or (isinstance(value, float) and math.isnan(value))
+    if isinstance(value, float) or isinstance(expected, float):
+        return math.isclose(value, expected, rel_tol=1e-9, abs_tol=1e-9)
+    return value == expected
+
+
+@pytest.mark.parametrize("name", DATA["name"].tolist())
+def test_corpus_values(name):
+    context = GraphContext(read_graph(EDGELISTS, name))
+    row = DATA.loc[DATA["name"] == name].iloc[0]
+    columns = [
+        column for column in COLUMNS
+        if INVARIANTS[column].cost != "exponential" or context.order() <= EXPONENTIAL_ORDER
+    ]
+    wrong = {column: (context[column], row[column]) for column in columns if not _same(context[column], row[column])}
+    assert not wrong
+
+
+def test_bitset_context_matches_networkx_context(monkeypatch):
+    # These invariants are computed without building the NetworkX graph of a BitsetGraph.
+    def to_networkx(self):
+        raise AssertionError("built a NetworkX graph")
+
+    monkeypatch.setattr(BitsetGraph, "to_networkx", to_networkx)
+    for name in DATA["name"].tolist()[:25]:
+        path = os.path.join(EDGELISTS, name + ".txt")
+        bitset_context = GraphContext(read_bitset_edgelist(path))
+        networkx_context = GraphContext(nx.read_edgelist(path, nodetype=int))
+        for column in ["order", "size", "min_degree", "diameter", "randic_index", "wiener_index", "graph_energy"]:
+            assert _same(bitset_context[column], networkx_context[column])
+
+
+K2_K1 = nx.disjoint_union_all([nx.complete_graph(2), nx.empty_graph(1)])
+K3_K1 = nx.disjoint_union_all([nx.complete_graph(3), nx.empty_graph(1)])
+TWO_K2 = nx.disjoint_union_all([nx.complete_graph(2), nx.complete_graph(2)])
+P3_K2 = nx.disjoint_union_all([nx.path_graph(3), nx.complete_graph(2)])
+TWO_C4 = nx.disjoint_union_all([nx.cycle_graph(4), nx.cycle_graph(4)])
+
+
+@pytest.mark.parametrize("G, invariant, expected", [
+    # Graphs with an isolated vertex have no total or semitotal dominating set.
+    (nx.empty_graph(2), "total_domination_number", 0),
+    (K2_K1, "total_domination_number", 0),
+    (K3_K1, "semitotal_domination_number", 0),
+    (nx.empty_graph(3), "semitotal_domination_number", 0),
+    # Without isolated vertices they are computed as for connected graphs.
+    (TWO_K2, "total_domination_number", 4),
+    (P3_K2, "total_domination_number", 4),
+    (TWO_C4, "semitotal_domination_number", 4),
+    (TWO_K2, "connected_domination_number", 0),
+    # The whole vertex set is outer-connected dominating.
+    (nx.empty_graph(1), "outer_connected_domination_number", 1),
+    (nx.empty_graph(3), "outer_connected_domination_number", 3),
+    (TWO_C4, "domination_number", 4),
+    (TWO_C4, "independence_number", 4),
+    (P3_K2, "matching_number", 2),
+    (TWO_K2, "wiener_index", float("inf")),
+])
+def test_disconnected_values(G, invariant, expected):
+    assert compute(G, invariant) == expected
+
+
+@pytest.mark.parametrize("G, invariant, exception", [
+    (TWO_K2, "diameter", nx.NetworkXError),
+    (K3_K1, "radius", nx.NetworkXError),
+    (TWO_C4, "triameter", nx.NetworkXNoPath),
+    (K2_K1, "triameter", nx.NetworkXNoPath),
+    (nx.empty_graph(2), "triameter", ValueError),
+    (TWO_K2, "reciprocal_harary_index", nx.NetworkXNoPath),
+])
+def test_disconnected_errors(G, invariant, exception):
+    with pytest.raises(exception):
+        compute(G, invariant)
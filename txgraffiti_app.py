@@ -14,6 +14,7 @@ from functions import (
     make_graph_dataframe,
     compute
 )
+from functions.corpus import read_graph
 from pyvis.network import Network
 import streamlit.components.v1 as components
 import os
@@ -79,7 +80,7 @@ def make_graph_dataframe_from_edgelists(path="graph-edgelists", invariants=invar
     graphs = []
     for graph_name in graph_names:
         if graph_name.endswith(".txt"):
-            graphs.append(nx.read_edgelist(os.path.join(path, graph_name)))
+            graphs.append(read_graph(path, graph_name[:-4]))
     df = make_graph_dataframe(graphs, graph_names, invariants, properties)
     df.set_index("name", inplace=True)
     return df
@@ -225,7 +226,7 @@ def make_graph_dataframe_from_edgelists(path="graph-edgelists", invariants=invar
     graphs = []
     for graph_name in graph_names:
         if graph_name.endswith(".txt"):
-            graphs.append(nx.read_edgelist(os.path.join(path, graph_name)))
+            graphs.append(read_graph(path, graph_name[:-4]))
     df = make_graph_dataframe(graphs, graph_names, invariants, properties)
     df.set_index("name", inplace=True)
     return df